@@ -4,6 +4,9 @@ from firebase_admin import credentials, auth
 from typing import Dict, Any
 import logging
 from app.config import settings
+from app.auth.token_cache import VerifiedTokenCache
+from app.utils.executor import AUTH_POOL, run_blocking_in
+from app.utils.metrics import TOKEN_VERIFICATIONS, TOKEN_VERIFICATION_DURATION
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +16,7 @@ class FirebaseAuthProduction:
     
     def __init__(self):
         self._initialize_firebase()
+        self.token_cache = VerifiedTokenCache(max_size=settings.token_cache_max_size)
     
     def _initialize_firebase(self):
         """Firebase Admin SDKを初期化（本番環境用）"""
@@ -44,18 +48,34 @@ class FirebaseAuthProduction:
                 raise
     
     async def verify_token(self, token: str) -> Dict[str, Any]:
-        """Firebase IDトークンを検証"""
+        """Firebase IDトークンを検証
+
+        検証済みトークンはトークンの有効期限（exp）までキャッシュし、
+        キャッシュヒット時は署名検証を行わない。
+        """
+        cached_token = self.token_cache.get(token)
+        if cached_token is not None:
+            TOKEN_VERIFICATIONS.labels("cache_hit").inc()
+            return cached_token
+
         try:
-            decoded_token = auth.verify_id_token(token)
+            # 署名検証（公開鍵取得を含む）はFirestoreとは別の認証用スレッドプールで実行
+            with TOKEN_VERIFICATION_DURATION.time():
+                decoded_token = await run_blocking_in(AUTH_POOL, auth.verify_id_token, token)
+            TOKEN_VERIFICATIONS.labels("verified").inc()
             logger.debug(f"Token verified for user: {decoded_token.get('uid')}")
+            self.token_cache.set(token, decoded_token)
             return decoded_token
         except auth.InvalidIdTokenError:
+            TOKEN_VERIFICATIONS.labels("error").inc()
             logger.warning("Invalid ID token provided")
             raise ValueError("Invalid ID token")
         except auth.ExpiredIdTokenError:
+            TOKEN_VERIFICATIONS.labels("error").inc()
             logger.warning("Expired ID token provided")
             raise ValueError("Expired ID token")
         except Exception as e:
+            TOKEN_VERIFICATIONS.labels("error").inc()
             logger.error(f"Token verification failed: {e}")
             raise ValueError(f"Token verification failed: {str(e)}")
     
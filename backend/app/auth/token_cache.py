@@ -0,0 +1,64 @@
+"""検証済みIDトークンキャッシュ"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class VerifiedTokenCache:
+    """検証済みIDトークンのLRUキャッシュ
+
+    トークン文字列そのものは保持せず、SHA-256ハッシュをキーとする。
+    各エントリはトークン自身の exp（有効期限）で失効し、
+    件数が max_size を超えた場合は最も古く参照されたエントリから破棄する。
+    イベントループ上からのみ利用する前提のためロックは持たない。
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        """トークンのハッシュキーを作成"""
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """有効期限内の検証済みトークンを取得（存在しない場合はNone）"""
+        if self.max_size <= 0:
+            return None
+
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, decoded_token = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return decoded_token
+
+    def set(self, token: str, decoded_token: Dict[str, Any]) -> None:
+        """検証済みトークンを保存（expを持たないトークンは保存しない）"""
+        if self.max_size <= 0:
+            return
+
+        expires_at = decoded_token.get("exp")
+        if not isinstance(expires_at, (int, float)) or expires_at <= time.time():
+            return
+
+        key = self._key(token)
+        self._entries[key] = (float(expires_at), decoded_token)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """キャッシュをクリア"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,6 +1,6 @@
 """設定管理モジュール"""
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
 
 
@@ -21,11 +21,33 @@ class Settings(BaseSettings):
     # ログ設定
     log_level: str = "INFO"
     log_format: str = "json"
+    # sync: 呼び出し元で整形・書き込み / async: キュー経由でバックグラウンドスレッドが整形・書き込み
+    log_mode: str = "sync"
+    # イベント名ごとのDEBUG/INFOログのサンプリング率（例: {"roll_added": 0.1}）
+    log_sample_rates: Dict[str, float] = {}
+    # パスのプレフィックスごとのログレベル（例: {"/api/v1/games/history": "WARNING"}）
+    log_route_levels: Dict[str, str] = {}
+    
+    # メトリクス設定（/metrics エンドポイントとリクエスト計測）
+    metrics_enabled: bool = True
+    
+    # トレーシング設定
+    tracing_enabled: bool = False
+    # トレースするリクエストの割合（0.0〜1.0）
+    tracing_sample_rate: float = 1.0
+    # 出力先（none / stdout / file）
+    tracing_exporter: str = "none"
+    tracing_export_path: str = "./traces.jsonl"
     
     # セキュリティ設定
     secret_key: str = "your-secret-key-here"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    # 検証済みFirebase IDトークンのキャッシュ件数上限（0で無効）
+    token_cache_max_size: int = 10000
+    # キャッシュミス時のトークン検証を実行するスレッドプールの最大同時実行数
+    # （Firestore用のプールとは別）
+    auth_max_concurrency: int = 4
     
     # CORS設定
     allowed_origins: List[str] = [
@@ -38,11 +60,67 @@ class Settings(BaseSettings):
     ]
     allowed_methods: List[str] = ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
     allowed_headers: List[str] = ["*"]
+    # ブラウザのスクリプトから参照できるレスポンスヘッダー（条件付きGET用のETag）
+    exposed_headers: List[str] = ["ETag"]
+    
+    # 完了ゲーム保存時のスコア検証設定
+    # correct: 再計算結果で補正して保存 / reject: 不一致の場合は保存しない
+    score_verification_mode: str = "correct"
     
-    # レート制限設定
+    # レート制限設定（トークンバケット: 容量 rate_limit_calls、rate_limit_period 秒で満タンまで補充）
+    rate_limit_enabled: bool = True
     rate_limit_calls: int = 1000
     rate_limit_period: int = 3600
+    # バックエンド（memory: プロセス内メモリ）
+    rate_limit_backend: str = "memory"
+    # 保持するキー（UID・IP）の上限
+    rate_limit_max_keys: int = 100000
+    # ルートごとのコスト（"METHOD /path/{param}": コスト、未指定は1）
+    rate_limit_route_costs: Dict[str, int] = {
+        "POST /api/v1/games/create": 10,
+        "POST /api/v1/games/{game_id}/roll": 2,
+        "POST /api/v1/games/{game_id}/rolls": 5,
+    }
+    # レート制限の対象外とするパス
+    rate_limit_exempt_paths: List[str] = ["/", "/health", "/metrics", "/docs", "/redoc", "/openapi.json"]
+    # X-Forwarded-For の先頭をクライアントIPとして使うか（信頼できるプロキシ配下の場合のみ有効にする）
+    rate_limit_trust_forwarded_for: bool = False
     
+    # レスポンス圧縮設定（Accept-Encoding に応じて br / gzip で圧縮）
+    compression_enabled: bool = True
+    # 圧縮するレスポンスの最小サイズ（バイト）
+    compression_minimum_size: int = 1024
+    # 優先する順の圧縮方式（br は brotli パッケージがインストールされている場合のみ使用）
+    compression_encodings: List[str] = ["br", "gzip"]
+    # gzipの圧縮レベル（1-9）
+    compression_gzip_level: int = 6
+    # brotliの圧縮品質（0-11）
+    compression_brotli_quality: int = 4
+    # 圧縮の対象外とするパス
+    compression_exempt_paths: List[str] = ["/health"]
+    
+    # ストレージバックエンド
+    # firestore: Cloud Firestore / sqlite: 組み込みSQLite / memory: プロセス内メモリ（テスト・ベンチマーク用）
+    storage_backend: str = "firestore"
+    # SQLiteのデータベースファイル（storage_backend = "sqlite" の場合）
+    sqlite_path: str = "bowlards.db"
+    
+    # Firestoreアクセス設定
+    # 同期クライアント呼び出しを実行するスレッドプールの最大同時実行数
+    firestore_max_concurrency: int = 32
+    # 共有するFirestoreクライアント（gRPCチャネル）の数
+    firestore_channel_pool_size: int = 1
+    # 書き込み後にドキュメントを再読み取りして返すか
+    # False の場合はローカルのモデルに書き込み結果の update_time を反映して返す
+    firestore_read_after_write: bool = False
+    # 存在が確認済みのユーザーUIDキャッシュ（件数上限・有効期間、どちらか0で無効）
+    user_exists_cache_max_size: int = 10000
+    user_exists_cache_ttl_seconds: int = 300
+    # ゲームの保存形式
+    # compact: ロール文字列（roll_string）で保存 / frames: 従来のフレームマップで保存
+    # 読み取りはどちらの形式にも対応する
+    game_storage_format: str = "compact"
+
     # Firestoreエミュレータ設定
     firestore_emulator_host: Optional[str] = None
     firestore_emulator_port: Optional[int] = None
@@ -1,10 +1,80 @@
-"""依存関係注入"""
+"""依存関係注入
+
+ストレージ・リポジトリ・サービスはプロセス内で1つずつ作成し、
+全リクエストで共有する。アプリケーションのlifespanで作成・破棄する。
+ストレージは settings.storage_backend で選択する。
+"""
+from typing import Optional, Union
 from google.cloud import firestore
 from firebase_admin import firestore as admin_firestore
+from app.config import settings
+from app.repositories.base import BaseGameRepository, BaseUserRepository
 from app.repositories.user_repository import UserRepository
 from app.repositories.game_repository import GameRepository
+from app.repositories.memory_user_repository import InMemoryUserRepository
+from app.repositories.memory_game_repository import InMemoryGameRepository
+from app.repositories.sqlite_user_repository import SQLiteUserRepository
+from app.repositories.sqlite_game_repository import SQLiteGameRepository
 from app.services.user_service import UserService
 from app.services.game_service import GameService
+from app.utils.firestore_pool import FirestoreClientPool
+from app.utils.memory_store import InMemoryStore
+from app.utils.sqlite_database import SQLiteDatabase
+
+
+class ServiceContainer:
+    """共有ストレージ・リポジトリ・サービス"""
+
+    def __init__(
+        self,
+        db: Union[FirestoreClientPool, SQLiteDatabase, InMemoryStore],
+        user_repository: BaseUserRepository,
+        game_repository: BaseGameRepository
+    ):
+        self.db = db
+        self.user_repository = user_repository
+        self.game_repository = game_repository
+        self.user_service = UserService(self.user_repository)
+        self.game_service = GameService(self.game_repository, self.user_repository)
+
+    def close(self) -> None:
+        """ストレージへの接続を閉じる"""
+        self.db.close()
+
+
+def create_container(backend: Optional[str] = None) -> ServiceContainer:
+    """設定に応じたストレージでコンテナを作成"""
+    backend = backend or settings.storage_backend
+    if backend == "firestore":
+        pool = FirestoreClientPool.from_app(settings.firestore_channel_pool_size)
+        return ServiceContainer(pool, UserRepository(pool), GameRepository(pool))
+    if backend == "sqlite":
+        database = SQLiteDatabase(settings.sqlite_path)
+        database.initialize()
+        return ServiceContainer(database, SQLiteUserRepository(database), SQLiteGameRepository(database))
+    if backend == "memory":
+        store = InMemoryStore()
+        return ServiceContainer(store, InMemoryUserRepository(store), InMemoryGameRepository(store))
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+_container: Optional[ServiceContainer] = None
+
+
+def init_container() -> ServiceContainer:
+    """共有コンテナを作成（作成済みの場合はそれを返す）"""
+    global _container
+    if _container is None:
+        _container = create_container()
+    return _container
+
+
+def close_container() -> None:
+    """共有コンテナを破棄"""
+    global _container
+    if _container is not None:
+        _container.close()
+        _container = None
 
 
 def get_firestore_client() -> firestore.Client:
@@ -12,31 +82,21 @@ def get_firestore_client() -> firestore.Client:
     return admin_firestore.client()
 
 
-def get_user_repository(db: firestore.Client = None) -> UserRepository:
+def get_user_repository() -> BaseUserRepository:
     """ユーザーリポジトリを取得"""
-    if db is None:
-        db = get_firestore_client()
-    return UserRepository(db)
+    return init_container().user_repository
 
 
-def get_game_repository(db: firestore.Client = None) -> GameRepository:
+def get_game_repository() -> BaseGameRepository:
     """ゲームリポジトリを取得"""
-    if db is None:
-        db = get_firestore_client()
-    return GameRepository(db)
+    return init_container().game_repository
 
 
-def get_user_service(user_repo: UserRepository = None) -> UserService:
+def get_user_service() -> UserService:
     """ユーザーサービスを取得"""
-    if user_repo is None:
-        user_repo = get_user_repository()
-    return UserService(user_repo)
+    return init_container().user_service
 
 
-def get_game_service(game_repo: GameRepository = None, user_repo: UserRepository = None) -> GameService:
+def get_game_service() -> GameService:
     """ゲームサービスを取得"""
-    if game_repo is None:
-        game_repo = get_game_repository()
-    if user_repo is None:
-        user_repo = get_user_repository()
-    return GameService(game_repo, user_repo)
+    return init_container().game_service
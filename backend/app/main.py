@@ -2,14 +2,23 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
+from contextlib import asynccontextmanager
 from datetime import datetime
 import logging
 import uvicorn
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from app.config import settings
-from app.utils.logging import setup_logging, get_logger
+from app.utils.logging import setup_logging, shutdown_logging, get_logger
+from app.utils.executor import shutdown_executor
+from app.dependencies import init_container, close_container
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.tracing import TracingMiddleware
+from app.utils.tracing import shutdown_tracing
 from app.exceptions import (
     AuthenticationError, AuthorizationError, TokenExpiredError,
     UserNotFoundError, GameNotFoundError, InvalidRollError,
@@ -21,15 +30,45 @@ from app.routers import users, games
 setup_logging()
 logger = get_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """アプリケーションのライフサイクル管理
+
+    起動時に共有Firestoreクライアント・サービスを作成し、
+    終了時にgRPCチャネルとスレッドプールを閉じる。
+    """
+    init_container()
+    logger.info("Scoring Bowlards API started")
+    logger.info(f"Debug mode: {settings.debug}")
+    logger.info(f"Log level: {settings.log_level}")
+    logger.info(f"Firestore channel pool size: {settings.firestore_channel_pool_size}")
+    yield
+    close_container()
+    shutdown_executor()
+    shutdown_tracing()
+    logger.info("Scoring Bowlards API shutdown")
+    shutdown_logging()
+
+
 # FastAPIアプリケーション作成
 app = FastAPI(
     title="Scoring Bowlards API",
     description="ボーリングスコア記録・管理アプリケーションのAPI",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
+# レート制限（429レスポンスにもCORSヘッダーが付くようCORSより内側で処理する）
+if settings.rate_limit_enabled:
+    app.add_middleware(RateLimitMiddleware)
+
+# レスポンス圧縮（圧縮処理の時間もメトリクス・トレースに含める）
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware)
+
 # CORS設定
 app.add_middleware(
     CORSMiddleware,
@@ -37,6 +76,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=settings.allowed_methods,
     allow_headers=settings.allowed_headers,
+    expose_headers=settings.exposed_headers,
 )
 
 # 信頼できるホスト設定
@@ -45,6 +85,13 @@ app.add_middleware(
     allowed_hosts=["*"]  # 本番環境では適切に制限
 )
 
+# リクエストメトリクス
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+# リクエストID・トレーシング（最も外側で処理する）
+app.add_middleware(TracingMiddleware)
+
 
 # グローバル例外ハンドラー
 @app.exception_handler(AuthenticationError)
@@ -201,27 +248,18 @@ async def health_check():
     }
 
 
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheusメトリクス"""
+        return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 # APIルーターを登録
 app.include_router(users.router, prefix="/api/v1")
 app.include_router(games.router, prefix="/api/v1")
 
 
-# アプリケーション起動時のイベント
-@app.on_event("startup")
-async def startup_event():
-    """アプリケーション起動時の処理"""
-    logger.info("Scoring Bowlards API started")
-    logger.info(f"Debug mode: {settings.debug}")
-    logger.info(f"Log level: {settings.log_level}")
-
-
-# アプリケーション終了時のイベント
-@app.on_event("shutdown")
-async def shutdown_event():
-    """アプリケーション終了時の処理"""
-    logger.info("Scoring Bowlards API shutdown")
-
-
 if __name__ == "__main__":
     uvicorn.run(
         "app.main:app",
@@ -0,0 +1 @@
+"""ミドルウェアモジュール"""
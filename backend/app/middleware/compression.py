@@ -0,0 +1,206 @@
+"""レスポンス圧縮ミドルウェア"""
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotliは任意依存
+    brotli = None
+
+# 圧縮対象のContent-Type（前方一致）
+COMPRESSIBLE_CONTENT_TYPES = ("application/json", "text/", "application/javascript")
+
+SUPPORTED_ENCODINGS = ("br", "gzip")
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Accept-Encoding ヘッダーを {方式: q値} に変換"""
+    accepted = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name] = q
+    return accepted
+
+
+def select_encoding(header: Optional[str], encodings: Sequence[str]) -> Optional[str]:
+    """クライアントが受け入れる方式のうち、q値が最も高いもの（同値はサーバーの優先順）を選択"""
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best = None
+    best_q = 0.0
+    for encoding in encodings:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    """ストリーミング圧縮の共通インターフェース"""
+
+    __slots__ = ("compress", "flush")
+
+    def __init__(self, compress: Callable[[bytes], bytes], flush: Callable[[], bytes]):
+        self.compress = compress
+        self.flush = flush
+
+
+def _create_compressor(encoding: str, gzip_level: int, brotli_quality: int) -> _Compressor:
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=brotli_quality)
+        return _Compressor(compressor.process, compressor.finish)
+    # wbits=31: gzipヘッダー付きのDEFLATE
+    compressobj = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+    return _Compressor(compressobj.compress, compressobj.flush)
+
+
+def available_encodings(encodings: Iterable[str]) -> List[str]:
+    """利用可能な圧縮方式を取得（brotli未インストール時は br を除外）"""
+    result = []
+    for encoding in encodings:
+        if encoding not in SUPPORTED_ENCODINGS:
+            raise ValueError(f"Unknown compression encoding: {encoding}")
+        if encoding == "br" and brotli is None:
+            continue
+        result.append(encoding)
+    return result
+
+
+class CompressionMiddleware:
+    """Accept-Encoding に応じてレスポンスを br / gzip で圧縮するASGIミドルウェア
+
+    minimum_size 未満のレスポンス、圧縮済み・圧縮対象外のContent-Typeのレスポンス、
+    除外パスへのレスポンスは圧縮しない。
+    圧縮したレスポンスのETagは、圧縮前の表現と区別するため弱いETagに変換する。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: Optional[int] = None,
+        encodings: Optional[Sequence[str]] = None,
+        gzip_level: Optional[int] = None,
+        brotli_quality: Optional[int] = None,
+        exempt_paths: Optional[Iterable[str]] = None
+    ):
+        self.app = app
+        self.minimum_size = settings.compression_minimum_size if minimum_size is None else minimum_size
+        self.encodings = available_encodings(
+            settings.compression_encodings if encodings is None else encodings
+        )
+        self.gzip_level = settings.compression_gzip_level if gzip_level is None else gzip_level
+        self.brotli_quality = (
+            settings.compression_brotli_quality if brotli_quality is None else brotli_quality
+        )
+        self.exempt_paths = frozenset(
+            settings.compression_exempt_paths if exempt_paths is None else exempt_paths
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding"), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, self)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """1レスポンス分の圧縮処理"""
+
+    def __init__(self, send: Send, encoding: str, middleware: CompressionMiddleware):
+        self._send = send
+        self._encoding = encoding
+        self._middleware = middleware
+        self._start_message: Optional[Message] = None
+        self._compressor: Optional[_Compressor] = None
+        self._passthrough = False
+
+    def _compressible(self, headers: MutableHeaders) -> bool:
+        if self._start_message["status"] in (204, 304) or "content-encoding" in headers:
+            return False
+        return headers.get("content-type", "").startswith(COMPRESSIBLE_CONTENT_TYPES)
+
+    def _set_encoding_headers(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self._encoding
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start_message = message
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        if self._compressor is not None:
+            # ストリーミングレスポンスの2チャンク目以降
+            body = self._compressor.compress(message.get("body", b""))
+            more_body = message.get("more_body", False)
+            if not more_body:
+                body += self._compressor.flush()
+            await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        headers = MutableHeaders(scope=self._start_message)
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self._compressible(headers):
+            self._passthrough = True
+            await self._send(self._start_message)
+            await self._send(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+        middleware = self._middleware
+
+        if not more_body:
+            # 本文が1回で送られるレスポンス
+            if len(body) >= middleware.minimum_size:
+                compressor = _create_compressor(
+                    self._encoding, middleware.gzip_level, middleware.brotli_quality
+                )
+                compressed = compressor.compress(body) + compressor.flush()
+                if len(compressed) < len(body):
+                    body = compressed
+                    self._set_encoding_headers(headers)
+                    headers["Content-Length"] = str(len(body))
+            await self._send(self._start_message)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        # ストリーミングレスポンス（全体のサイズが分からないため常に圧縮する）
+        self._compressor = _create_compressor(
+            self._encoding, middleware.gzip_level, middleware.brotli_quality
+        )
+        self._set_encoding_headers(headers)
+        del headers["Content-Length"]
+        await self._send(self._start_message)
+        await self._send({
+            "type": "http.response.body",
+            "body": self._compressor.compress(body),
+            "more_body": True,
+        })
@@ -0,0 +1,99 @@
+"""レート制限ミドルウェア"""
+import json
+import math
+import re
+from typing import Dict, List, Optional, Pattern, Tuple
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.auth.firebase import firebase_auth
+from app.config import settings
+from app.utils.rate_limit import RateLimitBackend, create_rate_limit_backend
+
+
+def compile_route_costs(route_costs: Dict[str, int]) -> List[Tuple[str, Pattern[str], int]]:
+    """"METHOD /path/{param}" 形式のコスト設定を正規表現に変換"""
+    compiled = []
+    for route, cost in route_costs.items():
+        method, path = route.split(" ", 1)
+        pattern = "/".join(
+            "[^/]+" if segment.startswith("{") and segment.endswith("}") else re.escape(segment)
+            for segment in path.rstrip("/").split("/")
+        )
+        compiled.append((method.upper(), re.compile(f"^{pattern}/?$"), cost))
+    return compiled
+
+
+class RateLimitMiddleware:
+    """トークンバケット方式のレート制限ASGIミドルウェア
+
+    認証済みのリクエストはUIDごと、それ以外はクライアントIPごとに制限する。
+    UIDは検証済みトークンキャッシュに存在するトークンからのみ取得し、
+    未検証のトークンに含まれるUIDは信用しない（初回リクエストはIPで制限する）。
+    上限を超えた場合は 429 と Retry-After ヘッダーを返す。
+    """
+
+    def __init__(self, app: ASGIApp, backend: Optional[RateLimitBackend] = None):
+        self.app = app
+        self.backend = backend or create_rate_limit_backend()
+        self.capacity = settings.rate_limit_calls
+        self.refill_rate = settings.rate_limit_calls / settings.rate_limit_period
+        self.exempt_paths = frozenset(settings.rate_limit_exempt_paths)
+        self.route_costs = compile_route_costs(settings.rate_limit_route_costs)
+
+    def _cost(self, method: str, path: str) -> int:
+        """ルートごとのコストを取得（設定がない場合は1）"""
+        for route_method, pattern, cost in self.route_costs:
+            if route_method == method and pattern.match(path):
+                return cost
+        return 1
+
+    @staticmethod
+    def _client_key(scope: Scope) -> str:
+        """レート制限のキー（認証済みUIDまたはクライアントIP）を取得"""
+        headers = dict(scope["headers"])
+        authorization = headers.get(b"authorization", b"").decode("latin-1")
+        if authorization[:7].lower() == "bearer ":
+            decoded_token = firebase_auth.token_cache.get(authorization[7:])
+            if decoded_token is not None and decoded_token.get("uid"):
+                return f"uid:{decoded_token['uid']}"
+
+        if settings.rate_limit_trust_forwarded_for:
+            forwarded_for = headers.get(b"x-forwarded-for")
+            if forwarded_for:
+                return f"ip:{forwarded_for.decode('latin-1').split(',')[0].strip()}"
+
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = await self.backend.acquire(
+            self._client_key(scope),
+            self._cost(scope["method"], scope["path"]),
+            self.capacity,
+            self.refill_rate
+        )
+        if retry_after <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after_seconds = max(1, math.ceil(min(retry_after, settings.rate_limit_period)))
+        body = json.dumps({
+            "success": False,
+            "error": {
+                "code": "RATE_LIMIT_EXCEEDED",
+                "message": f"Too many requests. Retry after {retry_after_seconds} seconds."
+            }
+        }).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(retry_after_seconds).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,66 @@
+"""リクエストID・トレーシングミドルウェア"""
+import uuid
+import structlog
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils.logging import bound_route_log_level
+from app.utils.tracing import SPAN_KIND_SERVER, parse_traceparent, should_sample, span, start_trace
+
+REQUEST_ID_HEADER = "x-request-id"
+# 外部から受け取るリクエストIDの最大長（ログの肥大化防止）
+MAX_REQUEST_ID_LENGTH = 128
+
+
+class TracingMiddleware:
+    """リクエストIDの付与とリクエスト単位のトレースを行うASGIミドルウェア
+
+    リクエストIDは X-Request-ID ヘッダーを引き継ぐか新規に採番し、
+    structlog のコンテキスト変数に設定してレスポンスヘッダーにも返す。
+    ルート別のログレベル（log_route_levels）もここで適用する。
+    サンプリング対象のリクエストはルートスパン配下に各レイヤーのスパンを記録する。
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        request_id = headers.get(REQUEST_ID_HEADER.encode(), b"").decode("latin-1")
+        if not request_id or len(request_id) > MAX_REQUEST_ID_LENGTH:
+            request_id = uuid.uuid4().hex
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        with structlog.contextvars.bound_contextvars(request_id=request_id), \
+                bound_route_log_level(scope["path"]):
+            traceparent = parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+            if not should_sample(traceparent):
+                await self.app(scope, receive, send_wrapper)
+                return
+
+            method = scope["method"]
+            with start_trace(traceparent) as trace, structlog.contextvars.bound_contextvars(
+                trace_id=trace.trace_id
+            ):
+                with span(method, kind=SPAN_KIND_SERVER, request_id=request_id) as root:
+                    root.set_attribute("http.method", method)
+                    root.set_attribute("http.target", scope["path"])
+                    try:
+                        await self.app(scope, receive, send_wrapper)
+                    finally:
+                        route = getattr(scope.get("route"), "path", None)
+                        if route is not None:
+                            root.name = f"{method} {route}"
+                            root.set_attribute("http.route", route)
+                        root.set_attribute("http.status_code", status_code)
@@ -1,5 +1,7 @@
 """共通モデル"""
 from pydantic import BaseModel
+from pydantic_core import to_json
+from fastapi.responses import JSONResponse, Response
 from typing import Any, Optional, Dict
 from datetime import datetime
 
@@ -23,6 +25,7 @@ class MetaInfo(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 def success_response(data: Any = None, meta: Optional[Any] = None) -> Dict[str, Any]:
@@ -66,3 +69,46 @@ def success_response_with_meta(data: Any, meta: Any) -> Dict[str, Any]:
     meta_dict = meta.dict() if hasattr(meta, 'dict') else meta
     response = APIResponse(success=True, data=data, meta=meta_dict)
     return response.dict(exclude_none=True)
+
+
+class EnvelopeJSONResponse(JSONResponse):
+    """pydantic_core で直接JSONバイト列にシリアライズするレスポンス
+
+    Pydanticモデルを辞書に変換せずにそのままシリアライズするため、
+    モデルの検証・辞書変換・jsonable_encoder による再変換を行わない。
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+# ETag付きレスポンスのキャッシュ指定（ユーザー固有のため共有キャッシュ不可・毎回再検証）
+ETAG_CACHE_CONTROL = "private, no-cache"
+
+
+def success_json_response(
+    data: Any = None,
+    meta: Optional[Any] = None,
+    etag: Optional[str] = None
+) -> EnvelopeJSONResponse:
+    """成功レスポンスを1回のシリアライズで作成
+
+    success_response と同じ {success, data, meta} 形式で、
+    data・meta にはPydanticモデル（またはそのリスト）をそのまま渡せる。
+    etag を指定した場合は ETag ヘッダーを付与する。
+    """
+    envelope: Dict[str, Any] = {"success": True}
+    if data is not None:
+        envelope["data"] = data
+    if meta is not None:
+        envelope["meta"] = meta
+    headers = {"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL} if etag else None
+    return EnvelopeJSONResponse(envelope, headers=headers)
+
+
+def not_modified_response(etag: str) -> Response:
+    """304 Not Modified レスポンスを作成"""
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL}
+    )
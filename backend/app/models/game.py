@@ -41,9 +41,12 @@ class GameCreate(GameBase):
 
 
 class CompletedGameRequest(BaseModel):
-    """完了したゲーム保存リクエスト（フロントエンド用）"""
+    """完了したゲーム保存リクエスト（フロントエンド用）
+
+    スコア・フラグはサーバー側でロールから再計算するため省略可能。
+    """
     gameDate: str
-    totalScore: int
+    totalScore: Optional[int] = None
     frames: List[FrontendFrame]
     status: str = "completed"
 
@@ -61,6 +64,11 @@ class RollRequest(BaseModel):
         return v
 
 
+class BatchRollRequest(BaseModel):
+    """一括ロールリクエストモデル（投球順）"""
+    rolls: List[RollRequest] = Field(..., min_length=1, max_length=21)
+
+
 class GameResponse(GameBase):
     """ゲームレスポンスモデル"""
     id: str
@@ -76,6 +84,8 @@ class GameHistoryRequest(BaseModel):
     limit: int = Field(20, ge=1, le=100)
     offset: int = Field(0, ge=0)
     status: Optional[str] = Field(None, pattern="^(playing|completed)$")
+    # 前ページの next_cursor（指定時はキーセットページネーション）
+    cursor: Optional[str] = None
 
 
 class GameHistoryResponse(BaseModel):
@@ -84,6 +94,7 @@ class GameHistoryResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 class GameStatistics(BaseModel):
@@ -0,0 +1,110 @@
+"""リポジトリのインターフェース
+
+サービスはこのインターフェースを通してストレージにアクセスする。
+実装は settings.storage_backend に応じて選択する（app.dependencies を参照）。
+ゲームは1件単位の読み書きでは GameState（Pydanticモデルではない内部表現）で受け渡す。
+
+- firestore: GameRepository / UserRepository
+- sqlite: SQLiteGameRepository / SQLiteUserRepository
+- memory: InMemoryGameRepository / InMemoryUserRepository
+"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+from app.models.game import GameCreate, GameHistoryRequest, GameHistoryResponse
+from app.models.user import UserCreate, UserSchema, UserUpdate
+from app.utils.game_state import GameState
+
+
+class BaseUserRepository(ABC):
+    """ユーザーリポジトリのインターフェース"""
+
+    @abstractmethod
+    async def create(self, user_data: UserCreate) -> UserSchema:
+        """ユーザーを作成（既に存在する場合は ValueError）"""
+
+    @abstractmethod
+    async def get_by_id(self, user_id: str) -> Optional[UserSchema]:
+        """ユーザーIDでユーザーを取得"""
+
+    @abstractmethod
+    async def get_by_uid(self, uid: str) -> Optional[UserSchema]:
+        """Firebase UIDでユーザーを取得"""
+
+    @abstractmethod
+    async def update(
+        self,
+        user_id: str,
+        user_data: UserUpdate,
+        current: Optional[UserSchema] = None
+    ) -> UserSchema:
+        """ユーザーを更新（存在しない場合は UserNotFoundError）"""
+
+    @abstractmethod
+    async def delete(self, user_id: str) -> bool:
+        """ユーザーを削除（存在しない場合は UserNotFoundError）"""
+
+    @abstractmethod
+    async def exists(self, user_id: str) -> bool:
+        """ユーザーの存在チェック（ユーザーIDで検索）"""
+
+    @abstractmethod
+    async def exists_by_uid(self, uid: str) -> bool:
+        """ユーザーの存在チェック（UIDで検索）"""
+
+
+class BaseGameRepository(ABC):
+    """ゲームリポジトリのインターフェース"""
+
+    @abstractmethod
+    async def create(self, game_data: GameCreate) -> GameState:
+        """ゲームを作成"""
+
+    @abstractmethod
+    async def get_by_id(self, game_id: str, user_id: str) -> Optional[GameState]:
+        """ゲームIDでゲームを取得（他ユーザーのゲームの場合はNone）"""
+
+    @abstractmethod
+    async def get_version(self, game_id: str, user_id: str) -> Optional[datetime]:
+        """ゲームの updated_at のみを取得"""
+
+    @abstractmethod
+    async def get_user_game_versions(
+        self,
+        user_id: str,
+        history_request: GameHistoryRequest
+    ) -> Tuple[List[Tuple[str, datetime]], int, bool]:
+        """履歴1ページ分の各ゲームの (id, updated_at)・総件数・次ページの有無を取得"""
+
+    @abstractmethod
+    async def update(self, game_id: str, game_data: GameState) -> GameState:
+        """ゲームを更新（存在しない場合は GameNotFoundError）"""
+
+    @abstractmethod
+    async def apply_update(
+        self,
+        game_id: str,
+        user_id: str,
+        mutate: Callable[[GameState], GameState]
+    ) -> GameState:
+        """ゲームの読み取り・変更・書き込みを1つのトランザクションで行う
+
+        mutate には呼び出しごとに新しい（保存済みの状態と共有しない）GameState を渡し、
+        mutate が例外を送出した場合はその状態を破棄して何も書き込まない。
+        """
+
+    @abstractmethod
+    async def delete(self, game_id: str, user_id: str) -> bool:
+        """ゲームを削除（存在しない場合は GameNotFoundError）"""
+
+    @abstractmethod
+    async def get_user_games(
+        self,
+        user_id: str,
+        history_request: GameHistoryRequest
+    ) -> GameHistoryResponse:
+        """ユーザーのゲーム履歴を取得"""
+
+    @abstractmethod
+    async def get_user_statistics(self, user_id: str) -> dict:
+        """ユーザーのゲーム統計を取得"""
@@ -1,22 +1,132 @@
 """ゲームリポジトリ"""
 from google.cloud import firestore
-from typing import List, Optional
-from datetime import datetime, timedelta
-import logging
-from app.models.game import GameSchema, GameCreate, GameHistoryRequest, GameHistoryResponse
-from app.exceptions import GameNotFoundError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from app.models.game import Frame, GameCreate, GameHistoryRequest, GameHistoryResponse
+from app.config import settings
+from app.repositories.base import BaseGameRepository
+from app.exceptions import GameNotFoundError, InvalidRollError, GameCompletedError, ValidationError
+from app.utils.executor import run_blocking
+from app.utils.metrics import instrument_repository
+from app.utils.tracing import trace_methods
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.game_state import GameState
+from app.utils.roll_codec import expand_frames
+from app.utils.scoring import IncrementalScorer
+from app.utils.statistics import (
+    game_statistics_delta, statistics_increment, build_statistics_document,
+    needs_rebuild, statistics_from_document
+)
+from app.utils.logging import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
-class GameRepository:
-    """ゲームリポジトリ"""
+@instrument_repository("games")
+@trace_methods("GameRepository")
+class GameRepository(BaseGameRepository):
+    """ゲームリポジトリ（Firestore）"""
     
     def __init__(self, db: firestore.Client):
         self.db = db
         self.collection = "games"
+        self.statistics_collection = "user_statistics"
     
-    async def create(self, game_data: GameCreate) -> GameSchema:
+    def _statistics_ref(self, user_id: str) -> firestore.DocumentReference:
+        """ユーザー統計ドキュメントの参照を取得"""
+        return self.db.collection(self.statistics_collection).document(user_id)
+    
+    @staticmethod
+    def _to_document(game: GameState, replace: bool = False) -> Dict[str, Any]:
+        """ゲーム状態を保存形式の辞書に変換（id・created_at は含めない）
+
+        game_storage_format が "compact" の場合、フレームはロール文字列
+        （roll_string）として保存する。replace=True の場合は更新時に
+        もう一方の形式のフィールドを削除する。
+        """
+        data = {
+            'user_id': game.user_id,
+            'total_score': game.total_score,
+            'status': game.status,
+            'played_at': game.played_at,
+            'updated_at': game.updated_at,
+            'expire_at': game.expire_at,
+        }
+        if settings.game_storage_format == "compact":
+            data['roll_string'] = game.roll_string()
+            if replace:
+                data['frames'] = firestore.DELETE_FIELD
+        else:
+            data['frames'] = [frame.model_dump() for frame in game.to_frames()]
+            if replace:
+                data['roll_string'] = firestore.DELETE_FIELD
+        return data
+    
+    @staticmethod
+    def _from_document(doc_id: str, data: Dict[str, Any]) -> GameState:
+        """保存形式の辞書からゲーム状態を作成（両形式に対応）"""
+        attributes = dict(
+            id=doc_id,
+            user_id=data['user_id'],
+            total_score=data.get('total_score', 0),
+            status=data.get('status', "playing"),
+            played_at=data['played_at'],
+            created_at=data.get('created_at'),
+            updated_at=data.get('updated_at'),
+            expire_at=data.get('expire_at')
+        )
+        roll_string = data.get('roll_string')
+        if roll_string is not None:
+            return GameState.from_roll_string(roll_string, **attributes)
+        frame_rolls = [frame.get('rolls', []) for frame in data.get('frames', [])]
+        return GameState(scorer=IncrementalScorer.from_rolls(frame_rolls), **attributes)
+    
+    @staticmethod
+    def _frames_from_document(data: Dict[str, Any]) -> List[Frame]:
+        """保存形式の辞書からフレームを取得（両形式に対応）"""
+        roll_string = data.get('roll_string')
+        if roll_string is not None:
+            return expand_frames(roll_string)
+        return [Frame(**frame) for frame in data.get('frames', [])]
+    
+    def _user_games_query(self, user_id: str, history_request: GameHistoryRequest) -> firestore.Query:
+        """ユーザー・ステータスで絞り込んだゲームのクエリを作成"""
+        # user_idで検索
+        query = self.db.collection(self.collection).where(
+            field_path="user_id",
+            op_string="==",
+            value=user_id
+        )
+        
+        # ステータスフィルター
+        if history_request.status:
+            query = query.where(
+                field_path="status",
+                op_string="==",
+                value=history_request.status
+            )
+        return query
+    
+    async def _count_user_games(self, user_id: str, history_request: GameHistoryRequest) -> int:
+        """ゲームの総件数を取得（サーバー側の集計クエリ）"""
+        count_query = self._user_games_query(user_id, history_request).count(alias="total")
+        count_result = await run_blocking(count_query.get)
+        return int(count_result[0][0].value) if count_result else 0
+    
+    def _history_page_query(self, user_id: str, history_request: GameHistoryRequest) -> firestore.Query:
+        """履歴1ページ分のクエリを作成（次ページの有無を判定するため1件多く取得）"""
+        # ページネーション（(user_id, played_at DESC) インデックスを使用）
+        query = self._user_games_query(user_id, history_request)
+        query = query.order_by("played_at", direction=firestore.Query.DESCENDING)
+        query = query.order_by("__name__", direction=firestore.Query.DESCENDING)
+        if history_request.cursor:
+            played_at, last_id = decode_cursor(history_request.cursor)
+            query = query.start_after({"played_at": played_at, "__name__": last_id})
+        elif history_request.offset:
+            query = query.offset(history_request.offset)
+        return query.limit(history_request.limit + 1)
+    
+    async def create(self, game_data: GameCreate) -> GameState:
         """ゲームを作成"""
         try:
             doc_ref = self.db.collection(self.collection).document()
@@ -24,30 +134,54 @@ class GameRepository:
             # TTL設定（3ヶ月後）
             expire_at = datetime.now() + timedelta(days=90)
             
-            game_dict = game_data.dict()
+            game = GameState.from_frames(
+                game_data.frames,
+                id=doc_ref.id,
+                user_id=game_data.user_id,
+                total_score=game_data.total_score,
+                status=game_data.status,
+                played_at=game_data.played_at,
+                expire_at=expire_at
+            )
+            game_dict = self._to_document(game)
             game_dict['id'] = doc_ref.id
             game_dict['created_at'] = firestore.SERVER_TIMESTAMP
             game_dict['updated_at'] = firestore.SERVER_TIMESTAMP
-            game_dict['expire_at'] = expire_at
             
-            doc_ref.set(game_dict)
+            if game_data.status == "completed":
+                # 完了ゲームはユーザー統計と同一バッチで書き込む
+                batch = self.db.batch()
+                batch.set(doc_ref, game_dict)
+                batch.set(
+                    self._statistics_ref(game_data.user_id),
+                    statistics_increment(game.statistics_delta()),
+                    merge=True
+                )
+                write_result = (await run_blocking(batch.commit))[0]
+            else:
+                write_result = await run_blocking(doc_ref.set, game_dict)
             
-            # 作成されたゲームを取得
-            doc = doc_ref.get()
-            game_data_dict = doc.to_dict()
-            game_data_dict['id'] = doc.id
+            logger.debug("game_record_created", game_id=doc_ref.id)
             
-            logger.info(f"Game created: {doc_ref.id}")
-            return GameSchema(**game_data_dict)
+            if settings.firestore_read_after_write:
+                # 作成されたゲームを取得
+                doc = await run_blocking(doc_ref.get)
+                return self._from_document(doc.id, doc.to_dict())
+            
+            # SERVER_TIMESTAMPは書き込み結果の update_time と同じ値に確定する
+            game.created_at = write_result.update_time
+            game.updated_at = write_result.update_time
+            return game
             
         except Exception as e:
-            logger.error(f"Failed to create game: {e}")
+            logger.error("game_create_failed", error=str(e))
             raise
     
-    async def get_by_id(self, game_id: str, user_id: str) -> Optional[GameSchema]:
+    async def get_by_id(self, game_id: str, user_id: str) -> Optional[GameState]:
         """ゲームIDでゲームを取得"""
         try:
-            doc = self.db.collection(self.collection).document(game_id).get()
+            doc_ref = self.db.collection(self.collection).document(game_id)
+            doc = await run_blocking(doc_ref.get)
             
             if not doc.exists:
                 return None
@@ -58,65 +192,204 @@ class GameRepository:
             if game_data.get('user_id') != user_id:
                 return None
             
-            game_data['id'] = doc.id
-            return GameSchema(**game_data)
+            return self._from_document(doc.id, game_data)
             
         except Exception as e:
-            logger.error(f"Failed to get game {game_id}: {e}")
+            logger.error("game_get_failed", game_id=game_id, error=str(e))
             raise
     
-    async def update(self, game_id: str, game_data: GameSchema) -> GameSchema:
-        """ゲームを更新"""
+    async def get_version(self, game_id: str, user_id: str) -> Optional[datetime]:
+        """ゲームの updated_at のみを取得（フレームは読み込まない）
+
+        存在しない・他ユーザーのゲームの場合はNoneを返す。
+        """
         try:
             doc_ref = self.db.collection(self.collection).document(game_id)
+            doc = await run_blocking(doc_ref.get, field_paths=["user_id", "updated_at"])
+            
+            if not doc.exists:
+                return None
+            
+            game_data = doc.to_dict()
+            
+            # ユーザー権限チェック
+            if game_data.get('user_id') != user_id:
+                return None
             
-            # 既存チェック
-            if not doc_ref.get().exists:
-                raise GameNotFoundError()
+            return game_data.get('updated_at')
             
-            update_data = game_data.dict(exclude={'id', 'created_at'})
-            update_data['updated_at'] = firestore.SERVER_TIMESTAMP
+        except Exception as e:
+            logger.error("game_version_get_failed", game_id=game_id, error=str(e))
+            raise
+    
+    async def get_user_game_versions(
+        self,
+        user_id: str,
+        history_request: GameHistoryRequest
+    ) -> Tuple[List[Tuple[str, datetime]], int, bool]:
+        """履歴1ページ分の各ゲームの (id, updated_at) を取得（フレームは読み込まない）
+
+        Returns:
+            (各ゲームの (id, updated_at), 総件数, 次ページの有無)
+        """
+        try:
+            total = await self._count_user_games(user_id, history_request)
+            query = self._history_page_query(user_id, history_request).select(["updated_at"])
+            
+            docs = await run_blocking(query.get)
+            has_more = len(docs) > history_request.limit
+            versions = [
+                (doc.id, doc.to_dict().get('updated_at'))
+                for doc in docs[:history_request.limit]
+            ]
+            return versions, total, has_more
+            
+        except ValidationError:
+            raise
+        except Exception as e:
+            logger.error("game_versions_get_failed", user_id=user_id, error=str(e))
+            raise
+    
+    async def update(self, game_id: str, game_data: GameState) -> GameState:
+        """ゲームを更新"""
+        try:
+            doc_ref = self.db.collection(self.collection).document(game_id)
+            
+            # トランザクションの書き込み結果は取得できないため、ローカル時刻を書き込む
+            updated_game = game_data.copy()
+            updated_game.id = game_id
+            updated_game.updated_at = datetime.now(timezone.utc)
+            update_data = self._to_document(updated_game, replace=True)
+            
+            @firestore.transactional
+            def _update(transaction: firestore.Transaction) -> None:
+                # 既存チェック
+                snapshot = doc_ref.get(transaction=transaction)
+                if not snapshot.exists:
+                    raise GameNotFoundError()
+                
+                transaction.update(doc_ref, update_data)
+                
+                # 完了状態に遷移した場合はユーザー統計に加算
+                if (snapshot.to_dict() or {}).get('status') != "completed" and updated_game.status == "completed":
+                    transaction.set(
+                        self._statistics_ref(updated_game.user_id),
+                        statistics_increment(updated_game.statistics_delta()),
+                        merge=True
+                    )
             
-            doc_ref.update(update_data)
+            await run_blocking(_update, self.db.transaction())
             
-            # 更新されたゲームを取得
-            doc = doc_ref.get()
-            game_data_dict = doc.to_dict()
-            game_data_dict['id'] = doc.id
+            logger.debug("game_record_updated", game_id=game_id)
             
-            logger.info(f"Game updated: {game_id}")
-            return GameSchema(**game_data_dict)
+            if settings.firestore_read_after_write:
+                # 更新されたゲームを取得
+                doc = await run_blocking(doc_ref.get)
+                return self._from_document(doc.id, doc.to_dict())
+            return updated_game
             
         except GameNotFoundError:
             raise
         except Exception as e:
-            logger.error(f"Failed to update game {game_id}: {e}")
+            logger.error("game_update_failed", game_id=game_id, error=str(e))
             raise
     
-    async def delete(self, game_id: str, user_id: str) -> bool:
-        """ゲームを削除"""
+    async def apply_update(
+        self,
+        game_id: str,
+        user_id: str,
+        mutate: Callable[[GameState], GameState]
+    ) -> GameState:
+        """トランザクション内でゲームを読み取り・変更・書き込み
+
+        mutate は読み取ったゲームを検証・変更して返す関数で、
+        競合による再試行時には最新のドキュメントで再実行される。
+        書き込んだ状態をそのまま返し、書き込み後の再読み取りは行わない。
+        """
         try:
             doc_ref = self.db.collection(self.collection).document(game_id)
-            doc = doc_ref.get()
             
-            if not doc.exists:
-                raise GameNotFoundError()
+            @firestore.transactional
+            def _apply(transaction: firestore.Transaction) -> GameState:
+                snapshot = doc_ref.get(transaction=transaction)
+                if not snapshot.exists:
+                    raise GameNotFoundError()
+                
+                game_data = snapshot.to_dict()
+                
+                # ユーザー権限チェック
+                if game_data.get('user_id') != user_id:
+                    raise GameNotFoundError()
+                
+                previous_status = game_data.get('status')
+                
+                updated_game = mutate(self._from_document(snapshot.id, game_data))
+                # SERVER_TIMESTAMPは再読み取りしないと値が確定しないため、ローカル時刻を書き込む
+                updated_game.updated_at = datetime.now(timezone.utc)
+                
+                transaction.update(doc_ref, self._to_document(updated_game, replace=True))
+                
+                # 完了状態に遷移した場合はユーザー統計に加算
+                if previous_status != "completed" and updated_game.status == "completed":
+                    transaction.set(
+                        self._statistics_ref(user_id),
+                        statistics_increment(updated_game.statistics_delta()),
+                        merge=True
+                    )
+                return updated_game
             
-            game_data = doc.to_dict()
+            updated_game = await run_blocking(_apply, self.db.transaction())
             
-            # ユーザー権限チェック
-            if game_data.get('user_id') != user_id:
-                raise GameNotFoundError()
+            logger.debug("game_record_updated", game_id=game_id)
+            return updated_game
             
-            doc_ref.delete()
+        except (GameNotFoundError, InvalidRollError, GameCompletedError):
+            raise
+        except Exception as e:
+            logger.error("game_update_failed", game_id=game_id, error=str(e))
+            raise
+    
+    async def delete(self, game_id: str, user_id: str) -> bool:
+        """ゲームを削除"""
+        try:
+            doc_ref = self.db.collection(self.collection).document(game_id)
             
-            logger.info(f"Game deleted: {game_id}")
+            @firestore.transactional
+            def _delete(transaction: firestore.Transaction) -> None:
+                doc = doc_ref.get(transaction=transaction)
+                
+                if not doc.exists:
+                    raise GameNotFoundError()
+                
+                game_data = doc.to_dict()
+                
+                # ユーザー権限チェック
+                if game_data.get('user_id') != user_id:
+                    raise GameNotFoundError()
+                
+                transaction.delete(doc_ref)
+                
+                # 完了ゲームの場合はユーザー統計から減算
+                if game_data.get('status') == "completed":
+                    frames = self._frames_from_document(game_data)
+                    transaction.set(
+                        self._statistics_ref(user_id),
+                        statistics_increment(
+                            game_statistics_delta(game_data.get('total_score', 0), frames),
+                            sign=-1
+                        ),
+                        merge=True
+                    )
+            
+            await run_blocking(_delete, self.db.transaction())
+            
+            logger.debug("game_record_deleted", game_id=game_id)
             return True
             
         except GameNotFoundError:
             raise
         except Exception as e:
-            logger.error(f"Failed to delete game {game_id}: {e}")
+            logger.error("game_delete_failed", game_id=game_id, error=str(e))
             raise
     
     async def get_user_games(
@@ -124,71 +397,77 @@ class GameRepository:
         user_id: str, 
         history_request: GameHistoryRequest
     ) -> GameHistoryResponse:
-        """ユーザーのゲーム履歴を取得"""
+        """ユーザーのゲーム履歴を取得
+
+        cursorが指定された場合は (played_at DESC, __name__ DESC) のキーセット
+        ページネーションで取得し、offsetは無視する。読み取り件数は
+        どちらのモードでもページサイズ+1件と件数集計のみとなる。
+        """
         try:
-            logger.info(f"🔍 Searching games for user_id: {user_id}")
-            logger.info(f"   Collection: {self.collection}")
-            logger.info(f"   Limit: {history_request.limit}, Offset: {history_request.offset}")
-            logger.info(f"   Status filter: {history_request.status}")
-            
-            # user_idで検索
-            query = self.db.collection(self.collection).where(
-                field_path="user_id",
-                op_string="==",
-                value=user_id
+            logger.debug(
+                "user_games_search",
+                user_id=user_id,
+                limit=history_request.limit,
+                offset=history_request.offset,
+                cursor=history_request.cursor is not None,
+                status=history_request.status
             )
             
-            # ステータスフィルター
-            if history_request.status:
-                query = query.where(
-                    field_path="status",
-                    op_string="==",
-                    value=history_request.status
-                )
-            
-            # デバッグ: 全ゲームドキュメントを確認
-            all_docs = list(self.db.collection(self.collection).stream())
-            logger.info(f"📚 Total games in collection: {len(all_docs)}")
-            if all_docs:
-                sample_game = all_docs[0].to_dict()
-                logger.info(f"   Sample game data: {{'user_id': '{sample_game.get('user_id')}', 'status': '{sample_game.get('status')}'}}")
-            
-            # 総件数を取得
-            total_query = query
-            total_docs = list(total_query.stream())
-            total = len(total_docs)
-            
-            logger.info(f"   Found {total} games matching user_id: {user_id}")
-            
-            # ページネーション
-            query = query.order_by("played_at", direction=firestore.Query.DESCENDING)
-            query = query.limit(history_request.limit).offset(history_request.offset)
+            total = await self._count_user_games(user_id, history_request)
+            query = self._history_page_query(user_id, history_request)
             
-            docs = query.stream()
+            docs = await run_blocking(query.get)
+            has_more = len(docs) > history_request.limit
+            docs = docs[:history_request.limit]
             games = []
             
             for doc in docs:
-                game_data = doc.to_dict()
-                game_data['id'] = doc.id
-                games.append(GameSchema(**game_data))
+                games.append(self._from_document(doc.id, doc.to_dict()).to_response())
+            
+            next_cursor = None
+            if has_more and games:
+                last_game = games[-1]
+                next_cursor = encode_cursor(last_game.played_at, last_game.id)
             
-            logger.info(f"✅ Retrieved {len(games)} games for user {user_id} (total: {total})")
+            logger.debug("user_games_retrieved", user_id=user_id, count=len(games), total=total)
             return GameHistoryResponse(
                 games=games,
                 total=total,
                 limit=history_request.limit,
-                offset=history_request.offset
+                offset=history_request.offset,
+                next_cursor=next_cursor
             )
             
+        except ValidationError:
+            raise
         except Exception as e:
-            logger.error(f"❌ Failed to get user games for {user_id}: {e}", exc_info=True)
+            logger.error("user_games_get_failed", user_id=user_id, error=str(e), exc_info=True)
             raise
     
     async def get_user_statistics(self, user_id: str) -> dict:
-        """ユーザーのゲーム統計を取得"""
+        """ユーザーのゲーム統計を取得（統計ドキュメントを1件読み取り）"""
         try:
-            logger.info(f"📊 Getting statistics for user_id: {user_id}")
+            doc = await run_blocking(self._statistics_ref(user_id).get)
+            document = doc.to_dict() if doc.exists else None
+            
+            if document is None or needs_rebuild(document):
+                # 統計ドキュメント未作成、または全件集計前に Increment で作成された
+                # （それ以前の完了ゲームを含まない）ユーザーはその場で再構築
+                logger.info("statistics_rebuild_required", user_id=user_id)
+                return await self.rebuild_user_statistics(user_id)
+            
+            statistics = statistics_from_document(document)
+            
+            logger.debug("user_statistics_retrieved", user_id=user_id)
+            return statistics
             
+        except Exception as e:
+            logger.error("user_statistics_get_failed", user_id=user_id, error=str(e))
+            raise
+    
+    async def rebuild_user_statistics(self, user_id: str) -> dict:
+        """完了ゲームを全件集計してユーザー統計ドキュメントを再構築"""
+        try:
             # 完了したゲームのみを取得
             query = self.db.collection(self.collection).where(
                 field_path="user_id",
@@ -199,73 +478,28 @@ class GameRepository:
                 op_string="==",
                 value="completed"
             )
-            docs = list(query.stream())
-            
-            logger.info(f"   Found {len(docs)} completed games")
-            
-            if not docs:
-                return {
-                    "total_games": 0,
-                    "completed_games": 0,
-                    "average_score": 0.0,
-                    "highest_score": 0,
-                    "lowest_score": 0,
-                    "strike_count": 0,
-                    "spare_count": 0,
-                    "perfect_games": 0,
-                    "turkey_count": 0
-                }
-            
-            total_games = len(docs)
-            completed_games = len(docs)
-            scores = [doc.to_dict().get('total_score', 0) for doc in docs]
-            
-            # 統計計算
-            average_score = sum(scores) / len(scores) if scores else 0.0
-            highest_score = max(scores) if scores else 0
-            lowest_score = min(scores) if scores else 0
-            perfect_games = sum(1 for score in scores if score == 300)
-            
-            # ストライク・スペア・ターキーカウント
-            strike_count = 0
-            spare_count = 0
-            turkey_count = 0
-            
-            for doc in docs:
-                game_data = doc.to_dict()
-                frames = game_data.get('frames', [])
-                
-                for frame in frames:
-                    if frame.get('is_strike'):
-                        strike_count += 1
-                    if frame.get('is_spare'):
-                        spare_count += 1
-                
-                # ターキーカウント（3連続ストライク）
-                consecutive_strikes = 0
-                for frame in frames:
-                    if frame.get('is_strike'):
-                        consecutive_strikes += 1
-                        if consecutive_strikes >= 3:
-                            turkey_count += 1
-                    else:
-                        consecutive_strikes = 0
-            
-            statistics = {
-                "total_games": total_games,
-                "completed_games": completed_games,
-                "average_score": round(average_score, 1),
-                "highest_score": highest_score,
-                "lowest_score": lowest_score,
-                "strike_count": strike_count,
-                "spare_count": spare_count,
-                "perfect_games": perfect_games,
-                "turkey_count": turkey_count
-            }
-            
-            logger.info(f"Retrieved statistics for user {user_id}")
-            return statistics
+            stats_ref = self._statistics_ref(user_id)
+            
+            @firestore.transactional
+            def _rebuild(transaction: firestore.Transaction) -> dict:
+                deltas = []
+                for doc in transaction.get(query):
+                    game_data = doc.to_dict()
+                    frames = self._frames_from_document(game_data)
+                    deltas.append(
+                        game_statistics_delta(game_data.get('total_score', 0), frames)
+                    )
+                document = build_statistics_document(deltas)
+                transaction.set(stats_ref, document)
+                return document
+            
+            document = await run_blocking(_rebuild, self.db.transaction())
+            
+            logger.info(
+                "statistics_rebuilt", user_id=user_id, completed_games=document['completed_games']
+            )
+            return statistics_from_document(document)
             
         except Exception as e:
-            logger.error(f"Failed to get user statistics for {user_id}: {e}")
+            logger.error("statistics_rebuild_failed", user_id=user_id, error=str(e))
             raise
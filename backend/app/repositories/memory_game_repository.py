@@ -0,0 +1,222 @@
+"""ゲームリポジトリ（インメモリ）"""
+import uuid
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+from app.models.game import GameCreate, GameHistoryRequest, GameHistoryResponse
+from app.repositories.base import BaseGameRepository
+from app.exceptions import GameNotFoundError
+from app.utils.metrics import instrument_repository
+from app.utils.tracing import trace_methods
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.game_state import GameState
+from app.utils.memory_store import HistoryKey, InMemoryStore, to_utc
+from app.utils.statistics import statistics_from_document
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# ゲームの保存期間（Firestoreの expire_at TTLと同じ。インメモリでは削除しない）
+GAME_RETENTION_DAYS = 90
+
+
+@instrument_repository("games")
+@trace_methods("GameRepository")
+class InMemoryGameRepository(BaseGameRepository):
+    """ゲームリポジトリ（インメモリ）
+
+    履歴はユーザーごとの二次インデックスから (played_at DESC, id DESC) の順に読み、
+    統計は完了ゲームの追加・削除時に統計ドキュメントを差分更新する。
+    保持しているゲーム状態を呼び出し元が変更しても影響しないよう、読み書きともにコピーを返す。
+    """
+
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    def _indexes(self, game: GameState) -> Tuple[List[HistoryKey], List[HistoryKey]]:
+        return (
+            self.store.games_by_user.setdefault(game.user_id, []),
+            self.store.games_by_user_status.setdefault((game.user_id, game.status), []),
+        )
+
+    def _add(self, game: GameState) -> None:
+        """ゲームを保存し、インデックス・統計に反映"""
+        self.store.games[game.id] = game
+        key = (game.played_at, game.id)
+        for index in self._indexes(game):
+            insort(index, key)
+        if game.status == "completed":
+            self._apply_statistics(game, sign=1)
+
+    def _remove(self, game: GameState) -> None:
+        """ゲームを削除し、インデックス・統計から除外"""
+        del self.store.games[game.id]
+        key = (game.played_at, game.id)
+        for index in self._indexes(game):
+            del index[bisect_left(index, key)]
+        if game.status == "completed":
+            self._apply_statistics(game, sign=-1)
+
+    def _apply_statistics(self, game: GameState, sign: int) -> None:
+        """ユーザー統計ドキュメントに1ゲーム分を加算（sign=-1 で減算）"""
+        document = self.store.statistics.setdefault(game.user_id, {
+            "completed_games": 0,
+            "score_sum": 0,
+            "strike_count": 0,
+            "spare_count": 0,
+            "turkey_count": 0,
+            "perfect_games": 0,
+            "score_histogram": {},
+        })
+        delta = game.statistics_delta()
+        document["completed_games"] += sign
+        document["score_sum"] += sign * delta["total_score"]
+        for key in ("strike_count", "spare_count", "turkey_count", "perfect_games"):
+            document[key] += sign * delta[key]
+        histogram = document["score_histogram"]
+        score_key = str(delta["total_score"])
+        histogram[score_key] = histogram.get(score_key, 0) + sign
+
+    def _replace(self, current: GameState, updated_game: GameState) -> None:
+        """保存済みのゲームを置き換え"""
+        updated_game.played_at = to_utc(updated_game.played_at)
+        self._remove(current)
+        self._add(updated_game)
+
+    def _owned(self, game_id: str, user_id: str) -> Optional[GameState]:
+        """ユーザーのゲームを取得（他ユーザーのゲームの場合はNone）"""
+        game = self.store.games.get(game_id)
+        if game is None or game.user_id != user_id:
+            return None
+        return game
+
+    def _page(self, user_id: str, history_request: GameHistoryRequest) -> Tuple[List[GameState], int, bool]:
+        """履歴1ページ分のゲーム・総件数・次ページの有無を取得"""
+        if history_request.status:
+            index = self.store.games_by_user_status.get((user_id, history_request.status), [])
+        else:
+            index = self.store.games_by_user.get(user_id, [])
+
+        if history_request.cursor:
+            played_at, last_id = decode_cursor(history_request.cursor)
+            end = bisect_left(index, (to_utc(played_at), last_id))
+        else:
+            end = max(len(index) - history_request.offset, 0)
+        start = max(end - history_request.limit, 0)
+
+        games = [self.store.games[game_id] for _, game_id in reversed(index[start:end])]
+        return games, len(index), start > 0
+
+    async def create(self, game_data: GameCreate) -> GameState:
+        """ゲームを作成"""
+        now = datetime.now(timezone.utc)
+        game = GameState.from_frames(
+            game_data.frames,
+            id=uuid.uuid4().hex,
+            user_id=game_data.user_id,
+            total_score=game_data.total_score,
+            status=game_data.status,
+            played_at=to_utc(game_data.played_at),
+            created_at=now,
+            updated_at=now,
+            expire_at=now + timedelta(days=GAME_RETENTION_DAYS)
+        )
+        self._add(game)
+
+        logger.debug("game_record_created", game_id=game.id)
+        return game.copy()
+
+    async def get_by_id(self, game_id: str, user_id: str) -> Optional[GameState]:
+        """ゲームIDでゲームを取得"""
+        game = self._owned(game_id, user_id)
+        return game.copy() if game is not None else None
+
+    async def get_version(self, game_id: str, user_id: str) -> Optional[datetime]:
+        """ゲームの updated_at のみを取得"""
+        game = self._owned(game_id, user_id)
+        return game.updated_at if game is not None else None
+
+    async def get_user_game_versions(
+        self,
+        user_id: str,
+        history_request: GameHistoryRequest
+    ) -> Tuple[List[Tuple[str, datetime]], int, bool]:
+        """履歴1ページ分の各ゲームの (id, updated_at)・総件数・次ページの有無を取得"""
+        games, total, has_more = self._page(user_id, history_request)
+        return [(game.id, game.updated_at) for game in games], total, has_more
+
+    async def update(self, game_id: str, game_data: GameState) -> GameState:
+        """ゲームを更新"""
+        current = self.store.games.get(game_id)
+        if current is None:
+            raise GameNotFoundError()
+
+        updated_game = game_data.copy()
+        updated_game.id = game_id
+        updated_game.updated_at = datetime.now(timezone.utc)
+        self._replace(current, updated_game)
+
+        logger.debug("game_record_updated", game_id=game_id)
+        return updated_game.copy()
+
+    async def apply_update(
+        self,
+        game_id: str,
+        user_id: str,
+        mutate: Callable[[GameState], GameState]
+    ) -> GameState:
+        """ゲームを読み取り・変更・書き込み
+
+        読み取りから書き込みまでの間に await を挟まないため、同じゲームへの
+        同時更新で変更が失われることはない。mutate が例外を送出した場合は何も変更しない。
+        """
+        current = self._owned(game_id, user_id)
+        if current is None:
+            raise GameNotFoundError()
+
+        updated_game = mutate(current.copy())
+        updated_game.updated_at = datetime.now(timezone.utc)
+        self._replace(current, updated_game)
+
+        logger.debug("game_record_updated", game_id=game_id)
+        return updated_game.copy()
+
+    async def delete(self, game_id: str, user_id: str) -> bool:
+        """ゲームを削除"""
+        game = self._owned(game_id, user_id)
+        if game is None:
+            raise GameNotFoundError()
+        self._remove(game)
+
+        logger.debug("game_record_deleted", game_id=game_id)
+        return True
+
+    async def get_user_games(
+        self,
+        user_id: str,
+        history_request: GameHistoryRequest
+    ) -> GameHistoryResponse:
+        """ユーザーのゲーム履歴を取得
+
+        cursorが指定された場合は (played_at DESC, id DESC) のキーセット
+        ページネーションで取得し、offsetは無視する。
+        """
+        games, total, has_more = self._page(user_id, history_request)
+        games = [game.to_response() for game in games]
+
+        next_cursor = None
+        if has_more and games:
+            last_game = games[-1]
+            next_cursor = encode_cursor(last_game.played_at, last_game.id)
+
+        return GameHistoryResponse(
+            games=games,
+            total=total,
+            limit=history_request.limit,
+            offset=history_request.offset,
+            next_cursor=next_cursor
+        )
+
+    async def get_user_statistics(self, user_id: str) -> dict:
+        """ユーザーのゲーム統計を取得"""
+        return statistics_from_document(self.store.statistics.get(user_id, {}))
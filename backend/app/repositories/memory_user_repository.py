@@ -0,0 +1,88 @@
+"""ユーザーリポジトリ（インメモリ）"""
+from datetime import datetime, timezone
+from typing import Optional
+from app.models.user import UserSchema, UserCreate, UserUpdate
+from app.repositories.base import BaseUserRepository
+from app.exceptions import UserNotFoundError
+from app.utils.metrics import instrument_repository
+from app.utils.tracing import trace_methods
+from app.utils.memory_store import InMemoryStore
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@instrument_repository("users")
+@trace_methods("UserRepository")
+class InMemoryUserRepository(BaseUserRepository):
+    """ユーザーリポジトリ（インメモリ）
+
+    保持しているモデルを呼び出し元が変更しても影響しないよう、読み書きともにコピーを返す。
+    """
+
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def create(self, user_data: UserCreate) -> UserSchema:
+        """ユーザーを作成"""
+        if user_data.uid in self.store.users or user_data.uid in self.store.user_ids_by_uid:
+            raise ValueError("User already exists")
+
+        now = datetime.now(timezone.utc)
+        user = UserSchema(**user_data.model_dump(), id=user_data.uid, created_at=now, updated_at=now)
+        self.store.users[user.id] = user
+        self.store.user_ids_by_uid[user.uid] = user.id
+
+        logger.debug("user_record_created", uid=user_data.uid)
+        return user.model_copy()
+
+    async def get_by_id(self, user_id: str) -> Optional[UserSchema]:
+        """ユーザーIDでユーザーを取得"""
+        user = self.store.users.get(user_id)
+        return user.model_copy() if user is not None else None
+
+    async def get_by_uid(self, uid: str) -> Optional[UserSchema]:
+        """Firebase UIDでユーザーを取得"""
+        user_id = self.store.user_ids_by_uid.get(uid)
+        if user_id is None:
+            logger.debug("user_record_not_found", uid=uid)
+            return None
+        return self.store.users[user_id].model_copy()
+
+    async def update(
+        self,
+        user_id: str,
+        user_data: UserUpdate,
+        current: Optional[UserSchema] = None
+    ) -> UserSchema:
+        """ユーザーを更新"""
+        user = self.store.users.get(user_id)
+        if user is None:
+            raise UserNotFoundError()
+
+        updated_user = user.model_copy(update={
+            **user_data.model_dump(exclude_unset=True),
+            'updated_at': datetime.now(timezone.utc)
+        })
+        self.store.users[user_id] = updated_user
+
+        logger.debug("user_record_updated", user_id=user_id)
+        return updated_user.model_copy()
+
+    async def delete(self, user_id: str) -> bool:
+        """ユーザーを削除"""
+        user = self.store.users.pop(user_id, None)
+        if user is None:
+            raise UserNotFoundError()
+        self.store.user_ids_by_uid.pop(user.uid, None)
+
+        logger.debug("user_record_deleted", user_id=user_id)
+        return True
+
+    async def exists(self, user_id: str) -> bool:
+        """ユーザーの存在チェック（ユーザーIDで検索）"""
+        return user_id in self.store.users
+
+    async def exists_by_uid(self, uid: str) -> bool:
+        """ユーザーの存在チェック（UIDで検索）"""
+        return uid in self.store.user_ids_by_uid
@@ -0,0 +1,364 @@
+"""ゲームリポジトリ（SQLite）"""
+import sqlite3
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, Optional, Tuple
+from app.models.game import GameCreate, GameHistoryRequest, GameHistoryResponse
+from app.repositories.base import BaseGameRepository
+from app.exceptions import GameNotFoundError, InvalidRollError, GameCompletedError, ValidationError
+from app.utils.executor import run_blocking
+from app.utils.metrics import instrument_repository
+from app.utils.tracing import trace_methods
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.game_state import GameState
+from app.utils.sqlite_database import SQLiteDatabase, from_db_datetime, to_db_datetime
+from app.utils.statistics import PERFECT_SCORE, empty_statistics
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# ゲームの保存期間（Firestoreの expire_at TTLと同じ）
+GAME_RETENTION_DAYS = 90
+
+_GAME_COLUMNS = (
+    "id, user_id, status, total_score, roll_string, "
+    "played_at, created_at, updated_at, expire_at"
+)
+
+
+@instrument_repository("games")
+@trace_methods("GameRepository")
+class SQLiteGameRepository(BaseGameRepository):
+    """ゲームリポジトリ（SQLite）
+
+    フレームはロール文字列（roll_string）で保存する。
+    統計はゲームごとのストライク・スペア・ターキー数を列に持ち、
+    統計ドキュメントを使わずにSQLの集計で算出する。
+    """
+
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> GameState:
+        """行からゲーム状態を作成"""
+        return GameState.from_roll_string(
+            row["roll_string"],
+            id=row["id"],
+            user_id=row["user_id"],
+            status=row["status"],
+            total_score=row["total_score"],
+            played_at=from_db_datetime(row["played_at"]),
+            created_at=from_db_datetime(row["created_at"]),
+            updated_at=from_db_datetime(row["updated_at"]),
+            expire_at=from_db_datetime(row["expire_at"])
+        )
+
+    @staticmethod
+    def _game_values(game: GameState) -> dict:
+        """ゲーム状態から更新する列の値を作成"""
+        delta = game.statistics_delta()
+        return {
+            "id": game.id,
+            "user_id": game.user_id,
+            "status": game.status,
+            "total_score": game.total_score,
+            "roll_string": game.roll_string(),
+            "strike_count": delta["strike_count"],
+            "spare_count": delta["spare_count"],
+            "turkey_count": delta["turkey_count"],
+            "played_at": to_db_datetime(game.played_at),
+            "updated_at": to_db_datetime(game.updated_at),
+        }
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, game: GameState) -> None:
+        """ゲームの行を更新"""
+        conn.execute(
+            "UPDATE games SET status = :status, total_score = :total_score, "
+            "roll_string = :roll_string, strike_count = :strike_count, "
+            "spare_count = :spare_count, turkey_count = :turkey_count, "
+            "played_at = :played_at, updated_at = :updated_at "
+            "WHERE id = :id",
+            SQLiteGameRepository._game_values(game)
+        )
+
+    @staticmethod
+    def _history_filter(user_id: str, history_request: GameHistoryRequest) -> Tuple[str, List[Any]]:
+        """ユーザー・ステータスの絞り込み条件を作成"""
+        where = "user_id = ?"
+        params: List[Any] = [user_id]
+        if history_request.status:
+            where += " AND status = ?"
+            params.append(history_request.status)
+        return where, params
+
+    def _select_page(
+        self,
+        columns: str,
+        user_id: str,
+        history_request: GameHistoryRequest
+    ) -> Tuple[List[sqlite3.Row], int]:
+        """履歴1ページ分（次ページの有無を判定するため1件多く）と総件数を取得"""
+        where, params = self._history_filter(user_id, history_request)
+        page_where = where
+        page_params = list(params)
+        offset = 0
+        if history_request.cursor:
+            played_at, last_id = decode_cursor(history_request.cursor)
+            played_at_value = to_db_datetime(played_at)
+            page_where += " AND (played_at < ? OR (played_at = ? AND id < ?))"
+            page_params += [played_at_value, played_at_value, last_id]
+        else:
+            offset = history_request.offset
+
+        # 総件数とページを同じ読み取りトランザクションで取得し、同時書き込みでずれないようにする
+        with self.db.read_transaction() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM games WHERE {where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {columns} FROM games WHERE {page_where} "
+                "ORDER BY played_at DESC, id DESC LIMIT ? OFFSET ?",
+                page_params + [history_request.limit + 1, offset]
+            ).fetchall()
+        return rows, total
+
+    async def create(self, game_data: GameCreate) -> GameState:
+        """ゲームを作成"""
+        try:
+            now = datetime.now(timezone.utc)
+            game = GameState.from_frames(
+                game_data.frames,
+                id=uuid.uuid4().hex,
+                user_id=game_data.user_id,
+                total_score=game_data.total_score,
+                status=game_data.status,
+                played_at=from_db_datetime(to_db_datetime(game_data.played_at)),
+                created_at=now,
+                updated_at=now,
+                expire_at=now + timedelta(days=GAME_RETENTION_DAYS)
+            )
+            values = self._game_values(game)
+            values["created_at"] = to_db_datetime(game.created_at)
+            values["expire_at"] = to_db_datetime(game.expire_at)
+
+            def _insert() -> None:
+                with self.db.transaction() as conn:
+                    conn.execute(
+                        "INSERT INTO games (id, user_id, status, total_score, roll_string, "
+                        "strike_count, spare_count, turkey_count, played_at, created_at, "
+                        "updated_at, expire_at) VALUES (:id, :user_id, :status, :total_score, "
+                        ":roll_string, :strike_count, :spare_count, :turkey_count, :played_at, "
+                        ":created_at, :updated_at, :expire_at)",
+                        values
+                    )
+
+            await run_blocking(_insert)
+
+            logger.debug("game_record_created", game_id=game.id)
+            return game
+
+        except Exception as e:
+            logger.error("game_create_failed", error=str(e))
+            raise
+
+    async def get_by_id(self, game_id: str, user_id: str) -> Optional[GameState]:
+        """ゲームIDでゲームを取得"""
+        try:
+            def _select() -> Optional[sqlite3.Row]:
+                return self.db.connection().execute(
+                    f"SELECT {_GAME_COLUMNS} FROM games WHERE id = ? AND user_id = ?",
+                    (game_id, user_id)
+                ).fetchone()
+
+            row = await run_blocking(_select)
+            return self._from_row(row) if row is not None else None
+
+        except Exception as e:
+            logger.error("game_get_failed", game_id=game_id, error=str(e))
+            raise
+
+    async def get_version(self, game_id: str, user_id: str) -> Optional[datetime]:
+        """ゲームの updated_at のみを取得"""
+        try:
+            def _select() -> Optional[sqlite3.Row]:
+                return self.db.connection().execute(
+                    "SELECT updated_at FROM games WHERE id = ? AND user_id = ?",
+                    (game_id, user_id)
+                ).fetchone()
+
+            row = await run_blocking(_select)
+            return from_db_datetime(row["updated_at"]) if row is not None else None
+
+        except Exception as e:
+            logger.error("game_version_get_failed", game_id=game_id, error=str(e))
+            raise
+
+    async def get_user_game_versions(
+        self,
+        user_id: str,
+        history_request: GameHistoryRequest
+    ) -> Tuple[List[Tuple[str, datetime]], int, bool]:
+        """履歴1ページ分の各ゲームの (id, updated_at)・総件数・次ページの有無を取得"""
+        try:
+            rows, total = await run_blocking(self._select_page, "id, updated_at", user_id, history_request)
+            versions = [
+                (row["id"], from_db_datetime(row["updated_at"]))
+                for row in rows[:history_request.limit]
+            ]
+            return versions, total, len(rows) > history_request.limit
+
+        except ValidationError:
+            raise
+        except Exception as e:
+            logger.error("game_versions_get_failed", user_id=user_id, error=str(e))
+            raise
+
+    async def update(self, game_id: str, game_data: GameState) -> GameState:
+        """ゲームを更新"""
+        try:
+            updated_game = game_data.copy()
+            updated_game.id = game_id
+            updated_game.updated_at = datetime.now(timezone.utc)
+
+            def _update() -> None:
+                with self.db.transaction() as conn:
+                    exists = conn.execute("SELECT 1 FROM games WHERE id = ?", (game_id,)).fetchone()
+                    if exists is None:
+                        raise GameNotFoundError()
+                    self._write(conn, updated_game)
+
+            await run_blocking(_update)
+
+            logger.debug("game_record_updated", game_id=game_id)
+            return updated_game
+
+        except GameNotFoundError:
+            raise
+        except Exception as e:
+            logger.error("game_update_failed", game_id=game_id, error=str(e))
+            raise
+
+    async def apply_update(
+        self,
+        game_id: str,
+        user_id: str,
+        mutate: Callable[[GameState], GameState]
+    ) -> GameState:
+        """トランザクション内でゲームを読み取り・変更・書き込み"""
+        try:
+            def _apply() -> GameState:
+                with self.db.transaction() as conn:
+                    row = conn.execute(
+                        f"SELECT {_GAME_COLUMNS} FROM games WHERE id = ? AND user_id = ?",
+                        (game_id, user_id)
+                    ).fetchone()
+                    if row is None:
+                        raise GameNotFoundError()
+
+                    updated_game = mutate(self._from_row(row))
+                    updated_game.updated_at = datetime.now(timezone.utc)
+                    self._write(conn, updated_game)
+                    return updated_game
+
+            updated_game = await run_blocking(_apply)
+
+            logger.debug("game_record_updated", game_id=game_id)
+            return updated_game
+
+        except (GameNotFoundError, InvalidRollError, GameCompletedError):
+            raise
+        except Exception as e:
+            logger.error("game_update_failed", game_id=game_id, error=str(e))
+            raise
+
+    async def delete(self, game_id: str, user_id: str) -> bool:
+        """ゲームを削除"""
+        try:
+            def _delete() -> int:
+                with self.db.transaction() as conn:
+                    return conn.execute(
+                        "DELETE FROM games WHERE id = ? AND user_id = ?", (game_id, user_id)
+                    ).rowcount
+
+            if await run_blocking(_delete) == 0:
+                raise GameNotFoundError()
+
+            logger.debug("game_record_deleted", game_id=game_id)
+            return True
+
+        except GameNotFoundError:
+            raise
+        except Exception as e:
+            logger.error("game_delete_failed", game_id=game_id, error=str(e))
+            raise
+
+    async def get_user_games(
+        self,
+        user_id: str,
+        history_request: GameHistoryRequest
+    ) -> GameHistoryResponse:
+        """ユーザーのゲーム履歴を取得
+
+        cursorが指定された場合は (played_at DESC, id DESC) のキーセット
+        ページネーションで取得し、offsetは無視する。
+        """
+        try:
+            rows, total = await run_blocking(self._select_page, _GAME_COLUMNS, user_id, history_request)
+            has_more = len(rows) > history_request.limit
+            games = [self._from_row(row).to_response() for row in rows[:history_request.limit]]
+
+            next_cursor = None
+            if has_more and games:
+                last_game = games[-1]
+                next_cursor = encode_cursor(last_game.played_at, last_game.id)
+
+            logger.debug("user_games_retrieved", user_id=user_id, count=len(games), total=total)
+            return GameHistoryResponse(
+                games=games,
+                total=total,
+                limit=history_request.limit,
+                offset=history_request.offset,
+                next_cursor=next_cursor
+            )
+
+        except ValidationError:
+            raise
+        except Exception as e:
+            logger.error("user_games_get_failed", user_id=user_id, error=str(e), exc_info=True)
+            raise
+
+    async def get_user_statistics(self, user_id: str) -> dict:
+        """ユーザーのゲーム統計を取得（完了ゲームのSQL集計）"""
+        try:
+            def _aggregate() -> sqlite3.Row:
+                return self.db.connection().execute(
+                    "SELECT COUNT(*) AS completed_games, SUM(total_score) AS score_sum, "
+                    "MAX(total_score) AS highest_score, MIN(total_score) AS lowest_score, "
+                    "SUM(strike_count) AS strike_count, SUM(spare_count) AS spare_count, "
+                    "SUM(turkey_count) AS turkey_count, "
+                    "SUM(total_score = ?) AS perfect_games "
+                    "FROM games WHERE user_id = ? AND status = 'completed'",
+                    (PERFECT_SCORE, user_id)
+                ).fetchone()
+
+            row = await run_blocking(_aggregate)
+            completed_games = row["completed_games"]
+            if completed_games == 0:
+                return empty_statistics()
+
+            logger.debug("user_statistics_retrieved", user_id=user_id)
+            return {
+                "total_games": completed_games,
+                "completed_games": completed_games,
+                "average_score": round(row["score_sum"] / completed_games, 1),
+                "highest_score": row["highest_score"],
+                "lowest_score": row["lowest_score"],
+                "strike_count": row["strike_count"],
+                "spare_count": row["spare_count"],
+                "perfect_games": row["perfect_games"],
+                "turkey_count": row["turkey_count"],
+            }
+
+        except Exception as e:
+            logger.error("user_statistics_get_failed", user_id=user_id, error=str(e))
+            raise
@@ -0,0 +1,169 @@
+"""ユーザーリポジトリ（SQLite）"""
+import sqlite3
+from datetime import datetime, timezone
+from typing import Optional
+from app.models.user import UserSchema, UserCreate, UserUpdate
+from app.repositories.base import BaseUserRepository
+from app.exceptions import UserNotFoundError
+from app.utils.executor import run_blocking
+from app.utils.metrics import instrument_repository
+from app.utils.tracing import trace_methods
+from app.utils.sqlite_database import SQLiteDatabase, from_db_datetime, to_db_datetime
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_USER_COLUMNS = "id, uid, email, display_name, photo_url, created_at, updated_at"
+
+
+@instrument_repository("users")
+@trace_methods("UserRepository")
+class SQLiteUserRepository(BaseUserRepository):
+    """ユーザーリポジトリ（SQLite）
+
+    ユーザーIDはFirestoreと同じくUIDを使う。
+    存在チェックはインデックスの参照のみのため、UIDのキャッシュは持たない。
+    """
+
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> UserSchema:
+        """行からユーザーモデルを作成"""
+        return UserSchema(
+            id=row["id"],
+            uid=row["uid"],
+            email=row["email"],
+            display_name=row["display_name"],
+            photo_url=row["photo_url"],
+            created_at=from_db_datetime(row["created_at"]),
+            updated_at=from_db_datetime(row["updated_at"])
+        )
+
+    def _select_one(self, where: str, value: str) -> Optional[sqlite3.Row]:
+        return self.db.connection().execute(
+            f"SELECT {_USER_COLUMNS} FROM users WHERE {where} = ?", (value,)
+        ).fetchone()
+
+    async def create(self, user_data: UserCreate) -> UserSchema:
+        """ユーザーを作成"""
+        try:
+            now = datetime.now(timezone.utc)
+            user = UserSchema(**user_data.model_dump(), id=user_data.uid, created_at=now, updated_at=now)
+
+            def _insert() -> None:
+                with self.db.transaction() as conn:
+                    conn.execute(
+                        "INSERT INTO users (id, uid, email, display_name, photo_url, created_at, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (user.id, user.uid, user.email, user.display_name, user.photo_url,
+                         to_db_datetime(now), to_db_datetime(now))
+                    )
+
+            try:
+                await run_blocking(_insert)
+            except sqlite3.IntegrityError:
+                raise ValueError("User already exists")
+
+            logger.debug("user_record_created", uid=user_data.uid)
+            return user
+
+        except Exception as e:
+            logger.error("user_create_failed", uid=user_data.uid, error=str(e))
+            raise
+
+    async def get_by_id(self, user_id: str) -> Optional[UserSchema]:
+        """ユーザーIDでユーザーを取得"""
+        try:
+            row = await run_blocking(self._select_one, "id", user_id)
+            return self._from_row(row) if row is not None else None
+        except Exception as e:
+            logger.error("user_get_failed", user_id=user_id, error=str(e))
+            raise
+
+    async def get_by_uid(self, uid: str) -> Optional[UserSchema]:
+        """Firebase UIDでユーザーを取得"""
+        try:
+            row = await run_blocking(self._select_one, "uid", uid)
+            if row is None:
+                logger.debug("user_record_not_found", uid=uid)
+                return None
+            return self._from_row(row)
+        except Exception as e:
+            logger.error("user_get_by_uid_failed", uid=uid, error=str(e), exc_info=True)
+            raise
+
+    async def update(
+        self,
+        user_id: str,
+        user_data: UserUpdate,
+        current: Optional[UserSchema] = None
+    ) -> UserSchema:
+        """ユーザーを更新
+
+        current（更新前のユーザー）が渡された場合は、書き込み後に再読み取りせず
+        更新内容を反映したモデルを返す。
+        """
+        try:
+            update_data = user_data.model_dump(exclude_unset=True)
+            now = datetime.now(timezone.utc)
+            assignments = ", ".join(f"{column} = ?" for column in update_data)
+
+            def _update() -> int:
+                with self.db.transaction() as conn:
+                    return conn.execute(
+                        f"UPDATE users SET {assignments + ', ' if assignments else ''}updated_at = ? WHERE id = ?",
+                        (*update_data.values(), to_db_datetime(now), user_id)
+                    ).rowcount
+
+            if await run_blocking(_update) == 0:
+                raise UserNotFoundError()
+
+            logger.debug("user_record_updated", user_id=user_id)
+
+            if current is None:
+                # 更新されたユーザーを取得
+                return self._from_row(await run_blocking(self._select_one, "id", user_id))
+            return current.model_copy(update={**update_data, "updated_at": now})
+
+        except UserNotFoundError:
+            raise
+        except Exception as e:
+            logger.error("user_update_failed", user_id=user_id, error=str(e))
+            raise
+
+    async def delete(self, user_id: str) -> bool:
+        """ユーザーを削除"""
+        try:
+            def _delete() -> int:
+                with self.db.transaction() as conn:
+                    return conn.execute("DELETE FROM users WHERE id = ?", (user_id,)).rowcount
+
+            if await run_blocking(_delete) == 0:
+                raise UserNotFoundError()
+
+            logger.debug("user_record_deleted", user_id=user_id)
+            return True
+
+        except UserNotFoundError:
+            raise
+        except Exception as e:
+            logger.error("user_delete_failed", user_id=user_id, error=str(e))
+            raise
+
+    async def exists(self, user_id: str) -> bool:
+        """ユーザーの存在チェック（ユーザーIDで検索）"""
+        try:
+            return await run_blocking(self._select_one, "id", user_id) is not None
+        except Exception as e:
+            logger.error("user_exists_check_failed", user_id=user_id, error=str(e))
+            raise
+
+    async def exists_by_uid(self, uid: str) -> bool:
+        """ユーザーの存在チェック（UIDで検索）"""
+        try:
+            return await run_blocking(self._select_one, "uid", uid) is not None
+        except Exception as e:
+            logger.error("user_exists_by_uid_check_failed", uid=uid, error=str(e))
+            raise
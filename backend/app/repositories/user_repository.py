@@ -1,53 +1,78 @@
 """ユーザーリポジトリ"""
+from google.api_core.exceptions import Conflict, NotFound
 from google.cloud import firestore
 from typing import List, Optional
 from datetime import datetime
-import logging
 from app.models.user import UserSchema, UserCreate, UserUpdate
+from app.config import settings
+from app.repositories.base import BaseUserRepository
 from app.exceptions import UserNotFoundError
+from app.utils.executor import run_blocking
+from app.utils.metrics import instrument_repository
+from app.utils.tracing import trace_methods
+from app.utils.existence_cache import ExistenceCache
+from app.utils.logging import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
-class UserRepository:
-    """ユーザーリポジトリ"""
+@instrument_repository("users")
+@trace_methods("UserRepository")
+class UserRepository(BaseUserRepository):
+    """ユーザーリポジトリ（Firestore）"""
     
     def __init__(self, db: firestore.Client):
         self.db = db
         self.collection = "users"
+        # 存在が確認済みのUID（ゲーム作成時の存在チェックを省略するため）
+        self.existing_uids = ExistenceCache(
+            max_size=settings.user_exists_cache_max_size,
+            ttl_seconds=settings.user_exists_cache_ttl_seconds
+        )
     
     async def create(self, user_data: UserCreate) -> UserSchema:
         """ユーザーを作成"""
         try:
             doc_ref = self.db.collection(self.collection).document(user_data.uid)
             
-            # 既存チェック
-            if doc_ref.get().exists:
-                raise ValueError("User already exists")
-            
-            user_dict = user_data.dict()
+            user_dict = user_data.model_dump()
             user_dict['id'] = user_data.uid
             user_dict['created_at'] = firestore.SERVER_TIMESTAMP
             user_dict['updated_at'] = firestore.SERVER_TIMESTAMP
             
-            doc_ref.set(user_dict)
+            # create は既存ドキュメントがある場合に失敗するため、事前の存在チェックは不要
+            try:
+                write_result = await run_blocking(doc_ref.create, user_dict)
+            except Conflict:
+                raise ValueError("User already exists")
+            self.existing_uids.add(user_data.uid)
+            
+            logger.debug("user_record_created", uid=user_data.uid)
             
-            # 作成されたユーザーを取得
-            doc = doc_ref.get()
-            user_data_dict = doc.to_dict()
-            user_data_dict['id'] = doc.id
+            if settings.firestore_read_after_write:
+                # 作成されたユーザーを取得
+                doc = await run_blocking(doc_ref.get)
+                user_data_dict = doc.to_dict()
+                user_data_dict['id'] = doc.id
+                return UserSchema(**user_data_dict)
             
-            logger.info(f"User created: {user_data.uid}")
-            return UserSchema(**user_data_dict)
+            # SERVER_TIMESTAMPは書き込み結果の update_time と同じ値に確定する
+            return UserSchema(
+                **user_data.model_dump(),
+                id=user_data.uid,
+                created_at=write_result.update_time,
+                updated_at=write_result.update_time
+            )
             
         except Exception as e:
-            logger.error(f"Failed to create user {user_data.uid}: {e}")
+            logger.error("user_create_failed", uid=user_data.uid, error=str(e))
             raise
     
     async def get_by_id(self, user_id: str) -> Optional[UserSchema]:
         """ユーザーIDでユーザーを取得"""
         try:
-            doc = self.db.collection(self.collection).document(user_id).get()
+            doc_ref = self.db.collection(self.collection).document(user_id)
+            doc = await run_blocking(doc_ref.get)
             
             if not doc.exists:
                 return None
@@ -58,55 +83,75 @@ class UserRepository:
             return UserSchema(**user_data)
             
         except Exception as e:
-            logger.error(f"Failed to get user {user_id}: {e}")
+            logger.error("user_get_failed", user_id=user_id, error=str(e))
             raise
     
     async def get_by_uid(self, uid: str) -> Optional[UserSchema]:
-        """Firebase UIDでユーザーを取得"""
+        """Firebase UIDでユーザーを取得
+
+        ユーザーはUIDをドキュメントIDとして作成されるため、まずポイント読み取りを行い、
+        見つからない場合のみ uid フィールドで検索する（旧形式のドキュメント向け）。
+        """
         try:
-            logger.info(f"🔍 [REPO] Searching for user with uid: {uid}")
-            query = self.db.collection(self.collection).where("uid", "==", uid).limit(1)
-            docs = query.stream()
+            doc = await run_blocking(self.db.collection(self.collection).document(uid).get)
+            if not (doc.exists and doc.to_dict().get("uid") == uid):
+                query = self.db.collection(self.collection).where("uid", "==", uid).limit(1)
+                docs = await run_blocking(query.get)
+                doc = docs[0] if docs else None
 
-            for doc in docs:
-                logger.info(f"✅ [REPO] User found: {doc.id}")
-                user_data = doc.to_dict()
-                user_data['id'] = doc.id
-                return UserSchema(**user_data)
+            if doc is None:
+                logger.debug("user_record_not_found", uid=uid)
+                return None
 
-            logger.info(f"ℹ️ [REPO] User not found with uid: {uid}")
-            return None
+            logger.debug("user_record_found", user_id=doc.id)
+            self.existing_uids.add(uid)
+            user_data = doc.to_dict()
+            user_data['id'] = doc.id
+            return UserSchema(**user_data)
 
         except Exception as e:
-            logger.error(f"❌ [REPO] Failed to get user by UID {uid}: {e}", exc_info=True)
+            logger.error("user_get_by_uid_failed", uid=uid, error=str(e), exc_info=True)
             raise
     
-    async def update(self, user_id: str, user_data: UserUpdate) -> UserSchema:
-        """ユーザーを更新"""
+    async def update(
+        self,
+        user_id: str,
+        user_data: UserUpdate,
+        current: Optional[UserSchema] = None
+    ) -> UserSchema:
+        """ユーザーを更新
+
+        current（更新前のユーザー）が渡された場合は、書き込み後に再読み取りせず
+        更新内容を反映したモデルを返す。
+        """
         try:
             doc_ref = self.db.collection(self.collection).document(user_id)
             
-            # 既存チェック
-            if not doc_ref.get().exists:
-                raise UserNotFoundError()
+            # 指定された項目のみ（UserUpdate で検証済み）
+            changes = user_data.model_dump(exclude_unset=True)
+            update_data = {**changes, 'updated_at': firestore.SERVER_TIMESTAMP}
             
-            update_data = user_data.dict(exclude_unset=True)
-            update_data['updated_at'] = firestore.SERVER_TIMESTAMP
+            # update は存在しないドキュメントに対して失敗するため、事前の存在チェックは不要
+            try:
+                write_result = await run_blocking(doc_ref.update, update_data)
+            except NotFound:
+                raise UserNotFoundError()
             
-            doc_ref.update(update_data)
+            logger.debug("user_record_updated", user_id=user_id)
             
-            # 更新されたユーザーを取得
-            doc = doc_ref.get()
-            user_data_dict = doc.to_dict()
-            user_data_dict['id'] = doc.id
+            if current is None or settings.firestore_read_after_write:
+                # 更新されたユーザーを取得
+                doc = await run_blocking(doc_ref.get)
+                user_data_dict = doc.to_dict()
+                user_data_dict['id'] = doc.id
+                return UserSchema(**user_data_dict)
             
-            logger.info(f"User updated: {user_id}")
-            return UserSchema(**user_data_dict)
+            return current.model_copy(update={**changes, 'updated_at': write_result.update_time})
             
         except UserNotFoundError:
             raise
         except Exception as e:
-            logger.error(f"Failed to update user {user_id}: {e}")
+            logger.error("user_update_failed", user_id=user_id, error=str(e))
             raise
     
     async def delete(self, user_id: str) -> bool:
@@ -115,34 +160,43 @@ class UserRepository:
             doc_ref = self.db.collection(self.collection).document(user_id)
             
             # 既存チェック
-            if not doc_ref.get().exists:
+            doc = await run_blocking(doc_ref.get)
+            if not doc.exists:
                 raise UserNotFoundError()
             
-            doc_ref.delete()
+            await run_blocking(doc_ref.delete)
+            self.existing_uids.discard(user_id)
+            self.existing_uids.discard(doc.to_dict().get("uid"))
             
-            logger.info(f"User deleted: {user_id}")
+            logger.debug("user_record_deleted", user_id=user_id)
             return True
             
         except UserNotFoundError:
             raise
         except Exception as e:
-            logger.error(f"Failed to delete user {user_id}: {e}")
+            logger.error("user_delete_failed", user_id=user_id, error=str(e))
             raise
     
     async def exists(self, user_id: str) -> bool:
         """ユーザーの存在チェック（ドキュメントIDで検索）"""
         try:
-            doc = self.db.collection(self.collection).document(user_id).get()
+            doc_ref = self.db.collection(self.collection).document(user_id)
+            doc = await run_blocking(doc_ref.get)
             return doc.exists
         except Exception as e:
-            logger.error(f"Failed to check user existence {user_id}: {e}")
+            logger.error("user_exists_check_failed", user_id=user_id, error=str(e))
             raise
     
     async def exists_by_uid(self, uid: str) -> bool:
-        """ユーザーの存在チェック（UIDで検索）"""
+        """ユーザーの存在チェック（UIDで検索）
+
+        存在が確認済みのUIDはキャッシュし、Firestoreへの問い合わせを省略する。
+        """
+        if self.existing_uids.contains(uid):
+            return True
         try:
             user = await self.get_by_uid(uid)
             return user is not None
         except Exception as e:
-            logger.error(f"Failed to check user existence by UID {uid}: {e}")
+            logger.error("user_exists_by_uid_check_failed", uid=uid, error=str(e))
             raise
@@ -1,11 +1,16 @@
-"""ゲームAPIルーター"""
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import Dict, Any
+"""ゲームAPIルーター
+
+サービスが返すゲーム状態（GameState）は、ここで to_response によりレスポンスモデルに変換する。
+"""
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from typing import Dict, Any, Optional
 from app.auth.dependencies import get_current_user, get_current_user_id
 from app.services.game_service import GameService
-from app.models.game import GameResponse, RollRequest, GameHistoryRequest, GameHistoryResponse, GameStatistics, CompletedGameRequest
-from app.models.common import success_response, error_response, MetaInfo
-from app.exceptions import GameNotFoundError, InvalidRollError, GameCompletedError
+from app.dependencies import get_game_service
+from app.models.game import GameResponse, RollRequest, BatchRollRequest, GameHistoryRequest, GameHistoryResponse, GameStatistics, CompletedGameRequest
+from app.models.common import success_json_response, not_modified_response, error_response, MetaInfo
+from app.exceptions import GameNotFoundError, InvalidRollError, GameCompletedError, ValidationError
+from app.utils.etag import etag_matches, game_etag, history_etag
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -13,18 +18,6 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="/games", tags=["games"])
 
 
-def get_game_service() -> GameService:
-    """ゲームサービスの依存関係注入"""
-    from app.dependencies import get_firestore_client
-    from app.repositories.game_repository import GameRepository
-    from app.repositories.user_repository import UserRepository
-    
-    db = get_firestore_client()
-    game_repo = GameRepository(db)
-    user_repo = UserRepository(db)
-    return GameService(game_repo, user_repo)
-
-
 @router.post("/", response_model=Dict[str, Any])
 async def save_game(
     game_data: CompletedGameRequest,
@@ -67,17 +60,35 @@ async def save_game(
     }
     ```
     
+    ロールのみの送信も可能です（totalScore・frameScore・isStrike・isSpare・isCompletedは省略可）:
+    ```json
+    {
+      "gameDate": "2025-10-05T12:00:00Z",
+      "frames": [
+        {"frameNumber": 1, "firstRoll": 10},
+        {"frameNumber": 2, "firstRoll": 7, "secondRoll": 3}
+      ]
+    }
+    ```
+    
     注意: 
     - frameNumberは1から10まで（0始まりではありません）
+    - 1-10フレームをすべて含めてください
     - userIdはリクエストに含めないでください（認証トークンから自動取得）
+    - スコアとフラグはサーバー側でロールから再計算されます。送信値と異なる場合、
+      設定（APP_SCORE_VERIFICATION_MODE）に応じて補正（correct）または拒否（reject）されます
     """
     try:
         uid = current_user.get("uid")
         
         # 認証トークンからuserIdを取得してゲームデータを保存
         game = await game_service.save_completed_game_with_uid(uid, game_data)
-        return success_response(data=game.dict())
+        return success_json_response(data=game.to_response())
         
+    except InvalidRollError as e:
+        return error_response("INVALID_ROLL", e.detail)
+    except ValidationError as e:
+        return error_response("SCORE_MISMATCH", e.detail)
     except ValueError as e:
         return error_response("USER_NOT_FOUND", str(e))
     except Exception as e:
@@ -94,7 +105,7 @@ async def create_game(
     try:
         uid = current_user.get("uid")
         game = await game_service.create_game(uid)
-        return success_response(data=game.dict())
+        return success_json_response(data=game.to_response())
 
     except ValueError as e:
         return error_response("USER_NOT_FOUND", str(e))
@@ -108,35 +119,54 @@ async def get_game_history(
     limit: int = 20,
     offset: int = 0,
     status: str = None,
+    cursor: str = None,
+    if_none_match: Optional[str] = Header(None),
     current_user: Dict[str, Any] = Depends(get_current_user),
     game_service: GameService = Depends(get_game_service)
 ):
-    """ゲーム履歴を取得"""
-    try:
-        logger.info(f"📊 [ROUTER] get_game_history called for uid: {current_user.get('uid')}")
-        logger.info(f"   Params: limit={limit}, offset={offset}, status={status}")
+    """
+    ゲーム履歴を取得
+
+    レスポンスの meta.next_cursor を次回リクエストの cursor に指定すると、
+    offsetを使わずに続きのページを取得できます（キーセットページネーション）。
+    次のページが存在しない場合、next_cursor は null になります。
 
+    レスポンスの ETag を If-None-Match に指定すると、ページ内容に変更がない場合は
+    304 Not Modified を返します。
+    """
+    try:
         uid = current_user.get("uid")
         history_request = GameHistoryRequest(
             limit=limit,
             offset=offset,
-            status=status
+            status=status,
+            cursor=cursor
         )
-        history = await game_service.get_game_history(uid, history_request)
+        if if_none_match:
+            etag = await game_service.get_game_history_etag(uid, history_request)
+            if etag_matches(if_none_match, etag):
+                return not_modified_response(etag)
 
-        logger.info(f"✅ [ROUTER] Received {len(history.games)} games from service")
+        history = await game_service.get_game_history(uid, history_request)
 
         meta = MetaInfo(
             total=history.total,
             limit=history.limit,
-            offset=history.offset
+            offset=history.offset,
+            next_cursor=history.next_cursor
         )
 
-        return success_response(
-            data=[game.dict() for game in history.games],
-            meta=meta
+        etag = history_etag(
+            [(game.id, game.updated_at) for game in history.games],
+            history.total,
+            history.limit,
+            history.offset,
+            history.next_cursor is not None
         )
+        return success_json_response(data=history.games, meta=meta, etag=etag)
 
+    except ValidationError as e:
+        return error_response("INVALID_CURSOR", e.detail)
     except Exception as e:
         logger.error(f"❌ [ROUTER] Failed to get game history: {e}", exc_info=True)
         return error_response("GET_FAILED", "Failed to get game history")
@@ -151,7 +181,7 @@ async def get_game_statistics(
     try:
         uid = current_user.get("uid")
         stats = await game_service.get_game_statistics(uid)
-        return success_response(data=stats.dict())
+        return success_json_response(data=stats)
 
     except Exception as e:
         logger.error(f"Failed to get game statistics: {e}")
@@ -161,14 +191,25 @@ async def get_game_statistics(
 @router.get("/{game_id}", response_model=Dict[str, Any])
 async def get_game(
     game_id: str,
+    if_none_match: Optional[str] = Header(None),
     current_user: Dict[str, Any] = Depends(get_current_user),
     game_service: GameService = Depends(get_game_service)
 ):
-    """ゲームを取得"""
+    """
+    ゲームを取得
+
+    レスポンスの ETag を If-None-Match に指定すると、ゲームに変更がない場合は
+    304 Not Modified を返します。
+    """
     try:
         uid = current_user.get("uid")
+        if if_none_match:
+            etag = await game_service.get_game_etag(game_id, uid)
+            if etag is not None and etag_matches(if_none_match, etag):
+                return not_modified_response(etag)
+
         game = await game_service.get_game(game_id, uid)
-        return success_response(data=game.dict())
+        return success_json_response(data=game.to_response(), etag=game_etag(game.id, game.updated_at))
         
     except GameNotFoundError:
         return error_response("GAME_NOT_FOUND", "Game not found")
@@ -188,7 +229,7 @@ async def add_roll(
     try:
         uid = current_user.get("uid")
         game = await game_service.add_roll(game_id, uid, roll)
-        return success_response(data=game.dict())
+        return success_json_response(data=game.to_response())
         
     except GameNotFoundError:
         return error_response("GAME_NOT_FOUND", "Game not found")
@@ -201,6 +242,46 @@ async def add_roll(
         return error_response("UPDATE_FAILED", "Failed to add roll")
 
 
+@router.post("/{game_id}/rolls", response_model=Dict[str, Any])
+async def add_rolls(
+    game_id: str,
+    batch: BatchRollRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    game_service: GameService = Depends(get_game_service)
+):
+    """
+    複数のロールを一括追加
+
+    自動ピンセッターなどから複数投をまとめて送信する場合に使用します。
+    rollsは投球順に指定してください。いずれかのロールが不正な場合は1件も反映されません。
+
+    リクエスト例:
+    ```json
+    {
+      "rolls": [
+        {"frame_number": 1, "pin_count": 10},
+        {"frame_number": 2, "pin_count": 7},
+        {"frame_number": 2, "pin_count": 3}
+      ]
+    }
+    ```
+    """
+    try:
+        uid = current_user.get("uid")
+        game = await game_service.add_rolls(game_id, uid, batch.rolls)
+        return success_json_response(data=game.to_response())
+        
+    except GameNotFoundError:
+        return error_response("GAME_NOT_FOUND", "Game not found")
+    except InvalidRollError as e:
+        return error_response("INVALID_ROLL", e.detail)
+    except GameCompletedError:
+        return error_response("GAME_COMPLETED", "Game is already completed")
+    except Exception as e:
+        logger.error(f"Failed to add rolls to game {game_id}: {e}")
+        return error_response("UPDATE_FAILED", "Failed to add rolls")
+
+
 @router.delete("/{game_id}", response_model=Dict[str, Any])
 async def delete_game(
     game_id: str,
@@ -211,7 +292,7 @@ async def delete_game(
     try:
         uid = current_user.get("uid")
         await game_service.delete_game(game_id, uid)
-        return success_response(data={"message": "Game deleted successfully"})
+        return success_json_response(data={"message": "Game deleted successfully"})
 
     except GameNotFoundError:
         return error_response("GAME_NOT_FOUND", "Game not found")
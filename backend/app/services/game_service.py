@@ -1,28 +1,39 @@
-"""ゲームサービス"""
-from typing import List
-import logging
+"""ゲームサービス
+
+ゲーム1件を返すメソッドは GameState（Pydanticモデルではない内部表現）を返し、
+レスポンスモデルへの変換はルーターで行う。
+"""
+from typing import List, Optional, Tuple
 from datetime import datetime
-from app.repositories.game_repository import GameRepository
-from app.repositories.user_repository import UserRepository
+from app.repositories.base import BaseGameRepository, BaseUserRepository
 from app.models.game import (
-    GameCreate, GameResponse, RollRequest, GameHistoryRequest, 
+    GameCreate, RollRequest, GameHistoryRequest,
     GameHistoryResponse, GameStatistics, CompletedGameRequest, Frame
 )
-from app.exceptions import GameNotFoundError, InvalidRollError, GameCompletedError
-from app.utils.scoring import calculate_score, create_initial_frames
+from app.config import settings
+from app.exceptions import GameNotFoundError, InvalidRollError, GameCompletedError, ValidationError
+from app.utils.game_state import GameState
+from app.utils.scoring import calculate_score, calculate_batch_score, is_valid_frame, IncrementalScorer
+from app.utils.tracing import trace_methods
+from app.utils.etag import game_etag, history_etag
 from app.utils.logging import get_logger, GameLogger
 
 logger = get_logger(__name__)
 
 
+@trace_methods("GameService")
 class GameService:
-    """ゲームサービス"""
+    """ゲームサービス
+
+ゲーム1件を返すメソッドは GameState（Pydanticモデルではない内部表現）を返し、
+レスポンスモデルへの変換はルーターで行う。
+"""
     
-    def __init__(self, game_repo: GameRepository, user_repo: UserRepository):
+    def __init__(self, game_repo: BaseGameRepository, user_repo: BaseUserRepository):
         self.game_repo = game_repo
         self.user_repo = user_repo
     
-    async def create_game(self, user_id: str) -> GameResponse:
+    async def create_game(self, user_id: str) -> GameState:
         """新しいゲームを作成"""
         try:
             # ユーザー存在チェック（UIDで検索）
@@ -30,191 +41,196 @@ class GameService:
             if not user_exists:
                 raise ValueError("User not found")
             
-            # 初期フレームを作成
-            frames = create_initial_frames()
-            
-            # ゲームデータを作成
+            # ゲームデータを作成（フレームはロールなしの状態からリポジトリが作成する）
             game_data = GameCreate(
                 user_id=user_id,
                 total_score=0,
-                frames=frames,
                 status="playing"
             )
             
             # ゲーム作成
-            game_schema = await self.game_repo.create(game_data)
+            game = await self.game_repo.create(game_data)
             
-            GameLogger.log_game_created(game_schema.id, user_id)
+            GameLogger.log_game_created(game.id, user_id)
             
-            return GameResponse(
-                id=game_schema.id,
-                user_id=game_schema.user_id,
-                total_score=game_schema.total_score,
-                frames=game_schema.frames,
-                status=game_schema.status,
-                played_at=game_schema.played_at,
-                created_at=game_schema.created_at,
-                updated_at=game_schema.updated_at
-            )
+            return game
             
         except ValueError as e:
-            logger.warning(f"Game creation failed: {e}")
+            logger.warning("game_create_rejected", error=str(e))
             raise
         except Exception as e:
-            logger.error(f"Failed to create game: {e}")
+            logger.error("game_create_failed", error=str(e))
             raise
     
-    async def get_game(self, game_id: str, user_id: str) -> GameResponse:
+    async def get_game(self, game_id: str, user_id: str) -> GameState:
         """ゲームを取得"""
         try:
-            game_schema = await self.game_repo.get_by_id(game_id, user_id)
-            if not game_schema:
+            game = await self.game_repo.get_by_id(game_id, user_id)
+            if not game:
                 raise GameNotFoundError()
             
-            return GameResponse(
-                id=game_schema.id,
-                user_id=game_schema.user_id,
-                total_score=game_schema.total_score,
-                frames=game_schema.frames,
-                status=game_schema.status,
-                played_at=game_schema.played_at,
-                created_at=game_schema.created_at,
-                updated_at=game_schema.updated_at
-            )
+            return game
             
         except GameNotFoundError:
             raise
         except Exception as e:
-            logger.error(f"Failed to get game {game_id}: {e}")
+            logger.error("game_get_failed", game_id=game_id, error=str(e))
             raise
     
-    async def add_roll(self, game_id: str, user_id: str, roll: RollRequest) -> GameResponse:
-        """ロールを追加"""
+    async def get_game_etag(self, game_id: str, user_id: str) -> Optional[str]:
+        """ゲームのETagを取得（ゲーム本体は読み込まない。存在しない場合はNone）"""
+        updated_at = await self.game_repo.get_version(game_id, user_id)
+        if updated_at is None:
+            return None
+        return game_etag(game_id, updated_at)
+    
+    async def get_game_history_etag(self, user_id: str, history_request: GameHistoryRequest) -> str:
+        """ゲーム履歴1ページ分のETagを取得（ゲーム本体は読み込まない）"""
+        versions, total, has_more = await self.game_repo.get_user_game_versions(user_id, history_request)
+        return history_etag(versions, total, history_request.limit, history_request.offset, has_more)
+    
+    async def add_roll(self, game_id: str, user_id: str, roll: RollRequest) -> GameState:
+        """ロールを追加
+
+        ゲームの読み取り・検証・スコア計算・書き込みを1つのトランザクションで行うため、
+        別端末からの同時ロールで更新が失われることはない。
+        """
         try:
-            # ゲームを取得
-            game_schema = await self.game_repo.get_by_id(game_id, user_id)
-            if not game_schema:
-                raise GameNotFoundError()
+            def _apply(game: GameState) -> GameState:
+                # 検証・スコア計算（IncrementalScorer 上で行う）
+                return calculate_score(game, roll, validate=self._validate_roll)
             
-            # ゲーム完了チェック
-            if game_schema.status == "completed":
-                raise GameCompletedError()
+            # ゲーム更新（トランザクション）
+            updated_game = await self.game_repo.apply_update(game_id, user_id, _apply)
             
-            # ロールバリデーション
-            frame_index = roll.frame_number - 1
-            frame = game_schema.frames[frame_index]
+            GameLogger.log_roll_added(game_id, user_id, roll.frame_number, roll.pin_count)
             
-            # フレーム完了チェック
-            if frame.is_completed:
-                raise InvalidRollError("Frame is already completed")
+            # ゲーム完了チェック
+            if updated_game.status == "completed":
+                GameLogger.log_game_completed(game_id, user_id, updated_game.total_score)
             
-            # ピン数バリデーション
-            if roll.frame_number < 10:
-                # 1-9フレーム
-                if len(frame.rolls) == 0 and roll.pin_count == 10:
-                    # ストライク
-                    pass
-                elif len(frame.rolls) == 1:
-                    # 2投目
-                    if frame.rolls[0] + roll.pin_count > 10:
-                        raise InvalidRollError("Total pins cannot exceed 10")
-                else:
-                    raise InvalidRollError("Invalid roll for this frame")
-            else:
-                # 10フレーム目
-                if len(frame.rolls) == 0 and roll.pin_count == 10:
-                    # ストライク
-                    pass
-                elif len(frame.rolls) == 1:
-                    # 2投目
-                    if not frame.is_strike and frame.rolls[0] + roll.pin_count > 10:
-                        raise InvalidRollError("Total pins cannot exceed 10")
-                elif len(frame.rolls) == 2:
-                    # 3投目
-                    if frame.is_strike or frame.is_spare:
-                        pass
-                    else:
-                        raise InvalidRollError("No third roll allowed for this frame")
-                else:
-                    raise InvalidRollError("Invalid roll for this frame")
+            return updated_game
             
-            # スコア計算
-            updated_game = calculate_score(game_schema, roll)
+        except (GameNotFoundError, InvalidRollError, GameCompletedError):
+            raise
+        except Exception as e:
+            logger.error("roll_add_failed", game_id=game_id, error=str(e))
+            raise
+    
+    async def add_rolls(self, game_id: str, user_id: str, rolls: List[RollRequest]) -> GameState:
+        """複数のロールを一括追加
+
+        全ロールを投球順に検証・追加し、スコア再計算と書き込みは1回のみ行う。
+        いずれかのロールが不正な場合は1件も反映しない。
+        """
+        try:
+            def _apply(game: GameState) -> GameState:
+                positions = iter(range(1, len(rolls) + 1))
+                
+                def _validate(scorer: IncrementalScorer, roll: RollRequest) -> None:
+                    position = next(positions)
+                    try:
+                        self._validate_roll(scorer, roll)
+                    except InvalidRollError as e:
+                        raise InvalidRollError(f"Roll {position}: {e.detail}")
+                
+                return calculate_batch_score(game, rolls, validate=_validate)
             
-            # ゲーム更新
-            updated_game_schema = await self.game_repo.update(game_id, updated_game)
+            # ゲーム更新（トランザクション）
+            updated_game = await self.game_repo.apply_update(game_id, user_id, _apply)
             
-            GameLogger.log_roll_added(game_id, user_id, roll.frame_number, roll.pin_count)
+            GameLogger.log_rolls_added(game_id, user_id, len(rolls))
             
             # ゲーム完了チェック
-            if updated_game_schema.status == "completed":
-                GameLogger.log_game_completed(game_id, user_id, updated_game_schema.total_score)
+            if updated_game.status == "completed":
+                GameLogger.log_game_completed(game_id, user_id, updated_game.total_score)
             
-            return GameResponse(
-                id=updated_game_schema.id,
-                user_id=updated_game_schema.user_id,
-                total_score=updated_game_schema.total_score,
-                frames=updated_game_schema.frames,
-                status=updated_game_schema.status,
-                played_at=updated_game_schema.played_at,
-                created_at=updated_game_schema.created_at,
-                updated_at=updated_game_schema.updated_at
-            )
+            return updated_game
             
         except (GameNotFoundError, InvalidRollError, GameCompletedError):
             raise
         except Exception as e:
-            logger.error(f"Failed to add roll to game {game_id}: {e}")
+            logger.error("rolls_add_failed", game_id=game_id, error=str(e))
             raise
     
+    @staticmethod
+    def _validate_roll(scorer: IncrementalScorer, roll: RollRequest) -> None:
+        """ロールがフレームのルールに従っているか検証"""
+        # ゲーム完了チェック
+        if scorer.is_completed:
+            raise GameCompletedError()
+        
+        # ロールバリデーション
+        frame_index = roll.frame_number - 1
+        rolls = scorer.frame_rolls[frame_index]
+        
+        # フレーム完了チェック
+        if scorer.is_frame_completed(frame_index):
+            raise InvalidRollError("Frame is already completed")
+        
+        # ピン数バリデーション
+        if roll.frame_number < 10:
+            # 1-9フレーム
+            if len(rolls) == 0:
+                # 1投目（ストライクを含む）
+                pass
+            elif len(rolls) == 1:
+                # 2投目
+                if rolls[0] + roll.pin_count > 10:
+                    raise InvalidRollError("Total pins cannot exceed 10")
+            else:
+                raise InvalidRollError("Invalid roll for this frame")
+        else:
+            # 10フレーム目
+            if len(rolls) == 0:
+                # 1投目（ストライクを含む）
+                pass
+            elif len(rolls) == 1:
+                # 2投目
+                if not scorer.is_strike(frame_index) and rolls[0] + roll.pin_count > 10:
+                    raise InvalidRollError("Total pins cannot exceed 10")
+            elif len(rolls) == 2:
+                # 3投目
+                if scorer.is_strike(frame_index) or scorer.is_spare(frame_index):
+                    pass
+                else:
+                    raise InvalidRollError("No third roll allowed for this frame")
+            else:
+                raise InvalidRollError("Invalid roll for this frame")
+    
     async def delete_game(self, game_id: str, user_id: str) -> bool:
         """ゲームを削除"""
         try:
             await self.game_repo.delete(game_id, user_id)
-            logger.info(f"Game deleted successfully: {game_id}")
+            logger.info("game_deleted", game_id=game_id)
             return True
             
         except GameNotFoundError:
             raise
         except Exception as e:
-            logger.error(f"Failed to delete game {game_id}: {e}")
+            logger.error("game_delete_failed", game_id=game_id, error=str(e))
             raise
     
     async def get_game_history(self, user_id: str, history_request: GameHistoryRequest) -> GameHistoryResponse:
         """ゲーム履歴を取得"""
         try:
-            logger.info(f"🔧 [SERVICE] get_game_history called for user_id: {user_id}")
-            logger.info(f"   Request: limit={history_request.limit}, offset={history_request.offset}, status={history_request.status}")
-
+            # 履歴1ページ分はリポジトリがレスポンスモデルとして作成する
             history_response = await self.game_repo.get_user_games(user_id, history_request)
 
-            logger.info(f"✅ [SERVICE] Repository returned {len(history_response.games)} games")
-
-            # GameSchemaをGameResponseに変換
-            games = []
-            for game_schema in history_response.games:
-                games.append(GameResponse(
-                    id=game_schema.id,
-                    user_id=game_schema.user_id,
-                    total_score=game_schema.total_score,
-                    frames=game_schema.frames,
-                    status=game_schema.status,
-                    played_at=game_schema.played_at,
-                    created_at=game_schema.created_at,
-                    updated_at=game_schema.updated_at
-                ))
-
-            logger.info(f"✅ [SERVICE] Converted to {len(games)} GameResponse objects")
-
-            return GameHistoryResponse(
-                games=games,
-                total=history_response.total,
-                limit=history_response.limit,
-                offset=history_response.offset
+            logger.info(
+                "game_history_retrieved",
+                user_id=user_id,
+                count=len(history_response.games),
+                limit=history_request.limit,
+                offset=history_request.offset,
+                cursor=history_request.cursor is not None,
+                status=history_request.status
             )
 
+            return history_response
+
         except Exception as e:
-            logger.error(f"❌ [SERVICE] Failed to get game history for user {user_id}: {e}", exc_info=True)
+            logger.error("game_history_get_failed", user_id=user_id, error=str(e), exc_info=True)
             raise
     
     async def get_game_statistics(self, user_id: str) -> GameStatistics:
@@ -235,10 +251,10 @@ class GameService:
             )
             
         except Exception as e:
-            logger.error(f"Failed to get game statistics for user {user_id}: {e}")
+            logger.error("game_statistics_get_failed", user_id=user_id, error=str(e))
             raise
     
-    async def save_completed_game_with_uid(self, user_id: str, game_data: CompletedGameRequest) -> GameResponse:
+    async def save_completed_game_with_uid(self, user_id: str, game_data: CompletedGameRequest) -> GameState:
         """完了したゲームを保存（認証済みユーザーIDを使用）"""
         try:
             # ユーザー存在チェック（UIDで検索）
@@ -246,55 +262,86 @@ class GameService:
             if not user_exists:
                 raise ValueError("User not found")
             
-            # フロントエンドのフレームをバックエンド形式に変換
-            backend_frames = []
-            for frontend_frame in game_data.frames:
-                rolls = []
-                if frontend_frame.firstRoll is not None:
-                    rolls.append(frontend_frame.firstRoll)
-                if frontend_frame.secondRoll is not None:
-                    rolls.append(frontend_frame.secondRoll)
-                if frontend_frame.thirdRoll is not None:
-                    rolls.append(frontend_frame.thirdRoll)
-                
-                backend_frame = Frame(
-                    number=frontend_frame.frameNumber,
-                    rolls=rolls,
-                    score=frontend_frame.frameScore or 0,
-                    is_strike=frontend_frame.isStrike,
-                    is_spare=frontend_frame.isSpare,
-                    is_completed=frontend_frame.isCompleted
-                )
-                backend_frames.append(backend_frame)
+            # ロールからスコアシートを再計算して検証
+            backend_frames, total_score = self._verify_completed_game(game_data)
             
             # ゲームデータを作成
             game_create_data = GameCreate(
                 user_id=user_id,
-                total_score=game_data.totalScore,
+                total_score=total_score,
                 frames=backend_frames,
                 status="completed",
                 played_at=datetime.fromisoformat(game_data.gameDate.replace('Z', '+00:00'))
             )
             
             # ゲーム作成
-            game_schema = await self.game_repo.create(game_create_data)
+            game = await self.game_repo.create(game_create_data)
             
-            GameLogger.log_game_completed(game_schema.id, user_id, game_data.totalScore)
+            GameLogger.log_game_completed(game.id, user_id, total_score)
             
-            return GameResponse(
-                id=game_schema.id,
-                user_id=game_schema.user_id,
-                total_score=game_schema.total_score,
-                frames=game_schema.frames,
-                status=game_schema.status,
-                played_at=game_schema.played_at,
-                created_at=game_schema.created_at,
-                updated_at=game_schema.updated_at
-            )
+            return game
             
-        except ValueError as e:
-            logger.warning(f"Failed to save completed game: {e}")
+        except (ValueError, InvalidRollError, ValidationError) as e:
+            logger.warning("completed_game_save_failed", error=str(e))
             raise
         except Exception as e:
-            logger.error(f"Failed to save completed game: {e}")
+            logger.error("completed_game_save_failed", error=str(e))
             raise
+    
+    @staticmethod
+    def _verify_completed_game(game_data: CompletedGameRequest) -> Tuple[List[Frame], int]:
+        """完了ゲームのロールからスコアシートを再計算し、クライアント送信値を検証
+
+        ロールがルールに反する場合や未完了の場合は InvalidRollError。
+        クライアントが送信したスコア・フラグ（省略された項目は対象外）が
+        再計算結果と異なる場合、score_verification_mode が "reject" なら
+        ValidationError、"correct" なら再計算結果で置き換える。
+
+        Returns:
+            再計算したフレームと合計スコア
+        """
+        frames_by_number = {frame.frameNumber: frame for frame in game_data.frames}
+        if len(frames_by_number) != len(game_data.frames) or sorted(frames_by_number) != list(range(1, 11)):
+            raise InvalidRollError("Frames 1-10 must each be provided exactly once")
+        
+        scorer = IncrementalScorer()
+        for frame_number in range(1, 11):
+            frontend_frame = frames_by_number[frame_number]
+            rolls = [
+                pin_count
+                for pin_count in (frontend_frame.firstRoll, frontend_frame.secondRoll, frontend_frame.thirdRoll)
+                if pin_count is not None
+            ]
+            if not is_valid_frame(frame_number - 1, rolls):
+                raise InvalidRollError(f"Invalid rolls for frame {frame_number}: {rolls}")
+            for pin_count in rolls:
+                scorer.add_roll(frame_number - 1, pin_count)
+        
+        if not scorer.is_completed:
+            raise InvalidRollError("Game is not completed")
+        
+        frames = scorer.to_frames()
+        
+        # クライアントが送信した派生値との差異を検出
+        mismatches = []
+        if game_data.totalScore is not None and game_data.totalScore != scorer.total_score:
+            mismatches.append(f"totalScore {game_data.totalScore} != {scorer.total_score}")
+        for frame in frames:
+            frontend_frame = frames_by_number[frame.number]
+            sent = frontend_frame.model_fields_set
+            for field_name, expected in (
+                ("frameScore", frame.score),
+                ("isStrike", frame.is_strike),
+                ("isSpare", frame.is_spare),
+                ("isCompleted", frame.is_completed),
+            ):
+                value = getattr(frontend_frame, field_name)
+                if field_name in sent and value is not None and value != expected:
+                    mismatches.append(f"frame {frame.number} {field_name} {value} != {expected}")
+        
+        if mismatches:
+            if settings.score_verification_mode == "reject":
+                raise ValidationError(f"Score mismatch: {'; '.join(mismatches[:5])}")
+            logger.warning("client_score_mismatch_corrected", mismatches=mismatches[:5])
+        
+        return frames, scorer.total_score
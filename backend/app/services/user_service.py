@@ -1,18 +1,19 @@
 """ユーザーサービス"""
 from typing import Optional
-import logging
-from app.repositories.user_repository import UserRepository
+from app.repositories.base import BaseUserRepository
 from app.models.user import UserCreate, UserUpdate, UserResponse, UserSchema
 from app.exceptions import UserNotFoundError
+from app.utils.tracing import trace_methods
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
+@trace_methods("UserService")
 class UserService:
     """ユーザーサービス"""
     
-    def __init__(self, user_repo: UserRepository):
+    def __init__(self, user_repo: BaseUserRepository):
         self.user_repo = user_repo
     
     async def create_user(self, user_data: UserCreate) -> UserResponse:
@@ -26,7 +27,7 @@ class UserService:
             # ユーザー作成
             user_schema = await self.user_repo.create(user_data)
             
-            logger.info(f"User created successfully: {user_schema.uid}")
+            logger.info("user_created", uid=user_schema.uid)
             return UserResponse(
                 id=user_schema.id,
                 uid=user_schema.uid,
@@ -38,10 +39,10 @@ class UserService:
             )
             
         except ValueError as e:
-            logger.warning(f"User creation failed: {e}")
+            logger.warning("user_create_rejected", error=str(e))
             raise
         except Exception as e:
-            logger.error(f"Failed to create user: {e}")
+            logger.error("user_create_failed", error=str(e))
             raise
     
     async def get_user_profile(self, user_id: str) -> UserResponse:
@@ -64,9 +65,16 @@ class UserService:
         except UserNotFoundError:
             raise
         except Exception as e:
-            logger.error(f"Failed to get user profile {user_id}: {e}")
+            logger.error("user_profile_get_failed", user_id=user_id, error=str(e))
             raise
-    
+
+    async def get_user_by_uid(self, uid: str) -> UserSchema:
+        """UIDでユーザーを取得"""
+        user_schema = await self.user_repo.get_by_uid(uid)
+        if not user_schema:
+            raise UserNotFoundError()
+        return user_schema
+
     async def update_user_profile(self, user_id: str, user_data: UserUpdate) -> UserResponse:
         """ユーザープロフィールを更新"""
         try:
@@ -76,9 +84,9 @@ class UserService:
                 raise UserNotFoundError()
             
             # ユーザー更新
-            updated_user = await self.user_repo.update(user_id, user_data)
+            updated_user = await self.user_repo.update(user_id, user_data, current=existing_user)
             
-            logger.info(f"User profile updated successfully: {user_id}")
+            logger.info("user_profile_updated", user_id=user_id)
             return UserResponse(
                 id=updated_user.id,
                 uid=updated_user.uid,
@@ -92,7 +100,7 @@ class UserService:
         except UserNotFoundError:
             raise
         except Exception as e:
-            logger.error(f"Failed to update user profile {user_id}: {e}")
+            logger.error("user_profile_update_failed", user_id=user_id, error=str(e))
             raise
     
     async def delete_user(self, user_id: str) -> bool:
@@ -106,24 +114,22 @@ class UserService:
             # ユーザー削除
             await self.user_repo.delete(user_id)
             
-            logger.info(f"User deleted successfully: {user_id}")
+            logger.info("user_deleted", user_id=user_id)
             return True
             
         except UserNotFoundError:
             raise
         except Exception as e:
-            logger.error(f"Failed to delete user {user_id}: {e}")
+            logger.error("user_delete_failed", user_id=user_id, error=str(e))
             raise
     
     async def get_or_create_user(self, uid: str, email: str, display_name: str, photo_url: Optional[str] = None) -> UserResponse:
         """ユーザーを取得または作成"""
         try:
-            logger.info(f"🔍 [SERVICE] get_or_create_user called for uid: {uid}")
-
             # 既存ユーザーを取得
             existing_user = await self.user_repo.get_by_uid(uid)
             if existing_user:
-                logger.info(f"✅ [SERVICE] User found: {existing_user.id}")
+                logger.debug("user_found", user_id=existing_user.id)
                 return UserResponse(
                     id=existing_user.id,
                     uid=existing_user.uid,
@@ -135,7 +141,6 @@ class UserService:
                 )
 
             # 新規ユーザー作成
-            logger.info(f"📝 [SERVICE] Creating new user for uid: {uid}")
             user_data = UserCreate(
                 uid=uid,
                 email=email,
@@ -144,9 +149,9 @@ class UserService:
             )
 
             new_user = await self.create_user(user_data)
-            logger.info(f"✅ [SERVICE] New user created: {new_user.id}")
+            logger.debug("user_created_on_first_access", user_id=new_user.id)
             return new_user
 
         except Exception as e:
-            logger.error(f"❌ [SERVICE] Failed to get or create user {uid}: {e}", exc_info=True)
+            logger.error("user_get_or_create_failed", uid=uid, error=str(e), exc_info=True)
             raise
@@ -0,0 +1,165 @@
+"""一括スコア計算ユーティリティ
+
+インポートや監査で大量の完了ゲームを再計算するためのスコア計算。
+ゲームは (N, 21) のロール行列で表現する。
+
+- 1-9フレーム: 列 2i, 2i+1 （ストライクの場合、2投目の列は -1）
+- 10フレーム目: 列 18, 19, 20（投球しない列は -1）
+
+NumPyがインストールされている場合はベクトル化して全ゲームを一括計算し、
+インストールされていない場合は純Python実装にフォールバックする。
+完了ゲームの結果は calculate_score と一致する。
+"""
+from typing import Any, List, Optional, Sequence
+from app.models.game import Frame
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPyは任意依存
+    np = None
+
+ROLL_SLOTS = 21
+EMPTY_ROLL = -1
+
+
+class BatchScoreResult:
+    """一括スコア計算結果
+
+    Attributes:
+        frame_scores: 各フレームの累計スコア (N, 10)
+        is_strike: ストライクフラグ (N, 10)
+        is_spare: スペアフラグ (N, 10)
+
+    NumPy使用時は ndarray、フォールバック時はリストのリスト。
+    """
+
+    __slots__ = ("frame_scores", "is_strike", "is_spare")
+
+    def __init__(self, frame_scores: Any, is_strike: Any, is_spare: Any):
+        self.frame_scores = frame_scores
+        self.is_strike = is_strike
+        self.is_spare = is_spare
+
+    @property
+    def total_scores(self) -> List[int]:
+        """各ゲームの合計スコア"""
+        return [int(scores[9]) for scores in self.frame_scores]
+
+
+def frames_to_roll_row(frames: List[Frame]) -> List[int]:
+    """フレームを21列のロール行に変換"""
+    row = [EMPTY_ROLL] * ROLL_SLOTS
+    for frame in frames:
+        start = (frame.number - 1) * 2
+        for offset, pin_count in enumerate(frame.rolls):
+            row[start + offset] = pin_count
+    return row
+
+
+def score_roll_matrix(rolls: Any, use_numpy: Optional[bool] = None) -> BatchScoreResult:
+    """ロール行列からスコアを一括計算
+
+    Args:
+        rolls: (N, 21) のロール行列（ndarray またはリストのリスト）
+        use_numpy: None の場合はNumPyの有無で自動選択
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        return _score_numpy(np.asarray(rolls, dtype=np.int16))
+    return _score_python(rolls)
+
+
+def _score_numpy(rolls: "np.ndarray") -> BatchScoreResult:
+    """NumPyによるベクトル化スコア計算"""
+    if rolls.ndim != 2 or rolls.shape[1] != ROLL_SLOTS:
+        raise ValueError(f"rolls must have shape (N, {ROLL_SLOTS})")
+
+    pins = np.maximum(rolls, 0).astype(np.int32)
+    first = pins[:, 0:18:2]
+    second = pins[:, 1:18:2]
+    tenth = pins[:, 18:21]
+
+    strike = rolls[:, 0:18:2] == 10
+    spare = ~strike & (rolls[:, 1:18:2] >= 0) & (first + second == 10)
+
+    # 次フレームの1投目・2投目（10フレーム目は2投目の列をそのまま使う）
+    next_first = np.concatenate([first[:, 1:], tenth[:, 0:1]], axis=1)
+    next_second = np.concatenate([second[:, 1:], tenth[:, 1:2]], axis=1)
+    next_strike = np.concatenate([strike[:, 1:], np.zeros_like(strike[:, :1])], axis=1)
+    after_next_first = np.concatenate(
+        [first[:, 2:], tenth[:, 0:1], np.zeros_like(first[:, :1])], axis=1
+    )
+    next_two = next_first + np.where(next_strike, after_next_first, next_second)
+
+    frame_values = np.empty((rolls.shape[0], 10), dtype=np.int32)
+    frame_values[:, :9] = first + second + np.where(
+        strike, next_two, np.where(spare, next_first, 0)
+    )
+    frame_values[:, 9] = tenth.sum(axis=1)
+
+    tenth_strike = rolls[:, 18] == 10
+    tenth_spare = (rolls[:, 19] >= 0) & (tenth[:, 0] + tenth[:, 1] == 10)
+
+    return BatchScoreResult(
+        frame_scores=np.cumsum(frame_values, axis=1),
+        is_strike=np.concatenate([strike, tenth_strike[:, None]], axis=1),
+        is_spare=np.concatenate([spare, tenth_spare[:, None]], axis=1),
+    )
+
+
+def _score_python(rolls: Sequence[Sequence[int]]) -> BatchScoreResult:
+    """純Pythonによるスコア計算（NumPy未インストール時のフォールバック）"""
+    frame_scores = []
+    strikes = []
+    spares = []
+
+    for row in rolls:
+        if len(row) != ROLL_SLOTS:
+            raise ValueError(f"each roll row must have {ROLL_SLOTS} slots")
+
+        # 投球順のフラットなロール列と各フレームの開始位置
+        balls = []
+        starts = []
+        is_strike = []
+        is_spare = []
+        for frame_index in range(9):
+            first, second = row[frame_index * 2], row[frame_index * 2 + 1]
+            starts.append(len(balls))
+            if first == 10:
+                balls.append(10)
+                is_strike.append(True)
+                is_spare.append(False)
+            else:
+                balls.append(max(first, 0))
+                if second >= 0:
+                    balls.append(second)
+                is_strike.append(False)
+                is_spare.append(second >= 0 and first + second == 10)
+        starts.append(len(balls))
+        tenth = [pin_count for pin_count in row[18:21] if pin_count >= 0]
+        balls.extend(tenth)
+        is_strike.append(row[18] == 10)
+        is_spare.append(row[19] >= 0 and max(row[18], 0) + row[19] == 10)
+
+        scores = []
+        total = 0
+        for frame_index in range(9):
+            start = starts[frame_index]
+            if is_strike[frame_index]:
+                total += 10 + sum(balls[start + 1:start + 3])
+            elif is_spare[frame_index]:
+                total += 10 + sum(balls[start + 2:start + 3])
+            else:
+                total += sum(balls[start:starts[frame_index + 1]])
+            scores.append(total)
+        total += sum(tenth)
+        scores.append(total)
+
+        frame_scores.append(scores)
+        strikes.append(is_strike)
+        spares.append(is_spare)
+
+    return BatchScoreResult(frame_scores=frame_scores, is_strike=strikes, is_spare=spares)
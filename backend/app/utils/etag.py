@@ -0,0 +1,65 @@
+"""ETagユーティリティ
+
+ゲームのETagはドキュメントIDと updated_at（全ての書き込みで更新される）から作成する。
+ゲーム履歴のETagはページ内の各ゲームの (id, updated_at) と件数・ページ情報から作成する。
+いずれもレスポンス本文を作らずに、メタデータの読み取りだけで計算できる。
+"""
+import hashlib
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Tuple
+
+# レスポンス形式を変更した場合に既存のETagを無効化するためのバージョン
+ETAG_FORMAT_VERSION = "1"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _timestamp_us(value: datetime) -> int:
+    """日時をUNIXエポックからのマイクロ秒に変換（タイムゾーンなしはUTCとみなす）"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _strong_etag(*parts: object) -> str:
+    digest = hashlib.sha1(
+        "\x1f".join(str(part) for part in (ETAG_FORMAT_VERSION,) + parts).encode("utf-8")
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def game_etag(game_id: str, updated_at: datetime) -> str:
+    """ゲームのETagを作成"""
+    return _strong_etag("game", game_id, _timestamp_us(updated_at))
+
+
+def history_etag(
+    versions: Iterable[Tuple[str, datetime]],
+    total: int,
+    limit: int,
+    offset: int,
+    has_more: bool
+) -> str:
+    """ゲーム履歴1ページ分のETagを作成
+
+    Args:
+        versions: ページ内の各ゲームの (id, updated_at)
+    """
+    entries = ",".join(f"{game_id}:{_timestamp_us(updated_at)}" for game_id, updated_at in versions)
+    return _strong_etag("history", total, limit, offset, int(has_more), entries)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match ヘッダーがETagに一致するか判定（弱い比較）"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
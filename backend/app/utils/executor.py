@@ -0,0 +1,66 @@
+"""ブロッキング処理の非同期実行ユーティリティ
+
+Firestore同期クライアントやFirebase Admin SDKの呼び出しは
+イベントループをブロックするため、専用のスレッドプールで実行する。
+Firestoreアクセスとトークン検証はプールを分け、
+Firestoreの混雑でキャッシュミス時の認証が待たされないようにする。
+"""
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+from app.config import settings
+
+T = TypeVar("T")
+
+FIRESTORE_POOL = "firestore"
+AUTH_POOL = "auth"
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+
+
+def _pool_size(pool: str) -> int:
+    if pool == AUTH_POOL:
+        return settings.auth_max_concurrency
+    return settings.firestore_max_concurrency
+
+
+def get_executor(pool: str = FIRESTORE_POOL) -> ThreadPoolExecutor:
+    """スレッドプールを取得（未作成の場合は作成）"""
+    executor = _executors.get(pool)
+    if executor is None:
+        executor = ThreadPoolExecutor(
+            max_workers=_pool_size(pool),
+            thread_name_prefix=f"{pool}-io"
+        )
+        _executors[pool] = executor
+    return executor
+
+
+async def run_blocking_in(pool: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """ブロッキング関数を指定したスレッドプールで実行
+
+    上限を超えた呼び出しはスレッドプールのキューで待機する。
+    呼び出し元のコンテキスト変数（トレース・ログのリクエストID）を引き継ぐ。
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_executor(pool), functools.partial(context.run, func, *args, **kwargs)
+    )
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """ブロッキング関数をFirestore用スレッドプールで実行
+
+    同時実行数は settings.firestore_max_concurrency で制限される。
+    """
+    return await run_blocking_in(FIRESTORE_POOL, func, *args, **kwargs)
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """全てのスレッドプールを停止"""
+    while _executors:
+        _, executor = _executors.popitem()
+        executor.shutdown(wait=wait)
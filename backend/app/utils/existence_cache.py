@@ -0,0 +1,53 @@
+"""存在確認キャッシュ"""
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+
+class ExistenceCache:
+    """存在が確認済みのキーを保持するTTL付きLRUキャッシュ
+
+    存在すること（肯定結果）のみを保持し、存在しないことはキャッシュしない。
+    各エントリは ttl_seconds 経過で失効し、件数が max_size を超えた場合は
+    最も古く参照されたエントリから破棄する。
+    イベントループ上からのみ利用する前提のためロックは持たない。
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 300):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, float]" = OrderedDict()
+
+    def contains(self, key: Hashable) -> bool:
+        """有効期限内のキーが存在するか"""
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            return False
+
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False
+
+        self._entries.move_to_end(key)
+        return True
+
+    def add(self, key: Hashable) -> None:
+        """存在が確認されたキーを追加"""
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+
+        self._entries[key] = time.monotonic() + self.ttl_seconds
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        """キーを無効化"""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """キャッシュをクリア"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
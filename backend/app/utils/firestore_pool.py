@@ -0,0 +1,67 @@
+"""Firestoreクライアントプール
+
+同期Firestoreクライアントは1インスタンスにつき1本のgRPCチャネルを持つ。
+1チャネルあたりの同時ストリーム数が頭打ちにならないよう、
+複数のクライアントをラウンドロビンで使い分ける。
+"""
+import itertools
+import os
+from typing import Any, List, Optional
+import firebase_admin
+from google.cloud import firestore
+
+
+class FirestoreClientPool:
+    """Firestoreクライアント（gRPCチャネル）のプール
+
+    リポジトリが利用する collection / batch / transaction を
+    プール内のクライアントに振り分けて委譲するため、
+    firestore.Client の代わりにリポジトリへ渡すことができる。
+    """
+
+    def __init__(self, clients: List[firestore.Client]):
+        if not clients:
+            raise ValueError("FirestoreClientPool requires at least one client")
+        self._clients = clients
+        self._counter = itertools.count()
+
+    @classmethod
+    def from_app(cls, size: int, app: Optional[firebase_admin.App] = None) -> "FirestoreClientPool":
+        """Firebaseアプリの認証情報でクライアントを size 個作成"""
+        if app is None:
+            app = firebase_admin.get_app()
+        # エミュレータ接続時はクライアントが匿名認証情報を使用する
+        credentials = None
+        if not os.environ.get("FIRESTORE_EMULATOR_HOST"):
+            credentials = app.credential.get_credential()
+        project = app.project_id
+        if not project:
+            raise ValueError("Project ID is required to access Firestore")
+        return cls([
+            firestore.Client(credentials=credentials, project=project)
+            for _ in range(max(size, 1))
+        ])
+
+    def client(self) -> firestore.Client:
+        """次のクライアントを取得（ラウンドロビン）"""
+        return self._clients[next(self._counter) % len(self._clients)]
+
+    def collection(self, *collection_path: str) -> firestore.CollectionReference:
+        """コレクション参照を取得"""
+        return self.client().collection(*collection_path)
+
+    def batch(self) -> firestore.WriteBatch:
+        """バッチ書き込みを作成"""
+        return self.client().batch()
+
+    def transaction(self, **kwargs: Any) -> firestore.Transaction:
+        """トランザクションを作成"""
+        return self.client().transaction(**kwargs)
+
+    def close(self) -> None:
+        """全クライアントのgRPCチャネルを閉じる"""
+        for client in self._clients:
+            client.close()
+
+    def __len__(self) -> int:
+        return len(self._clients)
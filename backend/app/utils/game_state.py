@@ -0,0 +1,94 @@
+"""サービス層・リポジトリで扱うゲーム状態
+
+ゲームの属性とロール・スコアを __slots__ を持つ GameState で保持し、
+フレームは IncrementalScorer の配列のまま扱う。Pydanticモデル（GameResponse / Frame）への
+変換はAPIの境界（ルーター）で to_response を呼んだ時のみ行う。
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+from app.models.game import Frame, GameResponse
+from app.utils.roll_codec import decode_scorer, encode_rolls
+from app.utils.scoring import FRAME_COUNT, IncrementalScorer
+from app.utils.statistics import flags_statistics_delta
+
+
+class GameState:
+    """ゲーム状態
+
+    total_score・status は保存されている値を保持し、
+    ロール追加時に calculate_score / calculate_batch_score が更新する。
+    """
+
+    __slots__ = (
+        "id", "user_id", "scorer", "total_score", "status",
+        "played_at", "created_at", "updated_at", "expire_at"
+    )
+
+    def __init__(
+        self,
+        id: Optional[str],
+        user_id: str,
+        scorer: IncrementalScorer,
+        total_score: int,
+        status: str,
+        played_at: datetime,
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None,
+        expire_at: Optional[datetime] = None
+    ):
+        self.id = id
+        self.user_id = user_id
+        self.scorer = scorer
+        self.total_score = total_score
+        self.status = status
+        self.played_at = played_at
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.expire_at = expire_at
+
+    @classmethod
+    def from_frames(cls, frames: List[Frame], **attributes) -> "GameState":
+        """フレームモデルのロールから作成"""
+        return cls(scorer=IncrementalScorer.from_frames(frames), **attributes)
+
+    @classmethod
+    def from_roll_string(cls, roll_string: str, **attributes) -> "GameState":
+        """ロール文字列から作成（フレームモデルは作らない）"""
+        return cls(scorer=decode_scorer(roll_string), **attributes)
+
+    def copy(self) -> "GameState":
+        """複製を作成（スコア計算エンジンも複製する）"""
+        return GameState(
+            self.id, self.user_id, self.scorer.copy(), self.total_score, self.status,
+            self.played_at, self.created_at, self.updated_at, self.expire_at
+        )
+
+    def roll_string(self) -> str:
+        """保存用のロール文字列"""
+        return encode_rolls(self.scorer.frame_rolls)
+
+    def statistics_delta(self) -> Dict[str, int]:
+        """1ゲーム分の統計値（game_statistics_delta と同じ形式）"""
+        scorer = self.scorer
+        return flags_statistics_delta(
+            self.total_score,
+            [scorer.is_strike(index) for index in range(FRAME_COUNT)],
+            [scorer.is_spare(index) for index in range(FRAME_COUNT)]
+        )
+
+    def to_frames(self) -> List[Frame]:
+        """フレームモデルを作成"""
+        return self.scorer.to_frames()
+
+    def to_response(self) -> GameResponse:
+        """APIレスポンスのモデルを作成"""
+        return GameResponse(
+            id=self.id,
+            user_id=self.user_id,
+            total_score=self.total_score,
+            frames=self.to_frames(),
+            status=self.status,
+            played_at=self.played_at,
+            created_at=self.created_at,
+            updated_at=self.updated_at
+        )
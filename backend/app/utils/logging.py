@@ -1,55 +1,223 @@
-"""ログ設定ユーティリティ"""
+"""ログ設定ユーティリティ
+
+log_mode が "async" の場合、ログはキュー経由でバックグラウンドスレッドに渡し、
+JSON/コンソール形式への整形と書き込みはそのスレッドで行う。
+呼び出し側では整形せずに構造化されたイベント（キーワード引数）のまま渡す。
+"""
+import atexit
 import logging
+import logging.handlers
+import queue
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
 import structlog
-from typing import Any, Dict
 from app.config import settings
 
+# リクエストのパスに応じたログレベル（ルート別の上書き設定がある場合のみ設定）
+_route_log_level: ContextVar[Optional[int]] = ContextVar("route_log_level", default=None)
 
-def setup_logging():
-    """ログ設定を初期化"""
-    # 基本ログ設定
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+
+
+def _level(name: str) -> int:
+    """ログレベル名を数値に変換"""
+    return getattr(logging, name.upper())
+
+
+def _sample_events(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """イベント名ごとのサンプリング率に従ってDEBUG/INFOイベントを間引く"""
+    if method_name in ("debug", "info"):
+        rate = settings.log_sample_rates.get(event_dict.get("event"))
+        if rate is not None and random.random() >= rate:
+            raise structlog.DropEvent
+    return event_dict
+
+
+class RequestContextFilter(logging.Filter):
+    """ルート別のログレベルを適用し、リクエストのコンテキストをレコードに保持するフィルター"""
+
+    def __init__(self, default_level: int, capture_context: bool = False):
+        super().__init__()
+        self.default_level = default_level
+        self.capture_context = capture_context
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        route_level = _route_log_level.get()
+        if record.levelno < (route_level if route_level is not None else self.default_level):
+            return False
+        if self.capture_context:
+            # バックグラウンドスレッドではコンテキスト変数を参照できないため、ここで取得する
+            record.structlog_context = structlog.contextvars.get_contextvars()
+        return True
+
+
+def _add_record_context(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """標準ロガーのレコードに保持したリクエストコンテキストをイベントに追加"""
+    record = event_dict.get("_record")
+    context = getattr(record, "structlog_context", None)
+    if context:
+        for key, value in context.items():
+            event_dict.setdefault(key, value)
+    return event_dict
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """レコードを整形せずにキューへ渡すハンドラー
+
+    標準の QueueHandler はキューに入れる前にメッセージを整形するが、
+    同一プロセス内のリスナーに渡すだけなので整形はリスナー側に任せる。
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _renderer() -> Any:
+    """出力形式に応じたレンダラーを取得"""
+    if settings.log_format == "json":
+        return structlog.processors.JSONRenderer()
+    return structlog.dev.ConsoleRenderer()
+
+
+def _setup_sync(root_level: int, context_filter: logging.Filter) -> None:
+    """ログを呼び出し元で整形・書き込みする設定"""
     logging.basicConfig(
-        level=getattr(logging, settings.log_level.upper()),
+        level=root_level,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
-    
-    # structlog設定
-    if settings.log_format == "json":
-        structlog.configure(
-            processors=[
-                structlog.stdlib.filter_by_level,
-                structlog.stdlib.add_logger_name,
-                structlog.stdlib.add_log_level,
-                structlog.stdlib.PositionalArgumentsFormatter(),
-                structlog.processors.TimeStamper(fmt="iso"),
-                structlog.processors.StackInfoRenderer(),
-                structlog.processors.format_exc_info,
-                structlog.processors.UnicodeDecoder(),
-                structlog.processors.JSONRenderer()
-            ],
-            context_class=dict,
-            logger_factory=structlog.stdlib.LoggerFactory(),
-            wrapper_class=structlog.stdlib.BoundLogger,
-            cache_logger_on_first_use=True,
-        )
+    for handler in logging.getLogger().handlers:
+        handler.addFilter(context_filter)
+
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.stdlib.filter_by_level,
+            _sample_events,
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            _renderer()
+        ],
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+
+def _setup_async(root_level: int, context_filter: logging.Filter) -> None:
+    """ログをキュー経由でバックグラウンドスレッドで整形・書き込みする設定"""
+    global _listener, _queue_handler
+
+    timestamper = structlog.processors.TimeStamper(fmt="iso")
+    handler = logging.StreamHandler()
+    handler.setFormatter(structlog.stdlib.ProcessorFormatter(
+        # 標準ロガー（logging.getLogger）のレコード向けの前処理
+        foreign_pre_chain=[
+            _add_record_context,
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            timestamper,
+        ],
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            _renderer(),
+        ],
+    ))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(context_filter)
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(queue_handler)
+    root.setLevel(root_level)
+
+    _queue_handler = queue_handler
+    _listener = logging.handlers.QueueListener(log_queue, handler)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.stdlib.filter_by_level,
+            _sample_events,
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            timestamper,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+
+def setup_logging():
+    """ログ設定を初期化"""
+    default_level = _level(settings.log_level)
+    # ルート別にDEBUGなどを許可する場合に備え、ロガー自体は最も低いレベルにする
+    root_level = min([default_level, *(_level(name) for name in settings.log_route_levels.values())])
+    if settings.log_mode == "async":
+        _setup_async(root_level, RequestContextFilter(default_level, capture_context=True))
     else:
-        structlog.configure(
-            processors=[
-                structlog.stdlib.filter_by_level,
-                structlog.stdlib.add_logger_name,
-                structlog.stdlib.add_log_level,
-                structlog.stdlib.PositionalArgumentsFormatter(),
-                structlog.processors.TimeStamper(fmt="iso"),
-                structlog.processors.StackInfoRenderer(),
-                structlog.processors.format_exc_info,
-                structlog.processors.UnicodeDecoder(),
-                structlog.dev.ConsoleRenderer()
-            ],
-            context_class=dict,
-            logger_factory=structlog.stdlib.LoggerFactory(),
-            wrapper_class=structlog.stdlib.BoundLogger,
-            cache_logger_on_first_use=True,
-        )
+        _setup_sync(root_level, RequestContextFilter(default_level))
+
+
+def shutdown_logging() -> None:
+    """キューに残っているログを書き出してバックグラウンドスレッドを停止
+
+    停止後のログは呼び出し元で直接書き込む。
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()
+        root = logging.getLogger()
+        root.removeHandler(_queue_handler)
+        for handler in _listener.handlers:
+            root.addHandler(handler)
+        _listener = None
+        _queue_handler = None
+
+
+def route_log_level(path: str) -> Optional[int]:
+    """パスに一致するルート別ログレベルを取得（最長一致）"""
+    matched: Optional[str] = None
+    for prefix in settings.log_route_levels:
+        if path.startswith(prefix) and (matched is None or len(prefix) > len(matched)):
+            matched = prefix
+    if matched is None:
+        return None
+    return _level(settings.log_route_levels[matched])
+
+
+@contextmanager
+def bound_route_log_level(path: str) -> Iterator[None]:
+    """リクエスト処理中にルート別ログレベルを適用するコンテキストマネージャー"""
+    level = route_log_level(path) if settings.log_route_levels else None
+    if level is None:
+        yield
+        return
+    token = _route_log_level.set(level)
+    try:
+        yield
+    finally:
+        _route_log_level.reset(token)
 
 
 def get_logger(name: str) -> structlog.BoundLogger:
@@ -57,14 +225,17 @@ def get_logger(name: str) -> structlog.BoundLogger:
     return structlog.get_logger(name)
 
 
+_auth_logger = get_logger("auth")
+_game_logger = get_logger("game")
+
+
 class AuthLogger:
     """認証ログヘルパー"""
     
     @staticmethod
     def log_authentication_success(user_id: str, email: str):
         """認証成功ログ"""
-        logger = get_logger("auth")
-        logger.info(
+        _auth_logger.info(
             event="auth_success",
             user_id=user_id,
             email=email
@@ -73,8 +244,7 @@ class AuthLogger:
     @staticmethod
     def log_authentication_failure(error: str, user_id: str = None):
         """認証失敗ログ"""
-        logger = get_logger("auth")
-        logger.warning(
+        _auth_logger.warning(
             event="auth_failure",
             error=error,
             user_id=user_id
@@ -83,8 +253,7 @@ class AuthLogger:
     @staticmethod
     def log_token_verification(token: str, success: bool):
         """トークン検証ログ"""
-        logger = get_logger("auth")
-        logger.info(
+        _auth_logger.info(
             event="token_verification",
             success=success
         )
@@ -96,8 +265,7 @@ class GameLogger:
     @staticmethod
     def log_game_created(game_id: str, user_id: str):
         """ゲーム作成ログ"""
-        logger = get_logger("game")
-        logger.info(
+        _game_logger.info(
             event="game_created",
             game_id=game_id,
             user_id=user_id
@@ -106,8 +274,7 @@ class GameLogger:
     @staticmethod
     def log_roll_added(game_id: str, user_id: str, frame_number: int, pin_count: int):
         """ロール追加ログ"""
-        logger = get_logger("game")
-        logger.info(
+        _game_logger.info(
             event="roll_added",
             game_id=game_id,
             user_id=user_id,
@@ -115,11 +282,20 @@ class GameLogger:
             pin_count=pin_count
         )
     
+    @staticmethod
+    def log_rolls_added(game_id: str, user_id: str, roll_count: int):
+        """一括ロール追加ログ"""
+        _game_logger.info(
+            event="rolls_added",
+            game_id=game_id,
+            user_id=user_id,
+            roll_count=roll_count
+        )
+    
     @staticmethod
     def log_game_completed(game_id: str, user_id: str, total_score: int):
         """ゲーム完了ログ"""
-        logger = get_logger("game")
-        logger.info(
+        _game_logger.info(
             event="game_completed",
             game_id=game_id,
             user_id=user_id,
@@ -0,0 +1,49 @@
+"""インメモリストレージ
+
+storage_backend = "memory" の場合にゲーム・ユーザーをプロセス内に保持する。
+Firestoreやエミュレータなしでサービス層のベンチマーク・APIテストを行うためのもので、
+プロセスの終了とともにデータは失われる。
+
+ゲームはユーザーごと・(ユーザー, ステータス) ごとの二次インデックスを持ち、
+インデックスは (played_at, id) の昇順に保つ（履歴は末尾から読む）。
+イベントループ上からのみ利用する前提のためロックは持たない。
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+from app.models.user import UserSchema
+from app.utils.game_state import GameState
+
+# 履歴インデックスのキー（played_at, id）
+HistoryKey = Tuple[datetime, str]
+
+
+def to_utc(value: datetime) -> datetime:
+    """日時をUTCに正規化（タイムゾーンなしはUTCとみなす）"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class InMemoryStore:
+    """ユーザー・ゲーム・インデックス・統計の保持先"""
+
+    def __init__(self):
+        self.users: Dict[str, UserSchema] = {}
+        # UID → ユーザーID
+        self.user_ids_by_uid: Dict[str, str] = {}
+        self.games: Dict[str, GameState] = {}
+        # ユーザーID → 履歴キー（昇順）
+        self.games_by_user: Dict[str, List[HistoryKey]] = {}
+        # (ユーザーID, ステータス) → 履歴キー（昇順）
+        self.games_by_user_status: Dict[Tuple[str, str], List[HistoryKey]] = {}
+        # ユーザーID → 統計ドキュメント（Firestoreの user_statistics と同じ形式）
+        self.statistics: Dict[str, Dict[str, Any]] = {}
+
+    def close(self) -> None:
+        """全データを破棄"""
+        self.users.clear()
+        self.user_ids_by_uid.clear()
+        self.games.clear()
+        self.games_by_user.clear()
+        self.games_by_user_status.clear()
+        self.statistics.clear()
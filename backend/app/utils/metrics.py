@@ -0,0 +1,91 @@
+"""Prometheusメトリクス
+
+HTTPリクエスト・リポジトリ呼び出し・トークン検証のメトリクスを定義する。
+/metrics エンドポイントで公開する。
+"""
+import functools
+import inspect
+import time
+from typing import Any, Callable, Type, TypeVar
+from prometheus_client import Counter, Gauge, Histogram
+
+T = TypeVar("T")
+
+# HTTPリクエスト
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTPリクエストの処理時間",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "処理中のHTTPリクエスト数",
+    ["method"],
+)
+
+# リポジトリ（Firestore）呼び出し
+REPOSITORY_CALLS = Counter(
+    "repository_calls_total",
+    "リポジトリ呼び出し回数",
+    ["repository", "operation", "outcome"],
+)
+REPOSITORY_CALL_DURATION = Histogram(
+    "repository_call_duration_seconds",
+    "リポジトリ呼び出しの処理時間",
+    ["repository", "operation"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REPOSITORY_CALLS_IN_PROGRESS = Gauge(
+    "repository_calls_in_progress",
+    "処理中のリポジトリ呼び出し数",
+    ["repository"],
+)
+
+# Firebase IDトークン検証
+TOKEN_VERIFICATIONS = Counter(
+    "token_verifications_total",
+    "IDトークン検証回数（result: cache_hit / verified / error）",
+    ["result"],
+)
+TOKEN_VERIFICATION_DURATION = Histogram(
+    "token_verification_duration_seconds",
+    "IDトークン検証の処理時間（キャッシュヒットを除く）",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+def _instrument_method(repository: str, operation: str, method: Callable[..., Any]) -> Callable[..., Any]:
+    """リポジトリのコルーチンメソッドを計測するラッパーを作成"""
+    duration = REPOSITORY_CALL_DURATION.labels(repository, operation)
+    in_progress = REPOSITORY_CALLS_IN_PROGRESS.labels(repository)
+    succeeded = REPOSITORY_CALLS.labels(repository, operation, "success")
+    failed = REPOSITORY_CALLS.labels(repository, operation, "error")
+
+    @functools.wraps(method)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        in_progress.inc()
+        try:
+            result = await method(*args, **kwargs)
+        except Exception:
+            failed.inc()
+            raise
+        finally:
+            in_progress.dec()
+            duration.observe(time.perf_counter() - start)
+        succeeded.inc()
+        return result
+
+    return wrapper
+
+
+def instrument_repository(repository: str) -> Callable[[Type[T]], Type[T]]:
+    """リポジトリクラスの公開コルーチンメソッドを全て計測するクラスデコレータ"""
+    def decorator(cls: Type[T]) -> Type[T]:
+        for name, member in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.iscoroutinefunction(member):
+                continue
+            setattr(cls, name, _instrument_method(repository, name, member))
+        return cls
+
+    return decorator
@@ -0,0 +1,25 @@
+"""カーソルページネーションユーティリティ"""
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+from app.exceptions import ValidationError
+
+
+def encode_cursor(played_at: datetime, game_id: str) -> str:
+    """最終ドキュメントの (played_at, id) から不透明なカーソル文字列を作成"""
+    payload = json.dumps(
+        {"p": played_at.isoformat(), "id": game_id},
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """カーソル文字列を (played_at, id) に復元"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["p"]), str(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValidationError(f"Invalid cursor: {e}")
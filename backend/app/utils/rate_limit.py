@@ -0,0 +1,102 @@
+"""トークンバケット方式のレート制限
+
+キーごとに容量 capacity のバケットを持ち、トークンは refill_rate（個/秒）で補充される。
+バックエンドは RateLimitBackend を実装すれば差し替えられる（複数インスタンスで
+共有する場合は外部ストアを使うバックエンドを追加する）。
+"""
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+from app.config import settings
+
+
+class RateLimitBackend(ABC):
+    """レート制限バックエンドのインターフェース"""
+
+    @abstractmethod
+    async def acquire(self, key: str, cost: int, capacity: int, refill_rate: float) -> float:
+        """トークンを消費する
+
+        Returns:
+            消費できた場合は0、できなかった場合は再試行までの秒数
+        """
+
+    async def close(self) -> None:
+        """バックエンドを閉じる"""
+
+
+class _Bucket:
+    """キーごとのバケット状態"""
+
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, tokens: float, updated_at: float):
+        self.tokens = tokens
+        self.updated_at = updated_at
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """プロセス内メモリのバックエンド
+
+    バケットは最終アクセス順に保持し、idle_seconds 以上アクセスのないキーを破棄する。
+    idle_seconds がバケットが満タンになるまでの時間以上であれば、破棄しても制限の結果は変わらない。
+    件数が max_keys を超えた場合は最も古くアクセスされたキーから破棄する。
+    イベントループ上からのみ利用する前提のためロックは持たない。
+    """
+
+    # 1回のアクセスで破棄するアイドルキーの最大数（1リクエストあたりの処理量を一定に抑える）
+    EVICTIONS_PER_CALL = 8
+
+    def __init__(self, idle_seconds: float, max_keys: int = 100000):
+        self.idle_seconds = idle_seconds
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+
+    async def acquire(self, key: str, cost: int, capacity: int, refill_rate: float) -> float:
+        now = time.monotonic()
+        self._evict_idle(now)
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _Bucket(float(capacity), now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            bucket.tokens = min(float(capacity), bucket.tokens + (now - bucket.updated_at) * refill_rate)
+            bucket.updated_at = now
+            self._buckets.move_to_end(key)
+
+        if bucket.tokens >= cost:
+            bucket.tokens -= cost
+            return 0.0
+
+        if cost > capacity or refill_rate <= 0:
+            return math.inf
+        return (cost - bucket.tokens) / refill_rate
+
+    def _evict_idle(self, now: float) -> None:
+        """アイドル状態のキーを古い順に破棄"""
+        for _ in range(self.EVICTIONS_PER_CALL):
+            if not self._buckets:
+                return
+            key, bucket = next(iter(self._buckets.items()))
+            if now - bucket.updated_at < self.idle_seconds:
+                return
+            del self._buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+def create_rate_limit_backend(name: Optional[str] = None) -> RateLimitBackend:
+    """設定に応じたバックエンドを作成"""
+    name = name or settings.rate_limit_backend
+    if name == "memory":
+        return InMemoryRateLimitBackend(
+            idle_seconds=settings.rate_limit_period,
+            max_keys=settings.rate_limit_max_keys
+        )
+    raise ValueError(f"Unknown rate limit backend: {name}")
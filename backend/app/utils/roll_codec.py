@@ -0,0 +1,63 @@
+"""ゲームのロール文字列エンコーディング
+
+Firestoreにはフレームごとのマップではなく、ロールのみを短い文字列で保存する。
+スコア・ストライク/スペア・完了フラグはロールから再計算できるため保存しない。
+
+形式: フレームをカンマ区切りにし、1投を1文字（"0"-"9"、10本は "X"）で表す。
+    例: "X,73,90,X,X,81,64,X,72,X81"
+    進行中のゲームでは未投球のフレームは空文字になる（例: "X,7,,,,,,,,"）。
+"""
+from typing import List
+from app.models.game import Frame
+from app.utils.scoring import IncrementalScorer
+
+FRAME_SEPARATOR = ","
+STRIKE_CHAR = "X"
+FRAME_COUNT = 10
+
+
+def encode_rolls(frame_rolls: List[List[int]]) -> str:
+    """フレームごとのロールをロール文字列に変換"""
+    encoded = []
+    for rolls in frame_rolls:
+        encoded.append("".join(STRIKE_CHAR if pin_count == 10 else str(pin_count) for pin_count in rolls))
+    encoded.extend([""] * (FRAME_COUNT - len(encoded)))
+    return FRAME_SEPARATOR.join(encoded)
+
+
+def encode_frames(frames: List[Frame]) -> str:
+    """フレームモデルをロール文字列に変換"""
+    frame_rolls: List[List[int]] = [[] for _ in range(FRAME_COUNT)]
+    for frame in frames:
+        frame_rolls[frame.number - 1] = frame.rolls
+    return encode_rolls(frame_rolls)
+
+
+def decode_rolls(roll_string: str) -> List[List[int]]:
+    """ロール文字列をフレームごとのロールに変換"""
+    parts = roll_string.split(FRAME_SEPARATOR)
+    if len(parts) != FRAME_COUNT:
+        raise ValueError(f"Roll string must have {FRAME_COUNT} frames: {roll_string!r}")
+
+    frame_rolls = []
+    for part in parts:
+        rolls = []
+        for char in part:
+            if char == STRIKE_CHAR:
+                rolls.append(10)
+            elif char.isdigit():
+                rolls.append(int(char))
+            else:
+                raise ValueError(f"Invalid roll character {char!r} in {roll_string!r}")
+        frame_rolls.append(rolls)
+    return frame_rolls
+
+
+def decode_scorer(roll_string: str) -> IncrementalScorer:
+    """ロール文字列からスコア計算済みのエンジンを作成（フレームモデルは作らない）"""
+    return IncrementalScorer.from_rolls(decode_rolls(roll_string))
+
+
+def expand_frames(roll_string: str) -> List[Frame]:
+    """ロール文字列からスコア計算済みのフレームモデルを作成"""
+    return decode_scorer(roll_string).to_frames()
@@ -1,153 +1,286 @@
-"""ボーリングスコア計算ユーティリティ"""
-from typing import List
-from app.models.game import Frame, GameSchema, RollRequest
+"""ボーリングスコア計算ユーティリティ
 
+スコア計算は IncrementalScorer（インクリメンタルスコア計算エンジン）のみで行う。
+calculate_score / calculate_batch_score はサービス層のゲーム状態（GameState）を
+受け取る入口で、Pydanticモデルを作らずに状態をその場で更新する。
+"""
+from typing import TYPE_CHECKING, Callable, List, Optional
+from pydantic import TypeAdapter
+from app.models.game import Frame, RollRequest
+from app.utils.tracing import traced
 
-def calculate_score(game: GameSchema, roll: RollRequest) -> GameSchema:
-    """ゲームスコアを計算"""
-    frame_index = roll.frame_number - 1
-    frame = game.frames[frame_index]
-    
-    # ロールを追加
-    frame.rolls.append(roll.pin_count)
-    
-    # フレームの状態を更新
-    _update_frame_status(frame, frame_index)
-    
-    # 全フレームのスコアを再計算
-    _calculate_all_frame_scores(game)
-    
-    # ゲームの完了状態をチェック
-    if _is_game_completed(game):
+if TYPE_CHECKING:
+    from app.utils.game_state import GameState
+
+FRAME_COUNT = 10
+
+# フレーム一覧の一括検証（Frame を1件ずつ作成するより速い）
+_FRAMES_ADAPTER = TypeAdapter(List[Frame])
+
+
+@traced("scoring.calculate_score")
+def calculate_score(
+    game: "GameState",
+    roll: RollRequest,
+    validate: Optional[Callable[["IncrementalScorer", RollRequest], None]] = None
+) -> "GameState":
+    """ゲーム状態にロールを追加してスコアを計算（状態を更新して返す）
+
+    Args:
+        game: 対象のゲーム状態
+        roll: 追加するロール
+        validate: ロール追加前に呼び出す検証関数（例外で中断する）
+    """
+    scorer = game.scorer
+    if validate is not None:
+        validate(scorer, roll)
+    scorer.add_roll(roll.frame_number - 1, roll.pin_count)
+    return _sync_game(game)
+
+
+@traced("scoring.calculate_batch_score")
+def calculate_batch_score(
+    game: "GameState",
+    rolls: List[RollRequest],
+    validate: Optional[Callable[["IncrementalScorer", RollRequest], None]] = None
+) -> "GameState":
+    """複数のロールを順に追加してスコアを計算（状態を更新して返す）
+
+    検証エラーで中断した場合、状態は途中まで更新されている。
+    呼び出し元（リポジトリの apply_update）はその状態を保存せずに破棄する。
+
+    Args:
+        game: 対象のゲーム状態
+        rolls: 投球順のロール
+        validate: 各ロール追加前に呼び出す検証関数（例外で中断する）
+    """
+    scorer = game.scorer
+    first_affected = FRAME_COUNT
+    for roll in rolls:
+        if validate is not None:
+            validate(scorer, roll)
+        first_affected = min(first_affected, scorer._append(roll.frame_number - 1, roll.pin_count))
+    # スコアは全ロールの追加後に1回だけ計算
+    scorer._rescore(first_affected, FRAME_COUNT - 1)
+    return _sync_game(game)
+
+
+def _sync_game(game: "GameState") -> "GameState":
+    """スコア計算エンジンの合計スコア・完了状態をゲーム状態に反映"""
+    game.total_score = game.scorer.total_score
+    if game.scorer.is_completed:
         game.status = "completed"
-    
     return game
 
 
-def _update_frame_status(frame: Frame, frame_index: int):
-    """フレームの状態を更新"""
-    if frame_index < 9:  # 1-9フレーム
-        if len(frame.rolls) == 1 and frame.rolls[0] == 10:
-            # ストライク
-            frame.is_strike = True
-            frame.is_completed = True
-        elif len(frame.rolls) == 2:
-            # 2投目完了
-            frame.is_completed = True
-            if sum(frame.rolls) == 10:
-                frame.is_spare = True
-    else:  # 10フレーム目
-        if len(frame.rolls) == 1 and frame.rolls[0] == 10:
-            # ストライク
-            frame.is_strike = True
-        elif len(frame.rolls) == 2:
-            if sum(frame.rolls) == 10:
-                frame.is_spare = True
-            elif not frame.is_strike:
-                frame.is_completed = True
-        elif len(frame.rolls) == 3:
-            frame.is_completed = True
-
-
-def _calculate_all_frame_scores(game: GameSchema):
-    """全フレームのスコアを計算"""
-    total_score = 0
-    
-    for i, frame in enumerate(game.frames):
-        if i < 9:  # 1-9フレーム
-            frame_score = _calculate_frame_score(game, i)
-            total_score += frame_score
-            frame.score = total_score
-        else:  # 10フレーム目
-            frame_score = _calculate_tenth_frame_score(frame)
-            total_score += frame_score
-            frame.score = total_score
-    
-    game.total_score = total_score
+def create_initial_frames() -> List[Frame]:
+    """初期フレームを作成（10フレームを一括で検証）"""
+    return IncrementalScorer().to_frames()
 
 
-def _calculate_frame_score(game: GameSchema, frame_index: int) -> int:
-    """フレームスコアを計算（1-9フレーム）"""
-    frame = game.frames[frame_index]
-    score = sum(frame.rolls)
+def is_valid_frame(frame_index: int, rolls: List[int]) -> bool:
+    """完了したフレームのロールがルールに従っているかを判定"""
+    if any(pin_count < 0 or pin_count > 10 for pin_count in rolls):
+        return False
     
-    if frame.is_strike:
-        # ストライクボーナス：次の2投
-        score += _get_next_two_rolls_score(game, frame_index)
-    elif frame.is_spare:
-        # スペアボーナス：次の1投
-        score += _get_next_roll_score(game, frame_index)
+    if frame_index < 9:  # 1-9フレーム
+        if len(rolls) == 1:
+            return rolls[0] == 10
+        return len(rolls) == 2 and rolls[0] < 10 and rolls[0] + rolls[1] <= 10
     
-    return score
+    # 10フレーム目
+    if len(rolls) < 2:
+        return False
+    first, second = rolls[0], rolls[1]
+    if first == 10:
+        # ストライク後は3投目あり（2投目がストライクでなければ残りピンのみ）
+        return len(rolls) == 3 and (second == 10 or second + rolls[2] <= 10)
+    if first + second > 10:
+        return False
+    if first + second == 10:
+        # スペア後は3投目あり
+        return len(rolls) == 3
+    return len(rolls) == 2
 
 
-def _calculate_tenth_frame_score(frame: Frame) -> int:
-    """10フレーム目のスコアを計算"""
-    return sum(frame.rolls)
+class IncrementalScorer:
+    """インクリメンタルスコア計算エンジン
 
+    投球順のフラットなロール配列と、ボーナス待ちフレーム（最大2件）を保持し、
+    ロール追加時はボーナスが確定するフレームと投球したフレームのみを更新する。
+    次フレームが非ストライクの1投のみの場合、ストライクのボーナスは
+    2投目まで加算しない（従来の全フレーム再計算と同じ挙動）。
+    """
 
-def _get_next_two_rolls_score(game: GameSchema, frame_index: int) -> int:
-    """次の2投のスコアを取得"""
-    if frame_index >= 8:  # 9フレーム目以降は10フレーム目から取得
-        tenth_frame = game.frames[9]
-        if len(tenth_frame.rolls) >= 2:
-            return tenth_frame.rolls[0] + tenth_frame.rolls[1]
-        elif len(tenth_frame.rolls) >= 1:
-            return tenth_frame.rolls[0]
-        return 0
-    
-    next_frame = game.frames[frame_index + 1]
-    if len(next_frame.rolls) >= 2:
-        return next_frame.rolls[0] + next_frame.rolls[1]
-    elif len(next_frame.rolls) == 1 and next_frame.is_strike:
-        # 次のフレームがストライクの場合、さらに次のフレームの1投目を取得
-        if frame_index + 2 < len(game.frames):
-            next_next_frame = game.frames[frame_index + 2]
-            if len(next_next_frame.rolls) >= 1:
-                return next_frame.rolls[0] + next_next_frame.rolls[0]
-        return next_frame.rolls[0]
-    
-    return 0
+    __slots__ = (
+        "rolls", "frame_rolls", "frame_scores", "total_score", "is_completed",
+        "_is_strike", "_is_spare", "_frame_completed", "_base", "_bonus",
+        "_values", "_pending"
+    )
 
+    def __init__(self):
+        self.rolls: List[int] = []
+        self.frame_rolls: List[List[int]] = [[] for _ in range(10)]
+        # 各フレームの累計スコア
+        self.frame_scores: List[int] = [0] * 10
+        self.total_score = 0
+        self.is_completed = False
+        self._is_strike = [False] * 10
+        self._is_spare = [False] * 10
+        self._frame_completed = [False] * 10
+        # フレーム内の倒したピン数の合計
+        self._base = [0] * 10
+        # 加算済みのボーナス
+        self._bonus = [0] * 10
+        # 各フレーム単体のスコア
+        self._values = [0] * 10
+        # ボーナス待ち: [フレームインデックス, 残りボーナス投数]
+        self._pending: List[List[int]] = []
 
-def _get_next_roll_score(game: GameSchema, frame_index: int) -> int:
-    """次の1投のスコアを取得"""
-    if frame_index >= 9:
-        return 0
-    
-    next_frame = game.frames[frame_index + 1]
-    if len(next_frame.rolls) >= 1:
-        return next_frame.rolls[0]
-    
-    return 0
+    @classmethod
+    def from_frames(cls, frames: List[Frame]) -> "IncrementalScorer":
+        """既存フレームのロールを再生してエンジンを作成"""
+        return cls.from_rolls([frame.rolls for frame in frames])
 
+    @classmethod
+    def from_rolls(cls, frame_rolls: List[List[int]]) -> "IncrementalScorer":
+        """フレームごとのロールを再生してエンジンを作成（スコアは最後に1回だけ計算）"""
+        scorer = cls()
+        for frame_index, rolls in enumerate(frame_rolls):
+            for pin_count in rolls:
+                scorer._append(frame_index, pin_count)
+        scorer._rescore(0, FRAME_COUNT - 1)
+        return scorer
 
-def _is_game_completed(game: GameSchema) -> bool:
-    """ゲーム完了チェック"""
-    if len(game.frames) < 10:
-        return False
-    
-    last_frame = game.frames[9]  # 10フレーム目
-    
-    # 10フレーム目の特別ルール
-    if last_frame.is_strike or last_frame.is_spare:
-        # ストライクまたはスペアの場合、3投必要
-        return len(last_frame.rolls) >= 3
-    
-    # 通常の場合、2投で終了
-    return len(last_frame.rolls) >= 2
+    def copy(self) -> "IncrementalScorer":
+        """複製を作成（ロール配列・ボーナス待ちも複製する）"""
+        scorer = IncrementalScorer.__new__(IncrementalScorer)
+        scorer.rolls = list(self.rolls)
+        scorer.frame_rolls = [list(rolls) for rolls in self.frame_rolls]
+        scorer.frame_scores = list(self.frame_scores)
+        scorer.total_score = self.total_score
+        scorer.is_completed = self.is_completed
+        scorer._is_strike = list(self._is_strike)
+        scorer._is_spare = list(self._is_spare)
+        scorer._frame_completed = list(self._frame_completed)
+        scorer._base = list(self._base)
+        scorer._bonus = list(self._bonus)
+        scorer._values = list(self._values)
+        scorer._pending = [list(entry) for entry in self._pending]
+        return scorer
 
+    def add_roll(self, frame_index: int, pin_count: int) -> int:
+        """ロールを追加し、スコアが変化した最初のフレームインデックスを返す"""
+        first_affected = self._append(frame_index, pin_count)
+        self._rescore(first_affected, frame_index)
+        return first_affected
 
-def create_initial_frames() -> List[Frame]:
-    """初期フレームを作成"""
-    frames = []
-    for i in range(10):
-        frames.append(Frame(
-            number=i + 1,
-            rolls=[],
-            score=0,
-            is_strike=False,
-            is_spare=False,
-            is_completed=False
-        ))
-    return frames
+    def _append(self, frame_index: int, pin_count: int) -> int:
+        """ロールを追加してボーナス・フレームの状態を更新し、影響を受けた最初のフレームインデックスを返す
+
+        スコア（_values・frame_scores・total_score）は更新しない。
+        """
+        self.rolls.append(pin_count)
+        first_affected = frame_index
+
+        # ボーナス待ちフレームに加算
+        if self._pending:
+            remaining = []
+            for entry in self._pending:
+                self._bonus[entry[0]] += pin_count
+                entry[1] -= 1
+                if entry[0] < first_affected:
+                    first_affected = entry[0]
+                if entry[1] > 0:
+                    remaining.append(entry)
+            self._pending = remaining
+
+        # フレームの状態を更新
+        rolls = self.frame_rolls[frame_index]
+        rolls.append(pin_count)
+        self._base[frame_index] += pin_count
+        if frame_index < 9:  # 1-9フレーム
+            if len(rolls) == 1 and pin_count == 10:
+                self._is_strike[frame_index] = True
+                self._frame_completed[frame_index] = True
+                self._pending.append([frame_index, 2])
+            elif len(rolls) == 2:
+                self._frame_completed[frame_index] = True
+                if self._base[frame_index] == 10:
+                    self._is_spare[frame_index] = True
+                    self._pending.append([frame_index, 1])
+        else:  # 10フレーム目
+            if len(rolls) == 1 and pin_count == 10:
+                self._is_strike[9] = True
+            elif len(rolls) == 2:
+                if self._base[9] == 10:
+                    self._is_spare[9] = True
+                elif not self._is_strike[9]:
+                    self._frame_completed[9] = True
+            elif len(rolls) == 3:
+                self._frame_completed[9] = True
+            if self._is_strike[9] or self._is_spare[9]:
+                self.is_completed = len(rolls) >= 3
+            else:
+                self.is_completed = len(rolls) >= 2
+
+        return first_affected
+
+    def _rescore(self, first_affected: int, last_played: int) -> None:
+        """first_affected から last_played までのフレーム単体のスコアと、以降の累計スコアを更新"""
+        for index in range(first_affected, last_played + 1):
+            self._values[index] = self._frame_value(index)
+        total = self.frame_scores[first_affected - 1] if first_affected > 0 else 0
+        for index in range(first_affected, FRAME_COUNT):
+            total += self._values[index]
+            self.frame_scores[index] = total
+        self.total_score = total
+
+    def _frame_value(self, frame_index: int) -> int:
+        """フレーム単体のスコア（ボーナス込み）"""
+        value = self._base[frame_index]
+        if frame_index < 8 and self._is_strike[frame_index]:
+            # 次フレームが非ストライクの1投のみの場合、ボーナスは2投目まで加算しない
+            next_index = frame_index + 1
+            if len(self.frame_rolls[next_index]) == 1 and not self._is_strike[next_index]:
+                return value
+        if frame_index < 9:
+            value += self._bonus[frame_index]
+        return value
+
+    def is_strike(self, frame_index: int) -> bool:
+        """フレームがストライクか"""
+        return self._is_strike[frame_index]
+
+    def is_spare(self, frame_index: int) -> bool:
+        """フレームがスペアか"""
+        return self._is_spare[frame_index]
+
+    def is_frame_completed(self, frame_index: int) -> bool:
+        """フレームが完了しているか"""
+        return self._frame_completed[frame_index]
+
+    def frame(self, frame_index: int) -> Frame:
+        """フレームモデルを作成"""
+        return Frame(
+            number=frame_index + 1,
+            rolls=list(self.frame_rolls[frame_index]),
+            score=self.frame_scores[frame_index],
+            is_strike=self._is_strike[frame_index],
+            is_spare=self._is_spare[frame_index],
+            is_completed=self._frame_completed[frame_index]
+        )
+
+    def to_frames(self, start: int = 0) -> List[Frame]:
+        """start 以降のフレームモデルを一括で作成"""
+        return _FRAMES_ADAPTER.validate_python([
+            {
+                "number": index + 1,
+                "rolls": list(self.frame_rolls[index]),
+                "score": self.frame_scores[index],
+                "is_strike": self._is_strike[index],
+                "is_spare": self._is_spare[index],
+                "is_completed": self._frame_completed[index],
+            }
+            for index in range(start, FRAME_COUNT)
+        ])
@@ -0,0 +1,127 @@
+"""組み込みSQLiteデータベース
+
+storage_backend = "sqlite" の場合にゲーム・ユーザーを保存する。
+WALモードで開くため、読み取りは書き込みと並行して行える。
+接続は run_blocking のワーカースレッドごとに作成し、書き込みは
+BEGIN IMMEDIATE のトランザクションでデータベース単位に直列化する。
+
+日時はUTCに正規化したISO 8601文字列（マイクロ秒まで固定長）で保存するため、
+文字列の大小比較がそのまま日時の比較になる。
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    uid TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL,
+    display_name TEXT NOT NULL,
+    photo_url TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS games (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total_score INTEGER NOT NULL,
+    roll_string TEXT NOT NULL,
+    strike_count INTEGER NOT NULL DEFAULT 0,
+    spare_count INTEGER NOT NULL DEFAULT 0,
+    turkey_count INTEGER NOT NULL DEFAULT 0,
+    played_at TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    expire_at TEXT NOT NULL
+);
+
+-- 履歴（played_at DESC, id DESC のキーセットページネーション）
+CREATE INDEX IF NOT EXISTS idx_games_user_played_at
+    ON games (user_id, played_at DESC, id DESC);
+
+-- ステータス指定の履歴・完了ゲームの統計集計
+CREATE INDEX IF NOT EXISTS idx_games_user_status
+    ON games (user_id, status, played_at DESC, id DESC);
+"""
+
+
+def to_db_datetime(value: datetime) -> str:
+    """日時を保存形式の文字列に変換（タイムゾーンなしはUTCとみなす）"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def from_db_datetime(value: str) -> datetime:
+    """保存形式の文字列を日時に変換"""
+    return datetime.fromisoformat(value)
+
+
+class SQLiteDatabase:
+    """SQLiteデータベースへの接続を管理する"""
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def connection(self) -> sqlite3.Connection:
+        """現在のスレッドの接続を取得（未作成の場合は作成）"""
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "connection", None)
+        if conn is None:
+            # isolation_level=None: トランザクションは transaction() で明示的に開始する
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.connection = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def initialize(self) -> None:
+        """テーブル・インデックスを作成"""
+        self.connection().executescript(SCHEMA)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """書き込みトランザクション（開始時に書き込みロックを取得）"""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            # COMMIT の失敗時も含めてロールバック（SQLite が既に取り消している場合を除く）
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    @contextmanager
+    def read_transaction(self) -> Iterator[sqlite3.Connection]:
+        """読み取りトランザクション（WALのため、内部の全クエリが同じ時点のデータを読む）"""
+        conn = self.connection()
+        conn.execute("BEGIN")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    def close(self) -> None:
+        """全スレッドの接続を閉じる"""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
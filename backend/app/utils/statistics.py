@@ -0,0 +1,144 @@
+"""ユーザー統計集計ユーティリティ
+
+ユーザーごとの統計ドキュメントは、完了ゲームの追加・削除時に
+Firestoreの Increment で差分更新する。最高・最低スコアは削除時にも
+正確に戻せるよう、スコアごとの件数（score_histogram）から算出する。
+
+統計ドキュメントは完了ゲームの全件集計（build_statistics_document）で作成した場合のみ
+version を持つ。Increment で新規作成されたドキュメント（それ以前の完了ゲームを含まない）は
+version を持たないため、参照時に needs_rebuild で検出して再構築する。
+"""
+from typing import Any, Dict, List
+from google.cloud import firestore
+from app.models.game import Frame
+
+PERFECT_SCORE = 300
+
+# 全件集計で作成した統計ドキュメントの形式バージョン
+STATISTICS_VERSION = 1
+
+
+def game_statistics_delta(total_score: int, frames: List[Frame]) -> Dict[str, int]:
+    """1ゲーム分の統計値を算出"""
+    return flags_statistics_delta(
+        total_score,
+        [frame.is_strike for frame in frames],
+        [frame.is_spare for frame in frames]
+    )
+
+
+def flags_statistics_delta(total_score: int, strikes: List[bool], spares: List[bool]) -> Dict[str, int]:
+    """フレームごとのストライク・スペアのフラグから1ゲーム分の統計値を算出"""
+    strike_count = 0
+    spare_count = 0
+    turkey_count = 0
+    consecutive_strikes = 0
+
+    for is_strike, is_spare in zip(strikes, spares):
+        if is_strike:
+            strike_count += 1
+            # ターキーカウント（3連続ストライク）
+            consecutive_strikes += 1
+            if consecutive_strikes >= 3:
+                turkey_count += 1
+        else:
+            consecutive_strikes = 0
+        if is_spare:
+            spare_count += 1
+
+    return {
+        "total_score": total_score,
+        "strike_count": strike_count,
+        "spare_count": spare_count,
+        "turkey_count": turkey_count,
+        "perfect_games": 1 if total_score == PERFECT_SCORE else 0,
+    }
+
+
+def statistics_increment(delta: Dict[str, int], sign: int = 1) -> Dict[str, Any]:
+    """統計ドキュメントに merge=True で書き込む差分（Increment）を作成
+
+    Args:
+        delta: game_statistics_delta の戻り値
+        sign: 追加時は 1、削除時は -1
+    """
+    return {
+        "completed_games": firestore.Increment(sign),
+        "score_sum": firestore.Increment(sign * delta["total_score"]),
+        "strike_count": firestore.Increment(sign * delta["strike_count"]),
+        "spare_count": firestore.Increment(sign * delta["spare_count"]),
+        "turkey_count": firestore.Increment(sign * delta["turkey_count"]),
+        "perfect_games": firestore.Increment(sign * delta["perfect_games"]),
+        "score_histogram": {str(delta["total_score"]): firestore.Increment(sign)},
+        "updated_at": firestore.SERVER_TIMESTAMP,
+    }
+
+
+def build_statistics_document(deltas: List[Dict[str, int]]) -> Dict[str, Any]:
+    """全完了ゲームの統計値から統計ドキュメントを再構築"""
+    document: Dict[str, Any] = {
+        "completed_games": len(deltas),
+        "score_sum": 0,
+        "strike_count": 0,
+        "spare_count": 0,
+        "turkey_count": 0,
+        "perfect_games": 0,
+        "score_histogram": {},
+        "version": STATISTICS_VERSION,
+        "updated_at": firestore.SERVER_TIMESTAMP,
+    }
+    for delta in deltas:
+        document["score_sum"] += delta["total_score"]
+        for key in ("strike_count", "spare_count", "turkey_count", "perfect_games"):
+            document[key] += delta[key]
+        score_key = str(delta["total_score"])
+        document["score_histogram"][score_key] = (
+            document["score_histogram"].get(score_key, 0) + 1
+        )
+    return document
+
+
+def needs_rebuild(document: Dict[str, Any]) -> bool:
+    """全件集計による再構築が必要か（全件集計で作成されていないドキュメント）"""
+    return document.get("version") != STATISTICS_VERSION
+
+
+def statistics_from_document(document: Dict[str, Any]) -> Dict[str, Any]:
+    """統計ドキュメントをAPIの統計形式に変換"""
+    completed_games = max(int(document.get("completed_games", 0)), 0)
+    if completed_games == 0:
+        return empty_statistics()
+
+    scores = [
+        int(score)
+        for score, count in document.get("score_histogram", {}).items()
+        if count > 0
+    ]
+    average_score = document.get("score_sum", 0) / completed_games
+
+    return {
+        "total_games": completed_games,
+        "completed_games": completed_games,
+        "average_score": round(average_score, 1),
+        "highest_score": max(scores) if scores else 0,
+        "lowest_score": min(scores) if scores else 0,
+        "strike_count": document.get("strike_count", 0),
+        "spare_count": document.get("spare_count", 0),
+        "perfect_games": document.get("perfect_games", 0),
+        "turkey_count": document.get("turkey_count", 0),
+    }
+
+
+def empty_statistics() -> Dict[str, Any]:
+    """ゲームが存在しない場合の統計"""
+    return {
+        "total_games": 0,
+        "completed_games": 0,
+        "average_score": 0.0,
+        "highest_score": 0,
+        "lowest_score": 0,
+        "strike_count": 0,
+        "spare_count": 0,
+        "perfect_games": 0,
+        "turkey_count": 0
+    }
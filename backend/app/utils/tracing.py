@@ -0,0 +1,334 @@
+"""軽量トレーシング
+
+リクエスト単位のトレースと、ルーター・サービス・リポジトリ・スコア計算の
+各レイヤーの処理時間（スパン）を記録する。
+トレースの開始・終了は TracingMiddleware が行い、終了したトレースは
+OpenTelemetry の OTLP/JSON 形式（1行1トレース）で標準出力またはファイルに書き出す。
+
+トレース対象外のリクエスト（未サンプリング・無効時）では、スパンの作成は
+コンテキスト変数の参照のみで終わる。
+"""
+import atexit
+import functools
+import inspect
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Type, TypeVar
+from app.config import settings
+
+T = TypeVar("T")
+
+SERVICE_NAME = "bowlards-api"
+INSTRUMENTATION_SCOPE = "app.utils.tracing"
+
+# OTLPのスパン種別・ステータスコード
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_CODE_ERROR = 2
+
+
+class Span:
+    """処理時間の計測区間"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_span_id", "kind",
+                 "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_span_id: Optional[str],
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes or {}
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """属性を設定"""
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        """処理時間（ミリ秒）"""
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+
+class Trace:
+    """1リクエスト分のスパンの集合"""
+
+    __slots__ = ("trace_id", "parent_span_id", "spans")
+
+    def __init__(self, trace_id: Optional[str] = None, parent_span_id: Optional[str] = None):
+        self.trace_id = trace_id or os.urandom(16).hex()
+        self.parent_span_id = parent_span_id
+        self.spans: List[Span] = []
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[tuple]:
+    """W3C traceparent ヘッダーを (trace_id, parent_span_id, sampled) に変換"""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        flags = int(parts[3], 16)
+        int(parts[1], 16)
+        int(parts[2], 16)
+    except ValueError:
+        return None
+    return parts[1], parts[2], bool(flags & 0x01)
+
+
+def should_sample(traceparent: Optional[tuple] = None) -> bool:
+    """このリクエストをトレースするか判定
+
+    上流の traceparent でサンプリング済みの場合はそれに従う。
+    """
+    if not settings.tracing_enabled:
+        return False
+    if traceparent is not None and traceparent[2]:
+        return True
+    return random.random() < settings.tracing_sample_rate
+
+
+@contextmanager
+def start_trace(traceparent: Optional[tuple] = None) -> Iterator[Trace]:
+    """トレースを開始し、終了時に書き出すコンテキストマネージャー"""
+    if traceparent is not None:
+        trace = Trace(trace_id=traceparent[0], parent_span_id=traceparent[1])
+    else:
+        trace = Trace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        finish_trace(trace)
+
+
+def current_trace() -> Optional[Trace]:
+    """現在のトレースを取得（トレース対象外の場合はNone）"""
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, kind: int = SPAN_KIND_INTERNAL, **attributes: Any) -> Iterator[Optional[Span]]:
+    """スパンを記録するコンテキストマネージャー
+
+    トレース対象外の場合は何も記録せず None を返す。
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    current = Span(
+        name,
+        trace.trace_id,
+        parent.span_id if parent is not None else trace.parent_span_id,
+        kind=kind,
+        attributes=attributes
+    )
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current_span.reset(token)
+        trace.spans.append(current)
+
+
+def traced(name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """関数・コルーチン関数の呼び出しをスパンとして記録するデコレータ"""
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _current_trace.get() is None:
+                    return await func(*args, **kwargs)
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _current_trace.get() is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def trace_methods(prefix: str) -> Callable[[Type[T]], Type[T]]:
+    """クラスの公開メソッドを全てスパンとして記録するクラスデコレータ
+
+    スパン名は "{prefix}.{メソッド名}" になる。
+    """
+    def decorator(cls: Type[T]) -> Type[T]:
+        for name, member in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.isfunction(member):
+                continue
+            setattr(cls, name, traced(f"{prefix}.{name}")(member))
+        return cls
+
+    return decorator
+
+
+def _attribute_value(value: Any) -> Dict[str, Any]:
+    """属性値をOTLP/JSONの AnyValue に変換"""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"key": key, "value": _attribute_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+def to_otlp_json(spans: List[Span]) -> Dict[str, Any]:
+    """スパンをOTLP/JSON（ExportTraceServiceRequest）形式の辞書に変換"""
+    otlp_spans = []
+    for item in spans:
+        otlp_span = {
+            "traceId": item.trace_id,
+            "spanId": item.span_id,
+            "name": item.name,
+            "kind": item.kind,
+            "startTimeUnixNano": str(item.start_ns),
+            "endTimeUnixNano": str(item.end_ns),
+            "attributes": _attributes(item.attributes),
+            "status": {},
+        }
+        if item.parent_span_id:
+            otlp_span["parentSpanId"] = item.parent_span_id
+        if item.error:
+            otlp_span["status"] = {"code": STATUS_CODE_ERROR, "message": item.error}
+        otlp_spans.append(otlp_span)
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _attributes({"service.name": SERVICE_NAME})},
+            "scopeSpans": [{
+                "scope": {"name": INSTRUMENTATION_SCOPE},
+                "spans": otlp_spans,
+            }],
+        }]
+    }
+
+
+class SpanExporter:
+    """終了したトレースをOTLP/JSON Lines形式で書き出すエクスポーター
+
+    JSONへの変換と書き込みはバックグラウンドスレッドで行い、
+    イベントループ上ではキューへの追加のみとする。
+    フラッシュはキューが空になった時点でまとめて行う。
+    """
+
+    def __init__(self, stream: TextIO, close_stream: bool = False):
+        self._stream = stream
+        self._close_stream = close_stream
+        self._queue: "queue.Queue[Optional[List[Span]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, trace: Trace) -> None:
+        """トレースを書き出しキューに追加"""
+        if trace.spans:
+            self._queue.put(trace.spans)
+
+    def _run(self) -> None:
+        while True:
+            spans = self._queue.get()
+            try:
+                if spans is None:
+                    return
+                line = json.dumps(to_otlp_json(spans), ensure_ascii=False, separators=(",", ":"))
+                self._stream.write(line + "\n")
+                if self._queue.empty():
+                    self._stream.flush()
+            except Exception:
+                # 書き出しの失敗でリクエスト処理やスレッドを止めない
+                pass
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """キューに残っているトレースを書き出すまで待つ"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """残りを書き出してスレッドを停止し、出力先を閉じる"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if self._close_stream:
+            self._stream.close()
+        else:
+            self._stream.flush()
+
+
+_exporter: Optional[SpanExporter] = None
+
+
+def get_exporter() -> Optional[SpanExporter]:
+    """設定に応じたエクスポーターを取得（exporter が "none" の場合はNone）"""
+    global _exporter
+    if _exporter is None:
+        if settings.tracing_exporter == "stdout":
+            _exporter = SpanExporter(sys.stdout)
+        elif settings.tracing_exporter == "file":
+            _exporter = SpanExporter(
+                open(settings.tracing_export_path, "a", encoding="utf-8"), close_stream=True
+            )
+        if _exporter is not None:
+            atexit.register(shutdown_tracing)
+    return _exporter
+
+
+def finish_trace(trace: Trace) -> None:
+    """トレースを終了して書き出す"""
+    exporter = get_exporter()
+    if exporter is not None:
+        exporter.export(trace)
+
+
+def shutdown_tracing() -> None:
+    """エクスポーターを閉じる"""
+    global _exporter
+    if _exporter is not None:
+        _exporter.close()
+        _exporter = None
@@ -0,0 +1,25 @@
+"""ベンチマーク・負荷試験で共有するゲームデータ"""
+import random
+from typing import List
+
+
+# 典型的なゲーム（ストライク・スペア・オープンフレームを含む）
+TYPICAL_FRAMES = [[10], [7, 3], [9, 0], [10], [10], [8, 1], [6, 4], [10], [7, 2], [10, 8, 1]]
+
+
+def random_rolls(rng: random.Random) -> List[List[int]]:
+    """ランダムなゲームのフレームごとのロールを作成"""
+    frames = []
+    for frame_index in range(10):
+        first = rng.randint(0, 10)
+        if frame_index < 9:
+            frames.append([10] if first == 10 else [first, rng.randint(0, 10 - first)])
+            continue
+        # 10フレーム目（ストライク・スペアの場合はボーナス投球あり）
+        second = rng.randint(0, 10) if first == 10 else rng.randint(0, 10 - first)
+        rolls = [first, second]
+        if first == 10 or first + second == 10:
+            third_max = 10 if (first == 10 and second == 10) or first + second == 10 else 10 - second
+            rolls.append(rng.randint(0, third_max))
+        frames.append(rolls)
+    return frames
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+一括スコア計算ベンチマーク
+
+ランダムな完了ゲームを生成し、以下の方式のスループット（ゲーム/秒）を比較します。
+
+- calculate_score: ゲーム状態（GameState）に1投ずつ calculate_score を適用（従来方式）
+- python: score_roll_matrix の純Python実装
+- numpy: score_roll_matrix のNumPyベクトル化実装
+
+使用方法:
+    python benchmarks/bench_batch_scoring.py [--games 100000] [--baseline-games 2000]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.models.game import RollRequest
+from app.utils.batch_scoring import ROLL_SLOTS, EMPTY_ROLL, np, score_roll_matrix
+from app.utils.game_state import GameState
+from app.utils.scoring import IncrementalScorer, calculate_score
+
+
+def random_roll_matrix(count: int, seed: int) -> list:
+    """ランダムな完了ゲームの (N, 21) ロール行列を生成"""
+    rng = random.Random(seed)
+    matrix = []
+    for _ in range(count):
+        row = [EMPTY_ROLL] * ROLL_SLOTS
+        for frame_index in range(9):
+            first = rng.randint(0, 10)
+            row[frame_index * 2] = first
+            if first < 10:
+                row[frame_index * 2 + 1] = rng.randint(0, 10 - first)
+        first = rng.randint(0, 10)
+        second = rng.randint(0, 10) if first == 10 else rng.randint(0, 10 - first)
+        row[18], row[19] = first, second
+        if first == 10 or first + second == 10:
+            row[20] = rng.randint(0, 10 - second if first == 10 and second < 10 else 10)
+        matrix.append(row)
+    return matrix
+
+
+def score_with_calculate_score(matrix: list) -> list:
+    """従来方式（GameStateに1投ずつ適用）で合計スコアを計算"""
+    totals = []
+    now = datetime.now()
+    for row in matrix:
+        game = GameState(
+            id="bench",
+            user_id="bench",
+            scorer=IncrementalScorer(),
+            total_score=0,
+            status="playing",
+            played_at=now,
+            created_at=now,
+            updated_at=now,
+            expire_at=now
+        )
+        for slot, pin_count in enumerate(row):
+            if pin_count < 0:
+                continue
+            frame_number = min(slot // 2, 9) + 1
+            game = calculate_score(game, RollRequest(frame_number=frame_number, pin_count=pin_count))
+        totals.append(game.total_score)
+    return totals
+
+
+def measure(func, *args) -> tuple:
+    """実行時間（秒）と戻り値を計測"""
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="一括スコア計算ベンチマーク")
+    parser.add_argument("--games", type=int, default=100000, help="一括計算するゲーム数")
+    parser.add_argument("--baseline-games", type=int, default=2000, help="calculate_scoreで計算するゲーム数")
+    parser.add_argument("--seed", type=int, default=20251005)
+    args = parser.parse_args()
+
+    matrix = random_roll_matrix(args.games, args.seed)
+    baseline_matrix = matrix[:args.baseline_games]
+    results = {}
+
+    elapsed, baseline_totals = measure(score_with_calculate_score, baseline_matrix)
+    results["calculate_score"] = {"games": len(baseline_matrix), "seconds": elapsed}
+
+    elapsed, python_result = measure(score_roll_matrix, matrix, False)
+    results["python"] = {"games": len(matrix), "seconds": elapsed}
+    assert python_result.total_scores[:len(baseline_totals)] == baseline_totals
+
+    if np is not None:
+        array = np.asarray(matrix, dtype=np.int16)
+        elapsed, numpy_result = measure(score_roll_matrix, array, True)
+        results["numpy"] = {"games": len(matrix), "seconds": elapsed}
+        assert numpy_result.total_scores == python_result.total_scores
+    else:
+        print("💡 NumPyが未インストールのため numpy 方式は計測しません (pip install numpy)")
+
+    baseline_rate = results["calculate_score"]["games"] / results["calculate_score"]["seconds"]
+    for result in results.values():
+        result["games_per_second"] = round(result["games"] / result["seconds"], 1)
+        result["speedup"] = round(result["games_per_second"] / baseline_rate, 1)
+        result["seconds"] = round(result["seconds"], 4)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
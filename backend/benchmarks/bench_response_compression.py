@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+レスポンス圧縮のベンチマーク
+
+ランダムなロールのゲーム履歴ページ（GET /games/history 相当）のレスポンス本文について、
+圧縮方式・圧縮レベルごとの圧縮時間とサイズを比較します。
+brotli はパッケージがインストールされている場合のみ計測します。
+
+使用方法:
+    python benchmarks/bench_response_compression.py [--pages 20,50,100] [--iterations 200]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from bench_response_serialization import build_history
+
+from app.middleware.compression import _create_compressor, brotli
+from app.models.common import success_json_response
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 6, 11)
+
+
+def compress(encoding: str, level: int, body: bytes) -> bytes:
+    """1レスポンス分を圧縮（ミドルウェアと同じ圧縮処理）"""
+    compressor = _create_compressor(encoding, gzip_level=level, brotli_quality=level)
+    return compressor.compress(body) + compressor.flush()
+
+
+def per_call_us(func, iterations: int) -> float:
+    """1回あたりの実行時間（マイクロ秒）"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="レスポンス圧縮ベンチマーク")
+    parser.add_argument("--pages", default="20,50,100", help="計測するページサイズ（カンマ区切り）")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    settings_to_measure = [("gzip", level) for level in GZIP_LEVELS]
+    if brotli is not None:
+        settings_to_measure += [("br", quality) for quality in BROTLI_QUALITIES]
+
+    results = []
+    for page_size in (int(size) for size in args.pages.split(",")):
+        history, meta = build_history(page_size, seed=page_size)
+        body = success_json_response(data=history, meta=meta).body
+        for encoding, level in settings_to_measure:
+            compressed = compress(encoding, level, body)
+            results.append({
+                "games": page_size,
+                "encoding": encoding,
+                "level": level,
+                "original_bytes": len(body),
+                "compressed_bytes": len(compressed),
+                "ratio": round(len(compressed) / len(body), 4),
+                "per_call_us": round(
+                    per_call_us(lambda: compress(encoding, level, body), args.iterations), 1
+                ),
+            })
+
+    print(json.dumps({"brotli_available": brotli is not None, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
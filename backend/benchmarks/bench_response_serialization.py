@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+レスポンスシリアライズのベンチマーク
+
+100件のゲーム履歴（GET /games/history 相当）のレスポンス作成時間を比較します。
+
+- legacy: model.dict() → success_response（APIResponseで再検証・辞書化）
+          → FastAPIのresponse_model検証・jsonable_encoder → json.dumps
+- envelope: success_json_response（モデルを pydantic_core で1回だけJSONバイト列に変換）
+
+使用方法:
+    python benchmarks/bench_response_serialization.py [--games 100] [--iterations 500]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# プロジェクトルートをパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from benchmarks._games import TYPICAL_FRAMES, random_rolls
+
+from app.models.common import MetaInfo, success_json_response, success_response
+from app.models.game import GameResponse
+from app.utils.scoring import IncrementalScorer
+
+
+def build_history(games: int, seed: Optional[int] = None):
+    """ゲーム履歴のレスポンスモデルを作成
+
+    seed を指定した場合はゲームごとにランダムなロール・日時を使う
+    （同一ゲームの繰り返しは圧縮率が実際より高くなるため）。
+    """
+    rng = random.Random(seed) if seed is not None else None
+    now = datetime.now(timezone.utc)
+
+    history = []
+    for index in range(games):
+        scorer = IncrementalScorer()
+        rolls = random_rolls(rng) if rng is not None else TYPICAL_FRAMES
+        for frame_index, frame_rolls in enumerate(rolls):
+            for pin_count in frame_rolls:
+                scorer.add_roll(frame_index, pin_count)
+        played_at = now - timedelta(hours=index * 7, seconds=rng.randint(0, 3600)) if rng else now
+        history.append(GameResponse(
+            id=f"{rng.getrandbits(80):020x}" if rng else f"game-{index:04d}",
+            user_id="firebase-uid-123",
+            total_score=scorer.total_score,
+            frames=scorer.to_frames(),
+            status="completed",
+            played_at=played_at,
+            created_at=played_at,
+            updated_at=played_at
+        ))
+    meta = MetaInfo(total=games, limit=games, offset=0, next_cursor=None)
+    return history, meta
+
+
+def legacy_body(history, meta, response_field) -> bytes:
+    """従来の経路でレスポンスボディを作成"""
+    content = success_response(data=[game.dict() for game in history], meta=meta)
+    encoded = asyncio.run(serialize_response(field=response_field, response_content=content))
+    return JSONResponse(encoded).body
+
+
+def envelope_body(history, meta) -> bytes:
+    """1回のシリアライズでレスポンスボディを作成"""
+    return success_json_response(data=history, meta=meta).body
+
+
+def per_call_us(func, iterations: int) -> float:
+    """1回あたりの実行時間（マイクロ秒）"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="レスポンスシリアライズベンチマーク")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    history, meta = build_history(args.games)
+    response_field = create_response_field(name="response", type_=Dict[str, Any])
+
+    legacy = legacy_body(history, meta, response_field)
+    envelope = envelope_body(history, meta)
+    # 出力内容が同じ形式であることを確認
+    assert json.loads(legacy).keys() == json.loads(envelope).keys()
+
+    legacy_us = per_call_us(lambda: legacy_body(history, meta, response_field), args.iterations)
+    envelope_us = per_call_us(lambda: envelope_body(history, meta), args.iterations)
+
+    print(json.dumps({
+        "games": args.games,
+        "legacy_us": round(legacy_us, 1),
+        "envelope_us": round(envelope_us, 1),
+        "speedup": round(legacy_us / envelope_us, 2),
+        "legacy_bytes": len(legacy),
+        "envelope_bytes": len(envelope),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
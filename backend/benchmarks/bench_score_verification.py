@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+完了ゲーム保存時のスコア検証ベンチマーク
+
+POST /games/ のリクエスト処理のうち、以下を1リクエストあたりの時間（マイクロ秒）で比較します。
+
+- parse: CompletedGameRequest のバリデーション（FastAPIが行う処理）
+- verify: GameService._verify_completed_game（ロールからの再計算と不一致検出）
+
+あわせて、派生値を含む従来のペイロードとロールのみのペイロードのサイズを比較します。
+Firestoreへの書き込み（通常数十ミリ秒）に比べて検証コストが無視できることを確認します。
+
+使用方法:
+    python benchmarks/bench_score_verification.py [--iterations 20000]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.models.game import CompletedGameRequest
+from app.services.game_service import GameService
+from app.utils.scoring import IncrementalScorer
+
+# 典型的なゲーム（ストライク・スペア・オープンフレームを含む）
+TYPICAL_FRAMES = [[10], [7, 3], [9, 0], [10], [10], [8, 1], [6, 4], [10], [7, 2], [10, 8, 1]]
+
+
+def full_payload() -> dict:
+    """派生値を含む従来形式のペイロード"""
+    scorer = IncrementalScorer()
+    for frame_index, rolls in enumerate(TYPICAL_FRAMES):
+        for pin_count in rolls:
+            scorer.add_roll(frame_index, pin_count)
+    frames = []
+    for frame in scorer.to_frames():
+        rolls = frame.rolls + [None] * (3 - len(frame.rolls))
+        frames.append({
+            "frameNumber": frame.number,
+            "firstRoll": rolls[0],
+            "secondRoll": rolls[1],
+            "thirdRoll": rolls[2],
+            "frameScore": frame.score,
+            "isStrike": frame.is_strike,
+            "isSpare": frame.is_spare,
+            "isCompleted": frame.is_completed
+        })
+    return {
+        "gameDate": "2025-10-05T12:00:00Z",
+        "totalScore": scorer.total_score,
+        "frames": frames,
+        "status": "completed"
+    }
+
+
+def rolls_only_payload() -> dict:
+    """ロールのみのペイロード"""
+    frames = []
+    for frame_index, rolls in enumerate(TYPICAL_FRAMES):
+        frame = {"frameNumber": frame_index + 1}
+        for key, pin_count in zip(("firstRoll", "secondRoll", "thirdRoll"), rolls):
+            frame[key] = pin_count
+        frames.append(frame)
+    return {"gameDate": "2025-10-05T12:00:00Z", "frames": frames}
+
+
+def per_call_us(func, iterations: int) -> float:
+    """1回あたりの実行時間（マイクロ秒）"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="スコア検証ベンチマーク")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    results = {}
+    for name, payload in (("full", full_payload()), ("rolls_only", rolls_only_payload())):
+        body = json.dumps(payload, separators=(",", ":"))
+        request = CompletedGameRequest.model_validate_json(body)
+        parse_us = per_call_us(lambda: CompletedGameRequest.model_validate_json(body), args.iterations)
+        verify_us = per_call_us(lambda: GameService._verify_completed_game(request), args.iterations)
+        results[name] = {
+            "payload_bytes": len(body.encode("utf-8")),
+            "parse_us": round(parse_us, 2),
+            "verify_us": round(verify_us, 2),
+        }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+スコア計算のマイクロベンチマーク
+
+app/utils/scoring.py の以下の処理を、典型的なゲーム・パーフェクト（全ストライク）・
+全スペア・ガターのみの4種類のゲームで計測します（マイクロ秒）。
+
+- create_initial_frames: 10フレームのモデル作成（1ゲームあたり。参考値としてモデル作成のコストを示す）
+- new_game_state: 新規ゲームの状態（GameState）の作成（1ゲームあたり。サービス層ではこちらを使う）
+- calculate_score: GameState に1投ずつゲーム終了まで追加（1ゲームあたり・1投あたり。
+  サービス層・リポジトリでの1投あたりのスコア計算コストで、Pydanticモデルは作らない）
+- IncrementalScorer.add_roll: スコア計算エンジンのみ（1投あたり）
+- GameState.to_response: ルーターでのレスポンスモデルへの変換（1リクエストあたり）
+- calculate_score の1投あたり・to_response の1回あたりの一時メモリ確保量
+  （tracemalloc のピーク、バイト。回帰判定には含めない）
+- Frame の属性代入: Pydanticモデルへの代入と、__slots__ を持つ通常クラスへの代入（参考値）
+
+各値は --repeat 回の計測の中央値で、--runs を指定すると全項目の計測を繰り返し、
+項目ごとに各回の中央値を採用します。--check を指定すると baselines/scoring.json の値と比較し、
+基準値 × --threshold を超え、かつ差が --min-delta-us 以上の項目があれば終了コード1で終了します。
+基準値が --min-gated-us 未満の項目（1μs未満の処理）は計測誤差が大きいため判定に含めません。
+実行環境の速度差は、固定の処理（キャリブレーション）の時間の比で基準値を補正して吸収します
+（補正は遅い環境で上限を緩める方向のみ。速い環境で使う場合はその環境で基準値を更新してください）。
+スコア計算を意図して変更した場合は --update-baseline --runs 5 で基準値を更新してください。
+
+使用方法:
+    python benchmarks/bench_scoring.py [--iterations 1000] [--repeat 9] [--runs 1]
+        [--check] [--threshold 1.25] [--min-delta-us 0.5] [--min-gated-us 1.0]
+        [--update-baseline] [--baseline PATH]
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# プロジェクトルートをパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.models.game import RollRequest
+from app.utils.game_state import GameState
+from app.utils.scoring import IncrementalScorer, calculate_score, create_initial_frames
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "scoring.json"
+
+# 計測するゲーム（フレームごとのロール）
+SCENARIOS: Dict[str, List[List[int]]] = {
+    "typical": [[10], [7, 3], [9, 0], [10], [10], [8, 1], [6, 4], [10], [7, 2], [10, 8, 1]],
+    "all_strike": [[10]] * 9 + [[10, 10, 10]],
+    "all_spare": [[5, 5]] * 9 + [[5, 5, 5]],
+    "gutter": [[0, 0]] * 10,
+}
+
+# 回帰判定に含めない参考値
+REFERENCE_METRICS = {"frame_mutation.plain_setattr_us"}
+
+
+class _PlainFrame:
+    """属性代入の比較用（検証なしの通常クラス）"""
+
+    __slots__ = ("score", "is_strike")
+
+    def __init__(self):
+        self.score = 0
+        self.is_strike = False
+
+
+def new_game() -> GameState:
+    """初期状態のゲーム"""
+    now = datetime.now(timezone.utc)
+    return GameState(
+        id="bench", user_id="bench", scorer=IncrementalScorer(), total_score=0, status="playing",
+        played_at=now, created_at=now, updated_at=now, expire_at=now
+    )
+
+
+def roll_requests(frames: List[List[int]]) -> List[RollRequest]:
+    """ゲームのロールを投球順のリクエストに変換"""
+    return [
+        RollRequest(frame_number=frame_index + 1, pin_count=pin_count)
+        for frame_index, rolls in enumerate(frames)
+        for pin_count in rolls
+    ]
+
+
+def median_of(func: Callable[[], float], repeat: int) -> float:
+    """repeat 回計測した中央値"""
+    return statistics.median(func() for _ in range(repeat))
+
+
+def per_call_us(func: Callable[[], object], iterations: int) -> float:
+    """1回あたりの実行時間（マイクロ秒）"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def calibration_us(iterations: int) -> float:
+    """実行環境の速度の目安（リスト・整数演算を中心とした固定の処理）"""
+    def _work():
+        values = []
+        for i in range(100):
+            values.append(i % 11)
+        return sum(values)
+    return per_call_us(_work, iterations)
+
+
+def game_replay_us(rolls: List[RollRequest], iterations: int) -> float:
+    """初期状態のゲームに全ロールを1投ずつ追加する時間（1ゲームあたり、ゲームの作成は含まない）"""
+    games = [new_game() for _ in range(iterations)]
+    start = time.perf_counter()
+    for game in games:
+        for roll in rolls:
+            game = calculate_score(game, roll)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def scorer_replay_us(rolls: List[RollRequest], iterations: int) -> float:
+    """初期状態の IncrementalScorer に全ロールを1投ずつ追加する時間（1ゲームあたり）"""
+    scorers = [IncrementalScorer() for _ in range(iterations)]
+    start = time.perf_counter()
+    for scorer in scorers:
+        for roll in rolls:
+            scorer.add_roll(roll.frame_number - 1, roll.pin_count)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def peak_alloc_bytes_per_roll(rolls: List[RollRequest], games: int = 100) -> int:
+    """calculate_score 1回あたりの一時メモリ確保量のピーク（平均、バイト）"""
+    targets = [new_game() for _ in range(games)]
+    peaks = []
+    tracemalloc.start()
+    try:
+        for game in targets:
+            for roll in rolls:
+                current = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                game = calculate_score(game, roll)
+                peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+    return round(sum(peaks) / len(peaks))
+
+
+def peak_alloc_bytes_per_call(func: Callable[[], object], calls: int = 100) -> int:
+    """func 1回あたりの一時メモリ確保量のピーク（平均、バイト。戻り値の保持分を含む）"""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(calls):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            result = func()
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+            del result
+    finally:
+        tracemalloc.stop()
+    return round(sum(peaks) / len(peaks))
+
+
+def measure(iterations: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """全項目を計測"""
+    results: Dict[str, Dict[str, float]] = {
+        "create_initial_frames": {
+            "per_game_us": round(median_of(lambda: per_call_us(create_initial_frames, iterations), repeat), 3),
+        },
+        "new_game_state": {
+            "per_game_us": round(median_of(lambda: per_call_us(new_game, iterations), repeat), 3),
+        },
+    }
+
+    for name, frames in SCENARIOS.items():
+        rolls = roll_requests(frames)
+        per_game = median_of(lambda: game_replay_us(rolls, iterations), repeat)
+        scorer_per_game = median_of(lambda: scorer_replay_us(rolls, iterations), repeat)
+
+        completed_game = new_game()
+        for roll in rolls:
+            completed_game = calculate_score(completed_game, roll)
+        assert completed_game.status == "completed"
+
+        results[name] = {
+            "rolls": len(rolls),
+            "total_score": completed_game.total_score,
+            "per_game_us": round(per_game, 3),
+            "per_roll_us": round(per_game / len(rolls), 3),
+            "scorer_per_roll_us": round(scorer_per_game / len(rolls), 3),
+            "response_us": round(median_of(lambda: per_call_us(completed_game.to_response, iterations), repeat), 3),
+            "peak_alloc_bytes_per_roll": peak_alloc_bytes_per_roll(rolls),
+            "response_alloc_bytes": peak_alloc_bytes_per_call(completed_game.to_response),
+        }
+
+    frame = create_initial_frames()[0]
+    plain_frame = _PlainFrame()
+
+    def _set_frame():
+        frame.score = 30
+        frame.is_strike = True
+
+    def _set_plain():
+        plain_frame.score = 30
+        plain_frame.is_strike = True
+
+    # 1回あたり2属性を代入するため2で割る
+    results["frame_mutation"] = {
+        "pydantic_setattr_us": round(median_of(lambda: per_call_us(_set_frame, iterations * 10), repeat) / 2, 4),
+        "plain_setattr_us": round(median_of(lambda: per_call_us(_set_plain, iterations * 10), repeat) / 2, 4),
+    }
+    return results
+
+
+def measure_runs(iterations: int, repeat: int, runs: int) -> Dict[str, Dict[str, float]]:
+    """全項目の計測を runs 回繰り返し、項目ごとに中央値を採用"""
+    all_results = [measure(iterations, repeat) for _ in range(runs)]
+    return {
+        group: {key: statistics.median(results[group][key] for results in all_results) for key in values}
+        for group, values in all_results[0].items()
+    }
+
+
+def gated_metrics(results: Dict[str, Dict[str, float]], min_gated_us: float = 0.0) -> Dict[str, float]:
+    """回帰判定の対象となる時間（"項目.指標" → マイクロ秒。min_gated_us 未満の項目は除く）"""
+    metrics = {}
+    for group, values in results.items():
+        for key, value in values.items():
+            name = f"{group}.{key}"
+            if key.endswith("_us") and name not in REFERENCE_METRICS and value >= min_gated_us:
+                metrics[name] = value
+    return metrics
+
+
+def compare(
+    report: dict,
+    baseline: dict,
+    threshold: float,
+    min_delta_us: float = 0.5,
+    min_gated_us: float = 1.0
+) -> List[str]:
+    """基準値との比較
+
+    基準値 × 環境補正 × threshold を超え、かつ補正後の基準値との差が min_delta_us 以上の
+    項目の説明を返す。基準値が min_gated_us 未満の項目は判定しない。
+    環境補正はキャリブレーションの比で、1未満（基準値の計測時より速い環境）の場合は1とする。
+    """
+    # キャリブレーション自体の誤差で全項目の上限が厳しくならないよう、補正は緩める方向のみ
+    scale = max(report["calibration_us"] / baseline["calibration_us"], 1.0)
+    current = gated_metrics(report["results"])
+    regressions = []
+    for name, baseline_value in gated_metrics(baseline["results"], min_gated_us).items():
+        if name not in current:
+            continue
+        expected = baseline_value * scale
+        limit = expected * threshold
+        if current[name] > limit and current[name] - expected >= min_delta_us:
+            regressions.append(
+                f"{name}: {current[name]:.3f}us > {limit:.3f}us "
+                f"(baseline {baseline_value:.3f}us x scale {scale:.2f} x threshold {threshold})"
+            )
+    return regressions
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="スコア計算マイクロベンチマーク")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument("--runs", type=int, default=1, help="全項目の計測回数（項目ごとに中央値を採用）")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--check", action="store_true", help="基準値と比較し、遅くなっていれば終了コード1")
+    parser.add_argument("--threshold", type=float, default=1.25, help="許容する基準値からの倍率")
+    parser.add_argument("--min-delta-us", type=float, default=0.5, help="回帰とみなす基準値との最小の差（μs）")
+    parser.add_argument("--min-gated-us", type=float, default=1.0, help="判定に含める基準値の下限（μs）")
+    parser.add_argument("--update-baseline", action="store_true", help="計測結果で基準値を上書き")
+    args = parser.parse_args()
+
+    # キャリブレーションは計測の前後で行い、中央値を採用する（一時的な負荷の影響を減らす）
+    calibrate = lambda: calibration_us(args.iterations * 10)
+    calibrations = [calibrate() for _ in range(args.repeat)]
+    results = measure_runs(args.iterations, args.repeat, args.runs)
+    calibrations += [calibrate() for _ in range(args.repeat)]
+    report = {
+        "python": platform.python_version(),
+        "iterations": args.iterations,
+        "runs": args.runs,
+        "calibration_us": round(statistics.median(calibrations), 4),
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline updated: {args.baseline}", file=sys.stderr)
+
+    if args.check:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.threshold, args.min_delta_us, args.min_gated_us)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline} (threshold {args.threshold})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+サービス層のスループットベンチマーク
+
+インメモリストレージ（storage_backend = "memory"）で GameService を直接呼び出し、
+ゲーム作成・ロール追加・履歴取得・統計取得の1秒あたりの処理数を計測します。
+Firestore・エミュレータは不要です。
+
+使用方法:
+    python benchmarks/bench_service_throughput.py [--games 2000] [--seed 42]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+import structlog
+
+# プロジェクトルートをパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks._games import random_rolls
+
+from app.dependencies import create_container
+from app.models.game import GameHistoryRequest, RollRequest
+from app.models.user import UserCreate
+
+UID = "bench-user"
+
+
+async def run(games: int, seed: int) -> dict:
+    """ベンチマークを実行"""
+    container = create_container("memory")
+    service = container.game_service
+    await container.user_repository.create(
+        UserCreate(uid=UID, email="bench@example.com", display_name="Bench")
+    )
+    rng = random.Random(seed)
+    games_rolls = [random_rolls(rng) for _ in range(games)]
+    roll_count = sum(len(rolls) for frame_rolls in games_rolls for rolls in frame_rolls)
+
+    start = time.perf_counter()
+    game_ids = [(await service.create_game(UID)).id for _ in range(games)]
+    create_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for game_id, frame_rolls in zip(game_ids, games_rolls):
+        for frame_index, rolls in enumerate(frame_rolls):
+            for pin_count in rolls:
+                await service.add_roll(game_id, UID, RollRequest(frame_number=frame_index + 1, pin_count=pin_count))
+    roll_seconds = time.perf_counter() - start
+
+    history_calls = max(games // 10, 1)
+    start = time.perf_counter()
+    cursor = None
+    for _ in range(history_calls):
+        history = await service.get_game_history(UID, GameHistoryRequest(limit=20, cursor=cursor))
+        cursor = history.next_cursor
+    history_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(history_calls):
+        await service.get_game_statistics(UID)
+    statistics_seconds = time.perf_counter() - start
+
+    container.close()
+    return {
+        "games": games,
+        "rolls": roll_count,
+        "create_game_per_sec": round(games / create_seconds),
+        "add_roll_per_sec": round(roll_count / roll_seconds),
+        "history_page_per_sec": round(history_calls / history_seconds),
+        "statistics_per_sec": round(history_calls / statistics_seconds),
+    }
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="サービス層スループットベンチマーク")
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # ログ出力の時間を計測に含めない
+    logging.disable(logging.WARNING)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    print(json.dumps(asyncio.run(run(args.games, args.seed)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
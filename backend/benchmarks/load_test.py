@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+APIの負荷試験
+
+多数のボウラーが同時にプロフィール取得・ゲーム作成・ロール送信（1投ずつ）・
+ゲーム取得・履歴取得（If-None-Match による再検証を含む）・統計取得を行う状況を
+プロセス内（httpx の ASGITransport）で再現し、エンドポイントごとの
+スループットと p50/p95/p99 レイテンシをJSONで出力します。
+
+- 認証: Firebaseの署名検証は行わず、ボウラーごとのトークンを検証済みトークンキャッシュに登録
+- ストレージ: インメモリ（既定）またはSQLite（一時ファイル）。Firestore・エミュレータは不要
+- レート制限: 既定で無効（APP_RATE_LIMIT_ENABLED=true で有効のまま計測）
+
+ミドルウェア・ルーター・サービス・リポジトリはすべて本番と同じコードを通ります。
+ネットワーク・TLS・Firestoreの遅延は含まないため、値はデプロイ前の回帰検知用の相対値として扱ってください。
+ロールは --seed から決まるため、同じ引数であれば同じリクエスト列になります。
+
+使用方法:
+    python benchmarks/load_test.py [--bowlers 200] [--games 3] [--concurrency 50]
+        [--storage memory|sqlite] [--seed 42] [--output report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# アプリケーションのインポート前に設定する（環境変数で上書き可能）
+os.environ.setdefault("APP_RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("APP_SQLITE_PATH", os.path.join(tempfile.gettempdir(), "bowlards-load-test.db"))
+# Firebase Admin SDKを認証情報なしで初期化する（トークンはすべてキャッシュから返すため接続しない）
+os.environ.setdefault("FIREBASE_AUTH_EMULATOR_HOST", "localhost:9099")
+
+import httpx
+import structlog
+
+# プロジェクトルートをパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks._games import random_rolls
+
+from app.auth.firebase import firebase_auth
+from app.config import settings
+from app.dependencies import create_container, get_game_service, get_user_service
+from app.main import app
+
+API = "/api/v1"
+# トークンの有効期間（負荷試験中に失効しなければよい）
+TOKEN_TTL_SECONDS = 24 * 3600
+
+
+class LatencyRecorder:
+    """エンドポイント（メソッド + パステンプレート）ごとのレイテンシ・エラー数"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, endpoint: str, seconds: float, ok: bool) -> None:
+        self.latencies.setdefault(endpoint, []).append(seconds)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def report(self, elapsed: float) -> Dict[str, Dict[str, Any]]:
+        """エンドポイントごとの集計結果"""
+        return {
+            endpoint: {
+                "count": len(samples),
+                "errors": self.errors.get(endpoint, 0),
+                "throughput_rps": round(len(samples) / elapsed, 1),
+                **latency_summary(samples),
+            }
+            for endpoint, samples in sorted(self.latencies.items())
+        }
+
+
+def percentile(sorted_samples: List[float], q: float) -> float:
+    """パーセンタイル（nearest-rank法）"""
+    rank = max(int(-(-q * len(sorted_samples) // 100)), 1)
+    return sorted_samples[rank - 1]
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    """レイテンシの平均・p50/p95/p99・最大（ミリ秒）"""
+    ordered = sorted(samples)
+    return {
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def remove_sqlite_files() -> None:
+    """負荷試験用のSQLiteデータベース（WAL・共有メモリファイルを含む）を削除"""
+    for suffix in ("", "-wal", "-shm"):
+        path = settings.sqlite_path + suffix
+        if os.path.exists(path):
+            os.remove(path)
+
+
+async def call(
+    client: httpx.AsyncClient,
+    recorder: LatencyRecorder,
+    endpoint: str,
+    method: str,
+    url: str,
+    **kwargs: Any
+) -> httpx.Response:
+    """リクエストを送信してレイテンシを記録（4xx/5xx・success=false はエラー扱い）"""
+    start = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    ok = response.status_code < 400
+    if ok and response.status_code != 304:
+        ok = response.json().get("success", False)
+    recorder.record(endpoint, elapsed, ok)
+    return response
+
+
+async def run_bowler(
+    client: httpx.AsyncClient,
+    recorder: LatencyRecorder,
+    token: str,
+    games: int,
+    rng: random.Random
+) -> None:
+    """1人のボウラーのセッション（プロフィール取得後、games ゲームを投球）"""
+    headers = {"Authorization": f"Bearer {token}"}
+    await call(client, recorder, "GET /users/profile", "GET", f"{API}/users/profile", headers=headers)
+
+    for _ in range(games):
+        response = await call(client, recorder, "POST /games/create", "POST", f"{API}/games/create", headers=headers)
+        game_id = response.json()["data"]["id"]
+
+        for frame_index, rolls in enumerate(random_rolls(rng)):
+            for pin_count in rolls:
+                await call(
+                    client, recorder, "POST /games/{game_id}/roll", "POST", f"{API}/games/{game_id}/roll",
+                    headers=headers, json={"frame_number": frame_index + 1, "pin_count": pin_count}
+                )
+
+        await call(client, recorder, "GET /games/{game_id}", "GET", f"{API}/games/{game_id}", headers=headers)
+
+        # 履歴画面の表示と、変更がない状態での再検証
+        history = await call(client, recorder, "GET /games/history", "GET", f"{API}/games/history", headers=headers)
+        etag = history.headers.get("etag")
+        if etag:
+            await call(
+                client, recorder, "GET /games/history (If-None-Match)", "GET", f"{API}/games/history",
+                headers={**headers, "If-None-Match": etag}
+            )
+
+        await call(client, recorder, "GET /games/statistics", "GET", f"{API}/games/statistics", headers=headers)
+
+
+async def run(bowlers: int, games: int, concurrency: int, storage: str, seed: int) -> Dict[str, Any]:
+    """負荷試験を実行"""
+    if bowlers > settings.token_cache_max_size:
+        raise ValueError("bowlers must not exceed APP_TOKEN_CACHE_MAX_SIZE")
+    if storage == "sqlite":
+        remove_sqlite_files()
+
+    container = create_container(storage)
+    app.dependency_overrides[get_user_service] = lambda: container.user_service
+    app.dependency_overrides[get_game_service] = lambda: container.game_service
+
+    # 検証済みトークンとして登録し、Firebaseへの問い合わせを行わない
+    expires_at = time.time() + TOKEN_TTL_SECONDS
+    tokens = []
+    for index in range(bowlers):
+        token = f"load-test-token-{seed}-{index}"
+        firebase_auth.token_cache.set(token, {
+            "uid": f"load-test-{index}",
+            "email": f"bowler{index}@example.com",
+            "name": f"Bowler {index}",
+            "exp": expires_at,
+        })
+        tokens.append(token)
+
+    recorder = LatencyRecorder()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def session(index: int, client: httpx.AsyncClient) -> None:
+        async with semaphore:
+            await run_bowler(client, recorder, tokens[index], games, random.Random(seed * 1_000_003 + index))
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            start = time.perf_counter()
+            await asyncio.gather(*(session(index, client) for index in range(bowlers)))
+            elapsed = time.perf_counter() - start
+    finally:
+        app.dependency_overrides.pop(get_user_service, None)
+        app.dependency_overrides.pop(get_game_service, None)
+        container.close()
+        if storage == "sqlite":
+            remove_sqlite_files()
+
+    all_samples = [sample for samples in recorder.latencies.values() for sample in samples]
+    return {
+        "config": {
+            "bowlers": bowlers,
+            "games_per_bowler": games,
+            "concurrency": concurrency,
+            "storage": storage,
+            "seed": seed,
+            "rate_limit_enabled": settings.rate_limit_enabled,
+            "compression_enabled": settings.compression_enabled,
+        },
+        "duration_sec": round(elapsed, 3),
+        "requests": len(all_samples),
+        "errors": sum(recorder.errors.values()),
+        "throughput_rps": round(len(all_samples) / elapsed, 1),
+        "latency": latency_summary(all_samples),
+        "endpoints": recorder.report(elapsed),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """メイン処理（エラーが1件でもあれば終了コード1）"""
+    parser = argparse.ArgumentParser(description="API負荷試験")
+    parser.add_argument("--bowlers", type=int, default=200)
+    parser.add_argument("--games", type=int, default=3, help="ボウラー1人あたりのゲーム数")
+    parser.add_argument("--concurrency", type=int, default=50, help="同時に投球するボウラー数")
+    parser.add_argument("--storage", choices=["memory", "sqlite"], default="memory")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="結果JSONの出力先（省略時は標準出力のみ）")
+    args = parser.parse_args(argv)
+
+    # ログ出力の時間を計測に含めない
+    logging.disable(logging.WARNING)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    report = asyncio.run(run(args.bowlers, args.games, args.concurrency, args.storage, args.seed))
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+ゲーム保存形式マイグレーションスクリプト
+
+games コレクションのドキュメントを、フレームマップ（frames）形式から
+ロール文字列（roll_string）形式に書き換えます。--format frames を指定すると
+逆方向（ロールバック）に書き換えます。アプリケーションは移行期間中も
+両形式を読み取れるため、稼働中に実行できます。
+
+各ドキュメントは読み取り時の update_time を前提条件として書き込むため、
+読み取り後にアプリケーションからロールが追加されたドキュメントは上書きせず、
+読み直して変換し直します（MAX_RETRIES 回まで。超えた場合は失敗として数えます）。
+
+使用方法:
+    # 変更対象の件数のみ確認
+    python scripts/migrate_game_storage.py --dry-run
+
+    # ロール文字列形式に移行
+    python scripts/migrate_game_storage.py
+
+    # フレームマップ形式に戻す
+    python scripts/migrate_game_storage.py --format frames
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from google.api_core import exceptions
+from google.cloud import firestore
+
+from app.auth.firebase import firebase_auth  # noqa: F401  Firebase Admin SDKを初期化
+from app.dependencies import get_firestore_client
+from app.models.game import Frame
+from app.utils.roll_codec import encode_frames, expand_frames
+
+# Firestoreのバッチ書き込み上限（500）以下
+BATCH_SIZE = 400
+# 競合（読み取り後の更新）時に読み直して変換し直す回数
+MAX_RETRIES = 3
+
+
+def convert(data: dict, target_format: str):
+    """ドキュメントを目的の形式に変換する更新内容を返す（変換不要ならNone）"""
+    if target_format == "compact":
+        if "roll_string" in data:
+            return None
+        frames = [Frame(**frame) for frame in data.get("frames", [])]
+        return {"roll_string": encode_frames(frames), "frames": firestore.DELETE_FIELD}
+
+    if "roll_string" not in data:
+        return None
+    frames = expand_frames(data["roll_string"])
+    return {
+        "frames": [frame.dict() for frame in frames],
+        "roll_string": firestore.DELETE_FIELD
+    }
+
+
+def update_with_retry(db: firestore.Client, doc, target_format: str, update: dict) -> int:
+    """1件を前提条件付きで書き込み、競合した回数を返す（MAX_RETRIES を超えたら例外）"""
+    conflicts = 0
+    while True:
+        try:
+            doc.reference.update(update, option=db.write_option(last_update_time=doc.update_time))
+            return conflicts
+        except exceptions.FailedPrecondition:
+            conflicts += 1
+            if conflicts > MAX_RETRIES:
+                raise
+            # 読み取り後に更新されたため、最新のドキュメントで変換し直す
+            doc = doc.reference.get()
+            update = convert(doc.to_dict(), target_format) if doc.exists else None
+            if update is None:
+                return conflicts
+
+
+def migrate(target_format: str, dry_run: bool) -> tuple:
+    """全ゲームを走査して変換し、(走査件数, 変換件数, 競合件数, 失敗件数) を返す
+
+    ページ単位でバッチ書き込みし、前提条件（update_time）の不一致でバッチが
+    失敗した場合は、そのページを1件ずつ書き込み直す。
+    """
+    db = get_firestore_client()
+    collection = db.collection("games")
+
+    scanned = converted = conflicts = failed = 0
+    last_doc = None
+    while True:
+        query = collection.order_by("__name__").limit(BATCH_SIZE)
+        if last_doc is not None:
+            query = query.start_after(last_doc)
+        docs = query.get()
+        if not docs:
+            break
+
+        pending = []
+        for doc in docs:
+            scanned += 1
+            try:
+                update = convert(doc.to_dict(), target_format)
+            except Exception as e:
+                failed += 1
+                print(f"❌ {doc.id}: {e}")
+                continue
+            if update is not None:
+                pending.append((doc, update))
+
+        if pending and not dry_run:
+            batch = db.batch()
+            for doc, update in pending:
+                batch.update(doc.reference, update, option=db.write_option(last_update_time=doc.update_time))
+            try:
+                batch.commit()
+                converted += len(pending)
+            except exceptions.FailedPrecondition:
+                # ページ内のいずれかが読み取り後に更新された（バッチ全体が未反映）
+                for doc, update in pending:
+                    try:
+                        conflicts += update_with_retry(db, doc, target_format, update)
+                        converted += 1
+                    except Exception as e:
+                        failed += 1
+                        print(f"❌ {doc.id}: {e}")
+        else:
+            converted += len(pending)
+
+        print(f"🔄 scanned={scanned} converted={converted} conflicts={conflicts} failed={failed}")
+        last_doc = docs[-1]
+
+    return scanned, converted, conflicts, failed
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="ゲームの保存形式を変換します")
+    parser.add_argument(
+        "--format",
+        choices=["compact", "frames"],
+        default="compact",
+        help="変換後の形式（compact: ロール文字列 / frames: フレームマップ）"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="書き込みを行わずに件数のみ表示")
+    args = parser.parse_args()
+
+    scanned, converted, conflicts, failed = migrate(args.format, args.dry_run)
+
+    action = "変換対象" if args.dry_run else "変換済み"
+    print(f"✅ 走査: {scanned}件 / {action}: {converted}件 / 競合による再変換: {conflicts}件 / 失敗: {failed}件")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
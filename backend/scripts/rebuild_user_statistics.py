@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+ユーザー統計ドキュメント再構築スクリプト
+
+完了済みゲームを集計し、user_statistics コレクションの統計ドキュメントを
+作成し直します。既存ユーザーのバックフィルや、統計の不整合修正に使用します。
+
+使用方法:
+    # 完了ゲームを持つ全ユーザーを再構築
+    python scripts/rebuild_user_statistics.py
+
+    # 特定ユーザーのみ再構築
+    python scripts/rebuild_user_statistics.py --uid <firebase_uid> [--uid <firebase_uid> ...]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.auth.firebase import firebase_auth  # noqa: F401  Firebase Admin SDKを初期化
+from app.dependencies import get_firestore_client
+from app.repositories.game_repository import GameRepository
+from app.utils.executor import run_blocking, shutdown_executor
+
+
+async def collect_user_ids(game_repo: GameRepository) -> list:
+    """完了ゲームを持つユーザーIDを収集"""
+    query = game_repo.db.collection(game_repo.collection).where(
+        field_path="status",
+        op_string="==",
+        value="completed"
+    ).select(["user_id"])
+    docs = await run_blocking(query.get)
+    return sorted({doc.get("user_id") for doc in docs if doc.get("user_id")})
+
+
+async def rebuild(uids: list) -> int:
+    """統計ドキュメントを再構築し、失敗件数を返す"""
+    game_repo = GameRepository(get_firestore_client())
+
+    if not uids:
+        print("🔍 完了ゲームを持つユーザーを検索中...")
+        uids = await collect_user_ids(game_repo)
+    print(f"📊 対象ユーザー数: {len(uids)}")
+
+    failures = 0
+    for uid in uids:
+        try:
+            statistics = await game_repo.rebuild_user_statistics(uid)
+            print(
+                f"✅ {uid}: {statistics['completed_games']} games, "
+                f"average {statistics['average_score']}"
+            )
+        except Exception as e:
+            failures += 1
+            print(f"❌ {uid}: {e}")
+
+    return failures
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="ユーザー統計ドキュメントを再構築します")
+    parser.add_argument(
+        "--uid",
+        action="append",
+        default=[],
+        help="再構築するユーザーのFirebase UID（複数指定可、省略時は全ユーザー）"
+    )
+    args = parser.parse_args()
+
+    try:
+        failures = asyncio.run(rebuild(args.uid))
+    finally:
+        shutdown_executor()
+
+    if failures:
+        print(f"⚠️  {failures}件のユーザーで再構築に失敗しました")
+        sys.exit(1)
+    print("🎉 再構築が完了しました")
+
+
+if __name__ == "__main__":
+    main()
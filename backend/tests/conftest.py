@@ -2,6 +2,8 @@
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import Mock, patch
+from app.auth.dependencies import get_current_user
+from app.dependencies import create_container, get_game_service, get_user_service
 from app.main import app
 
 
@@ -17,6 +19,31 @@ def mock_firestore():
     return Mock()
 
 
+@pytest.fixture
+def memory_container():
+    """インメモリストレージのサービスに差し替えたコンテナ"""
+    container = create_container("memory")
+    app.dependency_overrides[get_user_service] = lambda: container.user_service
+    app.dependency_overrides[get_game_service] = lambda: container.game_service
+    yield container
+    app.dependency_overrides.pop(get_user_service, None)
+    app.dependency_overrides.pop(get_game_service, None)
+    container.close()
+
+
+@pytest.fixture
+def authenticated_user(sample_user_data):
+    """認証済みユーザー（Firebaseトークン検証を差し替え）"""
+    decoded_token = {
+        "uid": sample_user_data["uid"],
+        "email": sample_user_data["email"],
+        "name": sample_user_data["display_name"],
+    }
+    app.dependency_overrides[get_current_user] = lambda: decoded_token
+    yield decoded_token
+    app.dependency_overrides.pop(get_current_user, None)
+
+
 @pytest.fixture
 def mock_firebase_auth():
     """Firebase認証モック"""
@@ -0,0 +1,72 @@
+"""テスト用のゲームデータ生成"""
+from typing import List, Tuple
+
+
+def legal_frames() -> List[List[int]]:
+    """1-9フレームの全パターン（66通り）"""
+    frames = [[10]]
+    for first in range(10):
+        for second in range(11 - first):
+            frames.append([first, second])
+    return frames
+
+
+def legal_tenth_frames() -> List[List[int]]:
+    """10フレーム目の全パターン"""
+    frames = []
+    for first in range(11):
+        for second in range(11 if first == 10 else 11 - first):
+            if first == 10 or first + second == 10:
+                # ストライク・スペアの場合は3投目あり
+                if first == 10 and second < 10:
+                    thirds = range(11 - second)
+                else:
+                    thirds = range(11)
+                for third in thirds:
+                    frames.append([first, second, third])
+            else:
+                frames.append([first, second])
+    return frames
+
+
+def reference_score(frame_rolls: List[List[int]]) -> Tuple[List[dict], int, bool]:
+    """全フレームを再計算する参照実装（フレームの値・合計スコア・ゲーム完了を返す）
+
+    次フレームが非ストライクの1投のみの場合、ストライクのボーナスを
+    2投目まで加算しない挙動を含む。
+    """
+    frame_rolls = [list(rolls) for rolls in frame_rolls] + [[] for _ in range(10 - len(frame_rolls))]
+    frames = []
+    for index, rolls in enumerate(frame_rolls):
+        is_strike = rolls[:1] == [10]
+        if index < 9:
+            is_spare = len(rolls) == 2 and sum(rolls) == 10
+            is_completed = is_strike or len(rolls) == 2
+        else:
+            is_spare = len(rolls) >= 2 and rolls[0] + rolls[1] == 10
+            is_completed = len(rolls) == 3 or (len(rolls) == 2 and not is_strike and not is_spare)
+        frames.append({
+            "number": index + 1, "rolls": rolls, "score": 0,
+            "is_strike": is_strike, "is_spare": is_spare, "is_completed": is_completed,
+        })
+
+    total = 0
+    for index, frame in enumerate(frames):
+        score = sum(frame["rolls"])
+        if index < 9 and frame["is_strike"]:
+            if index == 8:
+                score += sum(frame_rolls[9][:2])
+            else:
+                next_rolls = frame_rolls[index + 1]
+                if len(next_rolls) >= 2:
+                    score += next_rolls[0] + next_rolls[1]
+                elif len(next_rolls) == 1 and frames[index + 1]["is_strike"]:
+                    score += next_rolls[0] + sum(frame_rolls[index + 2][:1])
+        elif index < 9 and frame["is_spare"]:
+            score += sum(frame_rolls[index + 1][:1])
+        total += score
+        frame["score"] = total
+
+    tenth = frames[9]
+    game_completed = len(tenth["rolls"]) >= (3 if tenth["is_strike"] or tenth["is_spare"] else 2)
+    return frames, total, game_completed
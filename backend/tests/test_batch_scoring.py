@@ -0,0 +1,44 @@
+"""一括スコア計算ユーティリティのテスト"""
+import random
+import pytest
+from app.utils.batch_scoring import frames_to_roll_row, score_roll_matrix
+from app.utils.scoring import IncrementalScorer
+from tests.helpers import legal_frames, legal_tenth_frames
+
+
+def _random_games(count: int, seed: int = 20251005):
+    """ランダムな完了ゲーム（フレームごとのロール）"""
+    rng = random.Random(seed)
+    frames = legal_frames()
+    tenth_frames = legal_tenth_frames()
+    return [
+        [rng.choice(frames) for _ in range(9)] + [rng.choice(tenth_frames)]
+        for _ in range(count)
+    ]
+
+
+def _expected(game_frames):
+    """IncrementalScorerによる期待値"""
+    scorer = IncrementalScorer()
+    for frame_index, rolls in enumerate(game_frames):
+        for pin_count in rolls:
+            scorer.add_roll(frame_index, pin_count)
+    return scorer.to_frames()
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_batch_scores_match_scoring_engine(use_numpy):
+    """一括計算の結果が1ゲームずつの計算と一致すること"""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    games = _random_games(300) + [[[10]] * 9 + [[10, 10, 10]], [[0, 0]] * 10]
+    expected = [_expected(game) for game in games]
+    matrix = [frames_to_roll_row(frames) for frames in expected]
+
+    result = score_roll_matrix(matrix, use_numpy=use_numpy)
+
+    for i, frames in enumerate(expected):
+        assert [int(score) for score in result.frame_scores[i]] == [f.score for f in frames]
+        assert [bool(flag) for flag in result.is_strike[i]] == [f.is_strike for f in frames]
+        assert [bool(flag) for flag in result.is_spare[i]] == [f.is_spare for f in frames]
+    assert result.total_scores[-2:] == [300, 0]
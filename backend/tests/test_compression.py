@@ -0,0 +1,88 @@
+"""レスポンス圧縮のテスト"""
+import gzip
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from app.middleware.compression import CompressionMiddleware, available_encodings, select_encoding
+
+LARGE_PAYLOAD = {"games": [{"frame": i, "rolls": [10, 0]} for i in range(200)]}
+
+
+def test_select_encoding():
+    """q値とサーバーの優先順で圧縮方式を選択すること"""
+    assert select_encoding("gzip, deflate, br", ["br", "gzip"]) == "br"
+    assert select_encoding("gzip;q=1.0, br;q=0.5", ["br", "gzip"]) == "gzip"
+    assert select_encoding("br;q=0, *", ["br", "gzip"]) == "gzip"
+    assert select_encoding("identity", ["br", "gzip"]) is None
+    assert select_encoding(None, ["gzip"]) is None
+
+
+def test_available_encodings_rejects_unknown():
+    """未対応の圧縮方式はエラーになること"""
+    assert "gzip" in available_encodings(["br", "gzip"])
+    with pytest.raises(ValueError):
+        available_encodings(["zstd"])
+
+
+def _client(**options) -> TestClient:
+    async def large(request):
+        return JSONResponse(LARGE_PAYLOAD, headers={"ETag": '"v1"'})
+
+    async def small(request):
+        return JSONResponse({"status": "healthy"})
+
+    async def stream(request):
+        async def chunks():
+            for _ in range(3):
+                yield b"x" * 1000
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    async def image(request):
+        return PlainTextResponse(b"\x00" * 4096, media_type="image/png")
+
+    app = Starlette(routes=[
+        Route("/large", large),
+        Route("/health", large),
+        Route("/small", small),
+        Route("/stream", stream),
+        Route("/image", image),
+    ])
+    options.setdefault("encodings", ["gzip"])
+    return TestClient(CompressionMiddleware(app, minimum_size=500, exempt_paths=["/health"], **options))
+
+
+def test_large_response_is_compressed():
+    """閾値以上のJSONはgzipで圧縮し、ETagを弱いETagにすること"""
+    client = _client()
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"v1"'
+    assert response.json() == LARGE_PAYLOAD
+    assert int(response.headers["content-length"]) < len(response.content)
+
+
+def test_uncompressed_responses():
+    """閾値未満・除外パス・非対応クライアント・対象外のContent-Typeは圧縮しないこと"""
+    client = _client()
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/health", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/image", headers={"Accept-Encoding": "gzip"}).headers
+
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"v1"'
+
+
+def test_streaming_response_is_compressed():
+    """ストリーミングレスポンスを逐次圧縮すること"""
+    client = _client()
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw) == b"x" * 3000
@@ -0,0 +1,98 @@
+"""ETag・条件付きGETのテスト"""
+from datetime import datetime, timezone
+import pytest
+from fastapi.testclient import TestClient
+from app.auth.dependencies import get_current_user
+from app.dependencies import get_game_service
+from app.main import app
+from app.utils.etag import etag_matches, game_etag, history_etag
+from app.utils.game_state import GameState
+from app.utils.scoring import IncrementalScorer
+
+UPDATED_AT = datetime(2024, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+
+
+def test_game_etag_changes_with_updated_at():
+    """updated_at が変わるとETagが変わること（表現の違いは無視）"""
+    etag = game_etag("game-1", UPDATED_AT)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == game_etag("game-1", UPDATED_AT.replace(tzinfo=None))
+    assert etag != game_etag("game-1", UPDATED_AT.replace(microsecond=123457))
+    assert etag != game_etag("game-2", UPDATED_AT)
+
+
+def test_history_etag_depends_on_page():
+    """ページ内のゲーム・件数・次ページの有無でETagが変わること"""
+    versions = [("game-1", UPDATED_AT), ("game-2", UPDATED_AT)]
+    etag = history_etag(versions, 2, 20, 0, False)
+    assert etag == history_etag(list(versions), 2, 20, 0, False)
+    assert etag != history_etag(versions[:1], 2, 20, 0, False)
+    assert etag != history_etag(versions, 3, 20, 0, False)
+    assert etag != history_etag(versions, 2, 20, 0, True)
+
+
+def test_etag_matches():
+    """If-None-Match のリスト・弱いETag・* に対応すること"""
+    etag = '"abc"'
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('"x", W/"abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"x"', etag)
+    assert not etag_matches(None, etag)
+
+
+class _GameService:
+    """ゲーム本体の読み込み回数を記録するサービス"""
+
+    def __init__(self):
+        self.game_reads = 0
+
+    async def get_game_etag(self, game_id, user_id):
+        return game_etag(game_id, UPDATED_AT)
+
+    async def get_game(self, game_id, user_id):
+        self.game_reads += 1
+        return GameState(
+            id=game_id,
+            user_id=user_id,
+            scorer=IncrementalScorer(),
+            total_score=0,
+            status="playing",
+            played_at=UPDATED_AT,
+            created_at=UPDATED_AT,
+            updated_at=UPDATED_AT
+        )
+
+
+@pytest.fixture
+def game_service():
+    service = _GameService()
+    app.dependency_overrides[get_current_user] = lambda: {"uid": "uid-1"}
+    app.dependency_overrides[get_game_service] = lambda: service
+    yield service
+    app.dependency_overrides.clear()
+
+
+def test_get_game_conditional(client: TestClient, game_service):
+    """ETagが一致する場合はゲームを読み込まずに304を返すこと"""
+    response = client.get("/api/v1/games/game-1", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag == game_etag("game-1", UPDATED_AT)
+
+    response = client.get("/api/v1/games/game-1", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+    assert game_service.game_reads == 1
+
+    # 圧縮レスポンスの弱いETagでも一致と判定すること
+    compressed = client.get("/api/v1/games/game-1", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["etag"] == f"W/{etag}"
+    response = client.get("/api/v1/games/game-1", headers={"If-None-Match": compressed.headers["etag"]})
+    assert response.status_code == 304
+    assert game_service.game_reads == 2
+
+    response = client.get("/api/v1/games/game-1", headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+    assert game_service.game_reads == 3
@@ -0,0 +1,29 @@
+"""ブロッキング処理実行ユーティリティのテスト"""
+import threading
+import pytest
+from app.utils.executor import AUTH_POOL, get_executor, run_blocking, run_blocking_in
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_runs_off_event_loop_thread():
+    """ブロッキング関数がイベントループ外のスレッドで実行されること"""
+    loop_thread = threading.get_ident()
+    worker_thread = await run_blocking(threading.get_ident)
+    assert worker_thread != loop_thread
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_passes_arguments():
+    """位置引数・キーワード引数が渡されること"""
+    result = await run_blocking(sorted, [3, 1, 2], reverse=True)
+    assert result == [3, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_auth_pool_is_separate_from_firestore_pool():
+    """認証用プールがFirestore用プールと別スレッドで実行されること"""
+    firestore_thread = await run_blocking(lambda: threading.current_thread().name)
+    auth_thread = await run_blocking_in(AUTH_POOL, lambda: threading.current_thread().name)
+    assert firestore_thread.startswith("firestore-io")
+    assert auth_thread.startswith("auth-io")
+    assert get_executor(AUTH_POOL) is not get_executor()
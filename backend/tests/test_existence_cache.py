@@ -0,0 +1,48 @@
+"""存在確認キャッシュのテスト"""
+from unittest.mock import patch
+from app.utils.existence_cache import ExistenceCache
+
+
+def test_add_and_discard():
+    """追加したキーが存在し、無効化後は存在しないこと"""
+    cache = ExistenceCache(max_size=10, ttl_seconds=60)
+    assert not cache.contains("uid-1")
+
+    cache.add("uid-1")
+    assert cache.contains("uid-1")
+
+    cache.discard("uid-1")
+    assert not cache.contains("uid-1")
+    cache.discard("uid-1")
+
+
+def test_expiry():
+    """有効期間を過ぎたキーは存在しないこと"""
+    cache = ExistenceCache(max_size=10, ttl_seconds=60)
+    with patch("app.utils.existence_cache.time.monotonic", return_value=1000.0):
+        cache.add("uid-1")
+    with patch("app.utils.existence_cache.time.monotonic", return_value=1059.0):
+        assert cache.contains("uid-1")
+    with patch("app.utils.existence_cache.time.monotonic", return_value=1061.0):
+        assert not cache.contains("uid-1")
+    assert len(cache) == 0
+
+
+def test_lru_eviction():
+    """上限を超えると最も古く参照されたキーから破棄されること"""
+    cache = ExistenceCache(max_size=2, ttl_seconds=60)
+    cache.add("a")
+    cache.add("b")
+    assert cache.contains("a")
+    cache.add("c")
+
+    assert cache.contains("a")
+    assert not cache.contains("b")
+    assert cache.contains("c")
+
+
+def test_disabled():
+    """上限0の場合はキャッシュしないこと"""
+    cache = ExistenceCache(max_size=0, ttl_seconds=60)
+    cache.add("a")
+    assert not cache.contains("a")
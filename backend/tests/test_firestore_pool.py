@@ -0,0 +1,45 @@
+"""Firestoreクライアントプールのテスト"""
+from unittest.mock import Mock
+import pytest
+from app.dependencies import ServiceContainer
+from app.repositories.game_repository import GameRepository
+from app.repositories.user_repository import UserRepository
+from app.utils.firestore_pool import FirestoreClientPool
+
+
+def test_round_robin():
+    """クライアントがラウンドロビンで選択されること"""
+    clients = [Mock(), Mock(), Mock()]
+    pool = FirestoreClientPool(clients)
+
+    assert [pool.client() for _ in range(6)] == clients * 2
+
+    pool.collection("games")
+    pool.batch()
+    pool.transaction()
+    clients[0].collection.assert_called_once_with("games")
+    clients[1].batch.assert_called_once_with()
+    clients[2].transaction.assert_called_once_with()
+
+
+def test_close_all_clients():
+    """全クライアントが閉じられること"""
+    clients = [Mock(), Mock()]
+    FirestoreClientPool(clients).close()
+    for client in clients:
+        client.close.assert_called_once_with()
+
+
+def test_empty_pool():
+    """クライアントが無いプールは作成できないこと"""
+    with pytest.raises(ValueError):
+        FirestoreClientPool([])
+
+
+def test_container_shares_repositories():
+    """サービスが同じリポジトリを共有すること"""
+    pool = FirestoreClientPool([Mock()])
+    container = ServiceContainer(pool, UserRepository(pool), GameRepository(pool))
+    assert container.game_service.user_repo is container.user_repository
+    assert container.user_service.user_repo is container.user_repository
+    assert container.game_service.game_repo is container.game_repository
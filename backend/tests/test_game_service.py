@@ -0,0 +1,115 @@
+"""ゲームサービスのテスト"""
+from datetime import datetime
+import pytest
+from app.config import settings
+from app.exceptions import GameCompletedError, InvalidRollError, ValidationError
+from app.models.game import CompletedGameRequest, RollRequest
+from app.services.game_service import GameService
+from app.utils.game_state import GameState
+from app.utils.scoring import calculate_score, calculate_batch_score, IncrementalScorer
+
+
+def _new_game() -> GameState:
+    """進行中の新規ゲーム"""
+    now = datetime.now()
+    return GameState(
+        id="game_1",
+        user_id="user_1",
+        scorer=IncrementalScorer(),
+        total_score=0,
+        status="playing",
+        played_at=now,
+        created_at=now,
+        updated_at=now,
+        expire_at=now
+    )
+
+
+def _roll(game: GameState, frame_number: int, pin_count: int) -> GameState:
+    """検証してからロールを適用"""
+    roll = RollRequest(frame_number=frame_number, pin_count=pin_count)
+    return calculate_score(game, roll, validate=GameService._validate_roll)
+
+
+def test_validate_roll_accepts_open_first_roll():
+    """ストライク以外の1投目を受け付けること"""
+    game = _roll(_new_game(), 1, 7)
+    game = _roll(game, 1, 2)
+    assert game.scorer.is_frame_completed(0)
+    assert game.total_score == 9
+
+
+def test_validate_roll_rejects_too_many_pins():
+    """フレーム内の合計ピン数が10を超えるロールを拒否すること"""
+    game = _roll(_new_game(), 1, 7)
+    with pytest.raises(InvalidRollError):
+        _roll(game, 1, 4)
+
+
+def test_validate_roll_rejects_completed_game():
+    """完了済みゲームへのロールを拒否すること"""
+    game = _new_game()
+    for frame_number in range(1, 10):
+        game = _roll(game, frame_number, 10)
+    for _ in range(3):
+        game = _roll(game, 10, 10)
+    assert game.status == "completed"
+    assert game.total_score == 300
+    with pytest.raises(GameCompletedError):
+        _roll(game, 10, 10)
+
+
+def test_batch_rolls_match_sequential_rolls():
+    """一括ロールの結果が1投ずつ追加した場合と一致すること"""
+    pins = [(1, 10), (2, 7), (2, 3), (3, 9), (3, 0), (4, 10), (5, 10), (6, 4), (6, 2)]
+    rolls = [RollRequest(frame_number=f, pin_count=p) for f, p in pins]
+
+    sequential = _new_game()
+    for roll in rolls:
+        sequential = _roll(sequential, roll.frame_number, roll.pin_count)
+
+    batched = calculate_batch_score(_new_game(), rolls, validate=GameService._validate_roll)
+    assert batched.to_frames() == sequential.to_frames()
+    assert batched.total_score == sequential.total_score
+
+
+def test_batch_rolls_validate_each_roll():
+    """一括ロール中の不正なロールで検証エラーになること"""
+    rolls = [RollRequest(frame_number=1, pin_count=8), RollRequest(frame_number=1, pin_count=5)]
+    with pytest.raises(InvalidRollError):
+        calculate_batch_score(_new_game(), rolls, validate=GameService._validate_roll)
+
+
+def _completed_request(**overrides) -> CompletedGameRequest:
+    """ロールのみの完了ゲーム保存リクエスト（9フレームストライク + 10フレーム 9/スペア 10）"""
+    frames = [{"frameNumber": i, "firstRoll": 10} for i in range(1, 10)]
+    frames.append({"frameNumber": 10, "firstRoll": 9, "secondRoll": 1, "thirdRoll": 10})
+    payload = {"gameDate": "2025-10-05T12:00:00Z", "frames": frames}
+    payload.update(overrides)
+    return CompletedGameRequest(**payload)
+
+
+def test_verify_completed_game_from_rolls_only():
+    """ロールのみからスコアシートが再計算されること"""
+    frames, total_score = GameService._verify_completed_game(_completed_request())
+    assert total_score == 279
+    assert frames[0].is_strike and frames[0].score == 30
+    assert frames[9].is_spare and frames[9].is_completed
+
+
+def test_verify_completed_game_mismatch(monkeypatch):
+    """送信スコアの不一致はモードに応じて補正または拒否されること"""
+    request = _completed_request(totalScore=300)
+    _, total_score = GameService._verify_completed_game(request)
+    assert total_score == 279
+
+    monkeypatch.setattr(settings, "score_verification_mode", "reject")
+    with pytest.raises(ValidationError):
+        GameService._verify_completed_game(request)
+
+
+def test_verify_completed_game_rejects_illegal_rolls():
+    """ルールに反するロールを拒否すること"""
+    frames = [{"frameNumber": i, "firstRoll": 7, "secondRoll": 5} for i in range(1, 11)]
+    with pytest.raises(InvalidRollError):
+        GameService._verify_completed_game(CompletedGameRequest(gameDate="2025-10-05T12:00:00Z", frames=frames))
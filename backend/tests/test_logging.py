@@ -0,0 +1,65 @@
+"""ログ設定のテスト"""
+import logging
+from unittest.mock import patch
+import pytest
+import structlog
+from app.config import settings
+from app.utils import logging as app_logging
+
+
+@pytest.fixture
+def restore_logging():
+    """テスト後にログ設定を元に戻す"""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    app_logging.shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    structlog.reset_defaults()
+
+
+def test_sample_events():
+    """サンプリング率0のイベントは破棄され、警告以上は破棄されないこと"""
+    with patch.object(settings, "log_sample_rates", {"roll_added": 0.0}):
+        with pytest.raises(structlog.DropEvent):
+            app_logging._sample_events(None, "info", {"event": "roll_added"})
+        assert app_logging._sample_events(None, "warning", {"event": "roll_added"})
+        assert app_logging._sample_events(None, "info", {"event": "game_created"})
+
+
+def test_route_log_level():
+    """パスの最長一致でルート別ログレベルが選ばれること"""
+    levels = {"/api/v1/games": "WARNING", "/api/v1/games/history": "ERROR"}
+    with patch.object(settings, "log_route_levels", levels):
+        assert app_logging.route_log_level("/api/v1/games/history") == logging.ERROR
+        assert app_logging.route_log_level("/api/v1/games/abc") == logging.WARNING
+        assert app_logging.route_log_level("/health") is None
+
+
+def test_route_level_filter():
+    """ルート別ログレベルがフィルターに適用されること"""
+    context_filter = app_logging.RequestContextFilter(logging.INFO)
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "message", None, None)
+    assert context_filter.filter(record)
+
+    with patch.object(settings, "log_route_levels", {"/api/v1/games": "WARNING"}):
+        with app_logging.bound_route_log_level("/api/v1/games/history"):
+            assert not context_filter.filter(record)
+    assert context_filter.filter(record)
+
+
+def test_async_mode_writes_in_background(restore_logging, capsys):
+    """asyncモードでは構造化ログがバックグラウンドで書き出されること"""
+    with patch.object(settings, "log_mode", "async"), patch.object(settings, "log_format", "json"):
+        app_logging.setup_logging()
+        with structlog.contextvars.bound_contextvars(request_id="req-1"):
+            structlog.get_logger("test").info("async_event", value=1)
+            logging.getLogger("stdlib").info("stdlib %s", "message")
+        app_logging.shutdown_logging()
+
+    output = capsys.readouterr().err
+    assert '"event": "async_event"' in output
+    assert '"value": 1' in output
+    assert '"event": "stdlib message"' in output
+    assert output.count('"request_id": "req-1"') == 2
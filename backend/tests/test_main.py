@@ -31,3 +31,13 @@ def test_redoc_endpoint(client: TestClient):
     """ReDocエンドポイントのテスト"""
     response = client.get("/redoc")
     assert response.status_code == 200
+
+
+def test_metrics_endpoint(client: TestClient):
+    """メトリクスエンドポイントのテスト"""
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
+    assert "http_requests_in_progress" in response.text
@@ -0,0 +1,95 @@
+"""インメモリリポジトリのテスト"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi.testclient import TestClient
+from app.exceptions import GameNotFoundError, InvalidRollError
+from app.models.game import GameCreate, GameHistoryRequest, RollRequest
+from app.models.user import UserCreate
+from app.utils.scoring import create_initial_frames
+
+
+def test_history_index_and_statistics(memory_container):
+    """ステータス別インデックス・キーセットページネーション・統計の差分更新"""
+    repo = memory_container.game_repository
+    base = datetime(2024, 1, 1)
+    created = [
+        asyncio.run(repo.create(GameCreate(
+            user_id="uid-1",
+            total_score=100 + index,
+            frames=create_initial_frames(),
+            status="completed" if index % 2 else "playing",
+            played_at=base + timedelta(days=index)
+        )))
+        for index in range(5)
+    ]
+    asyncio.run(repo.create(GameCreate(user_id="uid-2", frames=create_initial_frames())))
+    expected = [game.id for game in reversed(created)]
+
+    first = asyncio.run(repo.get_user_games("uid-1", GameHistoryRequest(limit=2)))
+    assert first.total == 5
+    assert [g.id for g in first.games] == expected[:2]
+    assert first.games[0].played_at.tzinfo == timezone.utc
+
+    second = asyncio.run(repo.get_user_games("uid-1", GameHistoryRequest(limit=2, cursor=first.next_cursor)))
+    assert [g.id for g in second.games] == expected[2:4]
+    last = asyncio.run(repo.get_user_games("uid-1", GameHistoryRequest(limit=2, offset=4)))
+    assert [g.id for g in last.games] == expected[4:]
+    assert last.next_cursor is None
+
+    completed = asyncio.run(repo.get_user_games("uid-1", GameHistoryRequest(status="completed")))
+    assert [g.total_score for g in completed.games] == [103, 101]
+
+    stats = asyncio.run(repo.get_user_statistics("uid-1"))
+    assert (stats["completed_games"], stats["highest_score"], stats["lowest_score"]) == (2, 103, 101)
+    asyncio.run(repo.delete(created[3].id, "uid-1"))
+    stats = asyncio.run(repo.get_user_statistics("uid-1"))
+    assert (stats["completed_games"], stats["highest_score"]) == (1, 101)
+
+    with pytest.raises(GameNotFoundError):
+        asyncio.run(repo.delete(created[0].id, "uid-2"))
+
+
+def test_failed_update_leaves_game_unchanged(memory_container):
+    """検証エラーで更新が中断された場合にゲームが変更されないこと"""
+    asyncio.run(memory_container.user_repository.create(
+        UserCreate(uid="uid-1", email="test@example.com", display_name="Test")
+    ))
+    service = memory_container.game_service
+    game = asyncio.run(service.create_game("uid-1"))
+    asyncio.run(service.add_roll(game.id, "uid-1", RollRequest(frame_number=1, pin_count=7)))
+
+    with pytest.raises(InvalidRollError):
+        asyncio.run(service.add_roll(game.id, "uid-1", RollRequest(frame_number=1, pin_count=5)))
+
+    # 一括ロールの途中で検証エラーになった場合も、検証済みのロールを含めて反映しない
+    rolls = [
+        RollRequest(frame_number=1, pin_count=3),
+        RollRequest(frame_number=2, pin_count=8),
+        RollRequest(frame_number=2, pin_count=5),
+    ]
+    with pytest.raises(InvalidRollError):
+        asyncio.run(service.add_rolls(game.id, "uid-1", rolls))
+
+    stored = asyncio.run(service.get_game(game.id, "uid-1"))
+    assert stored.scorer.frame_rolls[0] == [7]
+    assert stored.total_score == 7
+
+
+def test_game_api_end_to_end(client: TestClient, memory_container, authenticated_user):
+    """Firestoreなしでユーザー作成からゲーム完了・履歴・統計までAPIを通して実行できること"""
+    assert client.get("/api/v1/users/profile").json()["data"]["uid"] == authenticated_user["uid"]
+
+    game_id = client.post("/api/v1/games/create").json()["data"]["id"]
+    rolls = [{"frame_number": frame, "pin_count": 10} for frame in range(1, 10)]
+    rolls += [{"frame_number": 10, "pin_count": 10}] * 3
+    game = client.post(f"/api/v1/games/{game_id}/rolls", json={"rolls": rolls}).json()["data"]
+    assert game["status"] == "completed"
+    assert game["total_score"] == 300
+
+    history = client.get("/api/v1/games/history").json()
+    assert [g["id"] for g in history["data"]] == [game_id]
+    assert history["meta"]["total"] == 1
+
+    stats = client.get("/api/v1/games/statistics").json()["data"]
+    assert stats["perfect_games"] == 1
@@ -0,0 +1,38 @@
+"""メトリクス計測のテスト"""
+import asyncio
+import pytest
+from prometheus_client import REGISTRY
+from app.utils.metrics import instrument_repository
+
+
+@instrument_repository("test_repo")
+class _Repository:
+    async def find(self, value):
+        return value
+
+    async def fail(self):
+        raise RuntimeError("boom")
+
+    async def _private(self):
+        return None
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_instrument_repository():
+    """公開コルーチンメソッドの呼び出し回数・処理時間が記録されること"""
+    repo = _Repository()
+    before = _sample("repository_calls_total", repository="test_repo", operation="find", outcome="success")
+
+    assert asyncio.run(repo.find(1)) == 1
+    with pytest.raises(RuntimeError):
+        asyncio.run(repo.fail())
+
+    assert _sample("repository_calls_total", repository="test_repo", operation="find", outcome="success") == before + 1
+    assert _sample("repository_calls_total", repository="test_repo", operation="fail", outcome="error") >= 1
+    assert _sample("repository_call_duration_seconds_count", repository="test_repo", operation="find") >= 1
+    assert _sample("repository_calls_in_progress", repository="test_repo") == 0
+    assert _Repository.find.__name__ == "find"
+    assert _sample("repository_call_duration_seconds_count", repository="test_repo", operation="_private") == 0
@@ -0,0 +1,19 @@
+"""カーソルページネーションユーティリティのテスト"""
+from datetime import datetime, timezone
+import pytest
+from app.exceptions import ValidationError
+from app.utils.pagination import encode_cursor, decode_cursor
+
+
+def test_cursor_round_trip():
+    """エンコードしたカーソルが元の値に復元されること"""
+    played_at = datetime(2025, 10, 5, 12, 0, 0, 123456, tzinfo=timezone.utc)
+    cursor = encode_cursor(played_at, "game_123")
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (played_at, "game_123")
+
+
+def test_invalid_cursor_raises_validation_error():
+    """不正なカーソルはValidationErrorになること"""
+    with pytest.raises(ValidationError):
+        decode_cursor("not-a-cursor")
@@ -0,0 +1,90 @@
+"""レート制限のテスト"""
+import asyncio
+from unittest.mock import patch
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.middleware.rate_limit import RateLimitMiddleware, compile_route_costs
+from app.utils.rate_limit import InMemoryRateLimitBackend, RateLimitBackend
+
+
+def test_token_bucket():
+    """容量を使い切ると再試行までの秒数が返り、時間経過で補充されること"""
+    backend = InMemoryRateLimitBackend(idle_seconds=60)
+    with patch("app.utils.rate_limit.time.monotonic", return_value=100.0):
+        assert asyncio.run(backend.acquire("k", 1, 2, 0.5)) == 0
+        assert asyncio.run(backend.acquire("k", 1, 2, 0.5)) == 0
+        assert asyncio.run(backend.acquire("k", 1, 2, 0.5)) == 2.0
+    with patch("app.utils.rate_limit.time.monotonic", return_value=102.0):
+        assert asyncio.run(backend.acquire("k", 1, 2, 0.5)) == 0
+
+
+def test_backend_requires_acquire():
+    """acquire を実装しないバックエンドはインスタンス化できないこと"""
+    class IncompleteBackend(RateLimitBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteBackend()
+
+
+def test_idle_eviction():
+    """アイドル状態のキーが破棄されること"""
+    backend = InMemoryRateLimitBackend(idle_seconds=60, max_keys=2)
+    with patch("app.utils.rate_limit.time.monotonic", return_value=0.0):
+        asyncio.run(backend.acquire("a", 1, 10, 1.0))
+        asyncio.run(backend.acquire("b", 1, 10, 1.0))
+        asyncio.run(backend.acquire("c", 1, 10, 1.0))
+    assert len(backend) == 2
+    with patch("app.utils.rate_limit.time.monotonic", return_value=61.0):
+        asyncio.run(backend.acquire("d", 1, 10, 1.0))
+    assert len(backend) == 1
+
+
+def test_route_costs():
+    """パスパラメータを含むルートのコストが一致すること"""
+    compiled = compile_route_costs({"POST /api/v1/games/{game_id}/rolls": 5})
+    method, pattern, cost = compiled[0]
+    assert method == "POST" and cost == 5
+    assert pattern.match("/api/v1/games/abc123/rolls")
+    assert not pattern.match("/api/v1/games/abc123/roll")
+
+
+def test_middleware_returns_429():
+    """上限を超えると429とRetry-Afterを返し、対象外のパスは制限しないこと"""
+    app = FastAPI()
+
+    @app.get("/limited")
+    async def limited():
+        return {"success": True}
+
+    @app.get("/health")
+    async def health():
+        return {"success": True}
+
+    with patch("app.middleware.rate_limit.settings.rate_limit_calls", 2), \
+            patch("app.middleware.rate_limit.settings.rate_limit_period", 60):
+        app.add_middleware(RateLimitMiddleware, backend=InMemoryRateLimitBackend(idle_seconds=60))
+        client = TestClient(app)
+        assert client.get("/limited").status_code == 200
+        assert client.get("/limited").status_code == 200
+
+        response = client.get("/limited")
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "30"
+        assert response.json()["error"]["code"] == "RATE_LIMIT_EXCEEDED"
+
+        assert client.get("/health").status_code == 200
+
+
+def test_authenticated_uid_key():
+    """検証済みトークンはUID、それ以外はIPをキーにすること"""
+    scope = {
+        "type": "http",
+        "headers": [(b"authorization", b"Bearer token-1")],
+        "client": ("10.0.0.1", 1234),
+    }
+    with patch("app.middleware.rate_limit.firebase_auth.token_cache.get", return_value={"uid": "uid-1"}):
+        assert RateLimitMiddleware._client_key(scope) == "uid:uid-1"
+    with patch("app.middleware.rate_limit.firebase_auth.token_cache.get", return_value=None):
+        assert RateLimitMiddleware._client_key(scope) == "ip:10.0.0.1"
@@ -0,0 +1,88 @@
+"""リポジトリの書き込みテスト（Firestoreはモック）"""
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+from app.models.game import GameCreate
+from app.models.user import UserCreate, UserSchema, UserUpdate
+from app.repositories.game_repository import GameRepository
+from app.repositories.user_repository import UserRepository
+from app.utils.scoring import create_initial_frames
+from app.utils.statistics import STATISTICS_VERSION
+
+UPDATE_TIME = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _mock_db() -> MagicMock:
+    """書き込み結果に update_time を返すFirestoreモック"""
+    db = MagicMock()
+    doc_ref = db.collection.return_value.document.return_value
+    doc_ref.id = "doc-1"
+    for method in (doc_ref.set, doc_ref.create, doc_ref.update):
+        method.return_value.update_time = UPDATE_TIME
+    return db
+
+
+def test_game_create_without_reread():
+    """ゲーム作成時に再読み取りせず書き込み時刻を返すこと"""
+    db = _mock_db()
+    game_data = GameCreate(user_id="uid-1", frames=create_initial_frames())
+
+    game = asyncio.run(GameRepository(db).create(game_data))
+
+    doc_ref = db.collection.return_value.document.return_value
+    doc_ref.get.assert_not_called()
+    assert game.id == "doc-1"
+    assert game.created_at == UPDATE_TIME
+    assert game.updated_at == UPDATE_TIME
+    assert len(game.to_response().frames) == 10
+
+
+def test_user_create_and_update_without_reread():
+    """ユーザー作成・更新時に再読み取りしないこと"""
+    db = _mock_db()
+    repo = UserRepository(db)
+    user = asyncio.run(repo.create(
+        UserCreate(uid="uid-1", email="test@example.com", display_name="Test")
+    ))
+    assert user.id == "uid-1"
+    assert user.created_at == UPDATE_TIME
+
+    current = UserSchema(**{**user.model_dump(), "updated_at": datetime(2023, 1, 1, tzinfo=timezone.utc)})
+    updated = asyncio.run(repo.update("uid-1", UserUpdate(display_name="Renamed"), current=current))
+
+    db.collection.return_value.document.return_value.get.assert_not_called()
+    assert updated.display_name == "Renamed"
+    assert updated.email == "test@example.com"
+    assert updated.updated_at == UPDATE_TIME
+
+
+def test_game_get_version_reads_metadata_only():
+    """ETag用の読み取りでは user_id・updated_at のみを取得すること"""
+    db = _mock_db()
+    doc_ref = db.collection.return_value.document.return_value
+    doc_ref.get.return_value.exists = True
+    doc_ref.get.return_value.to_dict.return_value = {"user_id": "uid-1", "updated_at": UPDATE_TIME}
+    repo = GameRepository(db)
+
+    assert asyncio.run(repo.get_version("doc-1", "uid-1")) == UPDATE_TIME
+    doc_ref.get.assert_called_with(field_paths=["user_id", "updated_at"])
+    assert asyncio.run(repo.get_version("doc-1", "uid-2")) is None
+
+
+def test_statistics_rebuilt_when_document_created_by_increment():
+    """Increment で作成された（全件集計前の）統計ドキュメントは参照時に再構築すること"""
+    db = _mock_db()
+    stats_doc = db.collection.return_value.document.return_value.get.return_value
+    stats_doc.exists = True
+    stats_doc.to_dict.return_value = {"completed_games": 1, "score_sum": 150, "score_histogram": {"150": 1}}
+    repo = GameRepository(db)
+    rebuilt = {"completed_games": 5}
+
+    async def _rebuild(user_id: str) -> dict:
+        return rebuilt
+    repo.rebuild_user_statistics = _rebuild
+
+    assert asyncio.run(repo.get_user_statistics("uid-1")) is rebuilt
+
+    stats_doc.to_dict.return_value = {**stats_doc.to_dict.return_value, "version": STATISTICS_VERSION}
+    assert asyncio.run(repo.get_user_statistics("uid-1"))["completed_games"] == 1
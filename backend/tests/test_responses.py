@@ -0,0 +1,44 @@
+"""レスポンス作成のテスト"""
+import json
+from datetime import datetime, timezone
+from app.models.common import MetaInfo, success_json_response, success_response
+from app.models.user import UserResponse
+
+
+def _user():
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return UserResponse(
+        id="user-1",
+        uid="uid-1",
+        email="test@example.com",
+        display_name="Test",
+        photo_url=None,
+        created_at=now,
+        updated_at=now
+    )
+
+
+def test_success_json_response_matches_success_response():
+    """従来のエンベロープと同じ内容のJSONを返すこと"""
+    user = _user()
+    meta = MetaInfo(total=1, limit=20, offset=0)
+
+    response = success_json_response(data=[user], meta=meta)
+    body = json.loads(response.body)
+
+    assert response.status_code == 200
+    assert response.media_type == "application/json"
+    assert body["success"] is True
+    assert body["data"][0]["id"] == "user-1"
+    assert body["data"][0]["photo_url"] is None
+    assert body["meta"] == {"total": 1, "limit": 20, "offset": 0, "next_cursor": None}
+    assert body.keys() == success_response(data=[user.dict()], meta=meta).keys()
+
+
+def test_success_json_response_omits_none():
+    """data・meta が None の場合はキーを含めないこと"""
+    assert json.loads(success_json_response().body) == {"success": True}
+    assert json.loads(success_json_response(data={"message": "ok"}).body) == {
+        "success": True,
+        "data": {"message": "ok"},
+    }
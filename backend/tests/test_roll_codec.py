@@ -0,0 +1,37 @@
+"""ロール文字列エンコーディングのテスト"""
+import pytest
+from app.utils.roll_codec import decode_rolls, encode_frames, encode_rolls, expand_frames
+from app.utils.scoring import IncrementalScorer
+
+
+def test_roll_string_round_trip():
+    """フレームとロール文字列が相互に変換できること"""
+    frame_rolls = [[10], [7, 3], [9, 0], [10], [10], [8, 1], [6, 4], [10], [7, 2], [10, 8, 1]]
+    roll_string = encode_rolls(frame_rolls)
+    assert roll_string == "X,73,90,X,X,81,64,X,72,X81"
+    assert decode_rolls(roll_string) == frame_rolls
+
+    scorer = IncrementalScorer()
+    for frame_index, rolls in enumerate(frame_rolls):
+        for pin_count in rolls:
+            scorer.add_roll(frame_index, pin_count)
+    frames = expand_frames(roll_string)
+    assert frames == scorer.to_frames()
+    assert encode_frames(frames) == roll_string
+
+
+def test_in_progress_game():
+    """進行中のゲームは未投球のフレームが空になること"""
+    roll_string = encode_rolls([[10], [7]])
+    assert roll_string == "X,7,,,,,,,,"
+    frames = expand_frames(roll_string)
+    assert frames[1].rolls == [7]
+    assert frames[2].rolls == []
+
+
+def test_invalid_roll_string():
+    """不正なロール文字列はValueErrorになること"""
+    with pytest.raises(ValueError):
+        decode_rolls("X,7")
+    with pytest.raises(ValueError):
+        decode_rolls("A,,,,,,,,,")
@@ -0,0 +1,130 @@
+"""スコア計算ユーティリティのテスト"""
+import random
+from datetime import datetime
+from typing import List
+import pytest
+from app.models.game import RollRequest
+from app.exceptions import InvalidRollError
+from app.utils.game_state import GameState
+from app.utils.scoring import IncrementalScorer, calculate_batch_score, calculate_score
+from tests.helpers import legal_frames, legal_tenth_frames, reference_score
+
+
+def _new_game() -> GameState:
+    """進行中の新規ゲーム"""
+    now = datetime.now()
+    return GameState(
+        id="game_1",
+        user_id="user_1",
+        scorer=IncrementalScorer(),
+        total_score=0,
+        status="playing",
+        played_at=now,
+        created_at=now,
+        updated_at=now,
+        expire_at=now
+    )
+
+
+def _assert_equivalent(game_frames: List[List[int]]):
+    """1投ごとに calculate_score と全フレーム再計算（参照実装）の結果が一致すること"""
+    game = _new_game()
+    played: List[List[int]] = []
+    for frame_index, rolls in enumerate(game_frames):
+        played.append([])
+        for pin_count in rolls:
+            game = calculate_score(game, RollRequest(frame_number=frame_index + 1, pin_count=pin_count))
+            played[frame_index].append(pin_count)
+            frames, total_score, completed = reference_score(played)
+            assert [frame.model_dump() for frame in game.to_frames()] == frames, game_frames
+            assert game.total_score == total_score
+            assert (game.status == "completed") == completed
+    assert game.status == "completed"
+
+
+def test_tenth_frame_patterns():
+    """10フレーム目の全パターンで一致すること（8・9フレームはストライク・スペア・オープン）"""
+    tenth_frames = legal_tenth_frames()
+    assert len(tenth_frames) == 241
+    for ninth in ([10], [4, 6], [3, 4]):
+        for tenth in tenth_frames:
+            _assert_equivalent([[0, 0]] * 7 + [[10], ninth, tenth])
+
+
+@pytest.mark.slow
+def test_consecutive_frame_pairs():
+    """連続する2フレームの全組み合わせで一致すること"""
+    frames = legal_frames()
+    for first in frames:
+        for second in frames:
+            _assert_equivalent([first, second, [10], [5, 5]] + [[2, 3]] * 5 + [[10, 10, 10]])
+
+
+def test_random_games():
+    """ランダムに生成した正規ゲームで一致すること"""
+    rng = random.Random(20251005)
+    frames = legal_frames()
+    tenth_frames = legal_tenth_frames()
+    for _ in range(500):
+        game_frames = [rng.choice(frames) for _ in range(9)] + [rng.choice(tenth_frames)]
+        _assert_equivalent(game_frames)
+
+
+def test_perfect_game():
+    """パーフェクトゲームが300点になること"""
+    scorer = IncrementalScorer()
+    for frame_index in range(9):
+        scorer.add_roll(frame_index, 10)
+    for _ in range(3):
+        scorer.add_roll(9, 10)
+    assert scorer.total_score == 300
+    assert scorer.frame_scores == [30, 60, 90, 120, 150, 180, 210, 240, 270, 300]
+    assert scorer.is_completed
+
+
+def test_calculate_score_updates_state_in_place():
+    """calculate_score はゲーム状態をその場で更新し、フレームモデルと往復変換できること"""
+    game = _new_game()
+    for frame_number, pin_count in ((1, 3), (1, 7), (2, 4)):
+        assert calculate_score(game, RollRequest(frame_number=frame_number, pin_count=pin_count)) is game
+    assert game.total_score == 18
+
+    calculate_score(game, RollRequest(frame_number=2, pin_count=2))
+    frames = game.to_frames()
+    assert frames[1].rolls == [4, 2] and frames[1].is_completed
+    assert game.total_score == 20
+    assert game.roll_string() == "37,42,,,,,,,,"
+    assert GameState.from_frames(frames, id="game_1", user_id="user_1", total_score=20,
+                                 status="playing", played_at=game.played_at).to_frames() == frames
+
+
+def test_game_state_copy_is_independent():
+    """複製したゲーム状態への変更が元の状態に影響しないこと"""
+    game = _new_game()
+    calculate_score(game, RollRequest(frame_number=1, pin_count=10))
+    copied = game.copy()
+    calculate_batch_score(copied, [
+        RollRequest(frame_number=2, pin_count=10),
+        RollRequest(frame_number=3, pin_count=4),
+        RollRequest(frame_number=3, pin_count=2),
+    ])
+    assert copied.total_score == 46
+
+    # 元の状態はボーナス待ちも含めて変わらない
+    assert game.scorer.frame_rolls[1] == [] and game.total_score == 10
+    calculate_score(game, RollRequest(frame_number=2, pin_count=3))
+    calculate_score(game, RollRequest(frame_number=2, pin_count=4))
+    assert game.total_score == 17 + 7
+
+
+def test_batch_validation_error_stops_at_invalid_roll():
+    """一括ロールの検証エラーで中断し、以降のロールを追加しないこと"""
+    def _validate(scorer: IncrementalScorer, roll: RollRequest) -> None:
+        if roll.pin_count > 5:
+            raise InvalidRollError("too many pins")
+
+    game = _new_game()
+    rolls = [RollRequest(frame_number=1, pin_count=3), RollRequest(frame_number=1, pin_count=6)]
+    with pytest.raises(InvalidRollError):
+        calculate_batch_score(game, rolls, validate=_validate)
+    assert game.scorer.rolls == [3]
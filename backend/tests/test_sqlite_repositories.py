@@ -0,0 +1,150 @@
+"""SQLiteリポジトリのテスト"""
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+import pytest
+from app.exceptions import GameNotFoundError, UserNotFoundError
+from app.models.game import GameHistoryRequest, RollRequest
+from app.models.user import UserCreate, UserUpdate
+from app.repositories.sqlite_game_repository import SQLiteGameRepository
+from app.repositories.sqlite_user_repository import SQLiteUserRepository
+from app.services.game_service import GameService
+from app.utils.sqlite_database import SQLiteDatabase
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = SQLiteDatabase(str(tmp_path / "bowlards.db"))
+    db.initialize()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def service(database):
+    user_repo = SQLiteUserRepository(database)
+    asyncio.run(user_repo.create(
+        UserCreate(uid="uid-1", email="test@example.com", display_name="Test")
+    ))
+    return GameService(SQLiteGameRepository(database), user_repo)
+
+
+def test_database_uses_wal_and_indexes(database):
+    """WALモードで開き、履歴・統計のクエリがインデックスを使うこと"""
+    conn = database.connection()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    plan = " ".join(row[3] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM games WHERE user_id = ? "
+        "ORDER BY played_at DESC, id DESC LIMIT 21", ("uid-1",)
+    ))
+    assert "idx_games_user_played_at" in plan
+    assert "TEMP B-TREE" not in plan
+
+    plan = " ".join(row[3] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM games WHERE user_id = ? AND status = 'completed'",
+        ("uid-1",)
+    ))
+    assert "idx_games_user_status" in plan
+
+
+def test_transaction_rolls_back_when_commit_fails(database):
+    """COMMIT が失敗した場合はロールバックし、接続にトランザクションを残さないこと"""
+    conn = database.connection()
+
+    class FailingCommitConnection:
+        in_transaction = property(lambda self: conn.in_transaction)
+
+        def execute(self, sql, *args):
+            if sql == "COMMIT":
+                raise sqlite3.OperationalError("disk I/O error")
+            return conn.execute(sql, *args)
+
+    with patch.object(database, "connection", return_value=FailingCommitConnection()):
+        with pytest.raises(sqlite3.OperationalError):
+            with database.transaction() as tx:
+                tx.execute(
+                    "INSERT INTO users (id, uid, email, display_name, created_at, updated_at) "
+                    "VALUES ('u', 'u', 'u@example.com', 'U', '', '')"
+                )
+
+    assert not conn.in_transaction
+    assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 0
+
+
+def test_user_repository(database):
+    """ユーザーの作成・取得・更新・削除"""
+    repo = SQLiteUserRepository(database)
+    user = asyncio.run(repo.create(UserCreate(uid="uid-1", email="test@example.com", display_name="Test")))
+    assert user.id == "uid-1"
+
+    with pytest.raises(ValueError):
+        asyncio.run(repo.create(UserCreate(uid="uid-1", email="test@example.com", display_name="Test")))
+
+    assert asyncio.run(repo.get_by_uid("uid-1")) == user
+    assert asyncio.run(repo.exists_by_uid("uid-1"))
+
+    updated = asyncio.run(repo.update("uid-1", UserUpdate(display_name="Renamed")))
+    assert updated.display_name == "Renamed"
+    assert updated.email == "test@example.com"
+    assert asyncio.run(repo.get_by_id("uid-1")) == updated
+
+    assert asyncio.run(repo.delete("uid-1"))
+    with pytest.raises(UserNotFoundError):
+        asyncio.run(repo.update("uid-1", UserUpdate(display_name="Renamed")))
+    assert not asyncio.run(repo.exists("uid-1"))
+
+
+def test_game_rolls_and_statistics(service):
+    """ゲームの作成・ロール追加・統計集計"""
+    game = asyncio.run(service.create_game("uid-1"))
+    for frame_number in list(range(1, 10)) + [10, 10, 10]:
+        game = asyncio.run(service.add_roll(
+            game.id, "uid-1", RollRequest(frame_number=frame_number, pin_count=10)
+        ))
+    assert game.status == "completed"
+    assert game.total_score == 300
+    assert asyncio.run(service.get_game(game.id, "uid-1")).to_response() == game.to_response()
+
+    stats = asyncio.run(service.get_game_statistics("uid-1"))
+    assert stats.completed_games == 1
+    assert stats.perfect_games == 1
+    assert stats.strike_count == 10
+    assert stats.highest_score == 300
+
+    with pytest.raises(GameNotFoundError):
+        asyncio.run(service.get_game(game.id, "uid-2"))
+    asyncio.run(service.delete_game(game.id, "uid-1"))
+    assert asyncio.run(service.get_game_statistics("uid-1")).completed_games == 0
+
+
+def test_game_history_pagination(service, database):
+    """カーソル・オフセットのページネーションとETag用のバージョン取得"""
+    repo = service.game_repo
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    created = []
+    for index in range(5):
+        game = asyncio.run(service.create_game("uid-1"))
+        database.connection().execute(
+            "UPDATE games SET played_at = ? WHERE id = ?",
+            ((base + timedelta(days=index)).isoformat(timespec="microseconds"), game.id)
+        )
+        created.append(game.id)
+    expected = list(reversed(created))
+
+    first = asyncio.run(repo.get_user_games("uid-1", GameHistoryRequest(limit=2)))
+    assert first.total == 5
+    assert [g.id for g in first.games] == expected[:2]
+    assert first.next_cursor
+
+    second = asyncio.run(repo.get_user_games("uid-1", GameHistoryRequest(limit=2, cursor=first.next_cursor)))
+    assert [g.id for g in second.games] == expected[2:4]
+
+    by_offset = asyncio.run(repo.get_user_games("uid-1", GameHistoryRequest(limit=2, offset=4)))
+    assert [g.id for g in by_offset.games] == expected[4:]
+    assert by_offset.next_cursor is None
+
+    versions, total, has_more = asyncio.run(repo.get_user_game_versions("uid-1", GameHistoryRequest(limit=2)))
+    assert versions == [(g.id, g.updated_at) for g in first.games]
+    assert (total, has_more) == (5, True)
@@ -0,0 +1,41 @@
+"""ユーザー統計集計ユーティリティのテスト"""
+from app.models.game import Frame
+from app.utils.statistics import (
+    game_statistics_delta, build_statistics_document, statistics_from_document
+)
+
+
+def _frames(strikes: int) -> list:
+    """先頭から指定数のストライク、残りをオープンフレームとしたフレーム"""
+    frames = []
+    for i in range(10):
+        if i < strikes:
+            frames.append(Frame(number=i + 1, rolls=[10], is_strike=True, is_completed=True))
+        else:
+            frames.append(Frame(number=i + 1, rolls=[3, 4], is_completed=True))
+    return frames
+
+
+def test_game_statistics_delta_counts_turkeys():
+    """3連続ストライク以降のストライクがターキーとして数えられること"""
+    delta = game_statistics_delta(150, _frames(4))
+    assert delta["strike_count"] == 4
+    assert delta["turkey_count"] == 2
+    assert delta["perfect_games"] == 0
+
+
+def test_statistics_document_round_trip():
+    """再構築した統計ドキュメントから統計値が算出されること"""
+    deltas = [
+        game_statistics_delta(300, _frames(10)),
+        game_statistics_delta(70, _frames(0)),
+    ]
+    document = build_statistics_document(deltas)
+    # 削除で件数が0になったスコアは最高・最低の対象外
+    document["score_histogram"]["10"] = 0
+    statistics = statistics_from_document(document)
+    assert statistics["completed_games"] == 2
+    assert statistics["average_score"] == 185.0
+    assert statistics["highest_score"] == 300
+    assert statistics["lowest_score"] == 70
+    assert statistics["perfect_games"] == 1
@@ -0,0 +1,33 @@
+"""検証済みIDトークンキャッシュのテスト"""
+import time
+from app.auth.token_cache import VerifiedTokenCache
+
+
+def test_cache_hit_until_token_expiry():
+    """有効期限内のトークンはキャッシュから返されること"""
+    cache = VerifiedTokenCache(max_size=10)
+    decoded = {"uid": "user_1", "exp": time.time() + 60}
+    cache.set("token-1", decoded)
+    assert cache.get("token-1") is decoded
+    assert cache.get("token-2") is None
+
+
+def test_expired_tokens_are_not_returned():
+    """有効期限切れのトークンはキャッシュされない・返されないこと"""
+    cache = VerifiedTokenCache(max_size=10)
+    cache.set("expired", {"uid": "user_1", "exp": time.time() - 1})
+    assert cache.get("expired") is None
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    """件数上限を超えると最も古く参照されたエントリが破棄されること"""
+    cache = VerifiedTokenCache(max_size=2)
+    exp = time.time() + 60
+    cache.set("a", {"uid": "a", "exp": exp})
+    cache.set("b", {"uid": "b", "exp": exp})
+    cache.get("a")
+    cache.set("c", {"uid": "c", "exp": exp})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
@@ -0,0 +1,116 @@
+"""トレーシングのテスト"""
+import io
+import json
+import threading
+from unittest.mock import patch
+import pytest
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.utils import tracing
+from app.utils.tracing import (
+    SpanExporter, parse_traceparent, should_sample, span, start_trace, traced
+)
+
+
+@pytest.fixture
+def exported():
+    """トレースをメモリに書き出すエクスポーター"""
+    stream = io.StringIO()
+    exporter = SpanExporter(stream)
+    with patch.object(tracing, "_exporter", exporter):
+        yield stream
+    exporter.close()
+
+
+def _spans(stream):
+    tracing._exporter.flush()
+    lines = stream.getvalue().splitlines()
+    return [
+        item
+        for line in lines
+        for item in json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    ]
+
+
+def test_nested_spans(exported):
+    """スパンが親子関係を持ちOTLP/JSONで書き出されること"""
+    @traced("inner")
+    def inner():
+        return 1
+
+    with start_trace() as trace:
+        with span("outer", key="value"):
+            assert inner() == 1
+
+    spans = {item["name"]: item for item in _spans(exported)}
+    assert spans["inner"]["parentSpanId"] == spans["outer"]["spanId"]
+    assert spans["outer"]["traceId"] == trace.trace_id
+    assert spans["outer"]["attributes"] == [{"key": "key", "value": {"stringValue": "value"}}]
+
+
+def test_span_error_status(exported):
+    """例外が発生したスパンはエラーステータスになること"""
+    with pytest.raises(ValueError):
+        with start_trace():
+            with span("failing"):
+                raise ValueError("boom")
+
+    assert _spans(exported)[0]["status"] == {"code": 2, "message": "ValueError: boom"}
+
+
+def test_no_trace_records_nothing(exported):
+    """トレース対象外では何も記録されないこと"""
+    with span("ignored") as current:
+        assert current is None
+    tracing._exporter.flush()
+    assert exported.getvalue() == ""
+
+
+def test_sampling():
+    """サンプリング設定と上流のサンプリングフラグに従うこと"""
+    sampled_parent = parse_traceparent("00-" + "a" * 32 + "-" + "b" * 16 + "-01")
+    assert sampled_parent == ("a" * 32, "b" * 16, True)
+    assert parse_traceparent("invalid") is None
+
+    with patch.object(settings, "tracing_enabled", False):
+        assert not should_sample(sampled_parent)
+    with patch.object(settings, "tracing_enabled", True), \
+            patch.object(settings, "tracing_sample_rate", 0.0):
+        assert not should_sample()
+        assert should_sample(sampled_parent)
+
+
+def test_request_id_and_root_span(client: TestClient, exported):
+    """リクエストIDがレスポンスに返され、ルートスパンが記録されること"""
+    with patch.object(settings, "tracing_enabled", True), \
+            patch.object(settings, "tracing_sample_rate", 1.0):
+        response = client.get("/health", headers={"X-Request-ID": "req-123"})
+
+    assert response.headers["x-request-id"] == "req-123"
+    root = _spans(exported)[0]
+    assert root["name"] == "GET /health"
+    attributes = {item["key"]: item["value"] for item in root["attributes"]}
+    assert attributes["request_id"] == {"stringValue": "req-123"}
+    assert attributes["http.status_code"] == {"intValue": "200"}
+
+    assert client.get("/health").headers["x-request-id"]
+
+
+def test_exporter_writes_in_background_thread():
+    """書き込みがバックグラウンドスレッドで行われ、close で書き出し済みになること"""
+    class RecordingStream(io.StringIO):
+        threads = set()
+
+        def write(self, text):
+            self.threads.add(threading.current_thread().name)
+            return super().write(text)
+
+    stream = RecordingStream()
+    exporter = SpanExporter(stream)
+    trace = tracing.Trace()
+    trace.spans.append(tracing.Span("work", trace.trace_id, None))
+    exporter.export(trace)
+    exporter.close()
+
+    assert stream.threads == {"span-exporter"}
+    assert len(stream.getvalue().splitlines()) == 1